@@ -0,0 +1,74 @@
+"""
+Backtest Package
+
+Importable stages of the production momentum strategy backtest.
+Each stage takes explicit inputs and returns its outputs — nothing runs
+at import time.
+
+Modules:
+    - config: Strategy parameters and run settings
+    - data: Universe CSV, price and regime-index downloads (yfinance, lazy)
+    - indicators: ATR and rolling volatility panels
+    - signals: Top-N momentum with trend filter
+    - engine: Day-by-day portfolio simulation
+    - stops: Vectorised trailing-stop paths and stop-hit dates for stop-policy sweeps
+    - stats: perf_stats and trade-log summaries
+    - cache: Content-addressed per-stage disk cache
+    - pipeline: Stage orchestration with caching
+    - walk_forward: Rolling train/test evaluation on one indicator pass
+    - monte_carlo: Block-bootstrap confidence intervals for returns and trades
+    - cli: Command-line entry point (python -m backtest)
+"""
+
+from .config import OPTIMAL_PARAMS, INITIAL_CAPITAL, TRAIN_END, TEST_START
+from .data import (
+    load_universe,
+    download_in_chunks,
+    clean_prices,
+    download_regime_indices,
+    build_regime,
+    load_market_data,
+)
+from .indicators import compute_atr, compute_volatility
+from .signals import compute_signals
+from .engine import backtest, is_risk_on, transaction_fee
+from .stops import entries_from_trades, simulate_stops, sweep_stops
+from .stats import perf_stats, yearly_stats
+from .cache import StageCache
+from .pipeline import load_market_data_cached, compute_indicators, run_backtest, run_period
+from .walk_forward import rolling_windows, walk_forward
+from .monte_carlo import resample_returns, resample_trades, confidence_intervals
+
+__all__ = [
+    'OPTIMAL_PARAMS',
+    'INITIAL_CAPITAL',
+    'TRAIN_END',
+    'TEST_START',
+    'load_universe',
+    'download_in_chunks',
+    'clean_prices',
+    'download_regime_indices',
+    'build_regime',
+    'load_market_data',
+    'compute_atr',
+    'compute_volatility',
+    'compute_signals',
+    'backtest',
+    'is_risk_on',
+    'transaction_fee',
+    'entries_from_trades',
+    'simulate_stops',
+    'sweep_stops',
+    'perf_stats',
+    'yearly_stats',
+    'StageCache',
+    'load_market_data_cached',
+    'compute_indicators',
+    'run_backtest',
+    'run_period',
+    'rolling_windows',
+    'walk_forward',
+    'resample_returns',
+    'resample_trades',
+    'confidence_intervals',
+]
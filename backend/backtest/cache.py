@@ -0,0 +1,87 @@
+"""
+Stage Cache
+
+Content-addressed disk cache for pipeline stage outputs. Each stage's key
+hashes its own parameters together with the keys of the stages it reads,
+so changing a parameter only invalidates the stages downstream of it:
+
+    prices ─┬─ signals (lookback, top_n) ──┐
+            ├─ volatility ─────────────────┼─ backtest (stop/sizing params) ─ stats
+            └─ atr ────────────────────────┘
+    regime ────────────────────────────────┘
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+
+def frame_key(frame: pd.DataFrame) -> str:
+    """Stable content hash of a DataFrame (index, columns and values)."""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+    digest.update("\x1f".join(map(str, frame.columns)).encode())
+    return digest.hexdigest()[:20]
+
+
+def stage_key(stage: str, params: Optional[Dict] = None, *upstream: str) -> str:
+    """Key for a stage from its parameters and the keys of its inputs."""
+    payload = json.dumps({"stage": stage, "params": params or {}, "upstream": upstream},
+                         sort_keys=True, default=str)
+    return f"{stage}-{hashlib.sha256(payload.encode()).hexdigest()[:20]}"
+
+
+class StageCache:
+    """
+    Pickle-per-key cache in a directory
+
+    A cache with directory=None is disabled: every call recomputes.
+    """
+
+    def __init__(self, directory: Optional[str]):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing and storing it on a miss."""
+        if self.directory:
+            path = self._path(key)
+            if os.path.exists(path):
+                try:
+                    with open(path, "rb") as f:
+                        value = pickle.load(f)
+                    self.hits += 1
+                    return value
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    pass  # Corrupt entry — recompute and overwrite
+
+        value = compute()
+        self.misses += 1
+
+        if self.directory:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        return value
+
+    def clear(self) -> int:
+        """Delete every cached entry; returns the number removed."""
+        if not self.directory or not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+        return removed
@@ -0,0 +1,254 @@
+"""
+Backtest CLI
+
+Usage (from backend/):
+    python -m backtest                      # Production backtest (full / in-sample / out-of-sample)
+    python -m backtest run --no-cache       # Force every stage to recompute
+    python -m backtest walk-forward --train-years 3 --test-months 12 --workers 4
+    python -m backtest monte-carlo --samples 10000 --block-size 20
+    python -m backtest clear-cache
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from typing import List
+
+import pandas as pd
+
+from .cache import StageCache
+from .config import (
+    OPTIMAL_PARAMS, TRAIN_END, TEST_START, TICKERS_FILE, DATA_START,
+    OUTPUT_DIR, CACHE_DIR,
+)
+from .pipeline import load_market_data_cached, run_backtest, run_period
+from .stats import yearly_stats
+from .walk_forward import walk_forward, summarize
+from .monte_carlo import resample_returns, resample_trades, confidence_intervals
+
+
+TRADE_COLUMNS = ['Ticker', 'Entry Date', 'Exit Date', 'Holding Days', 'Entry', 'Exit', 'PnL (£)', 'PnL %', 'Exit Reason']
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 70)
+    print(title)
+    print("=" * 70)
+
+
+def _print_trade_statistics(trades: pd.DataFrame, params: dict) -> None:
+    _banner("TRADE STATISTICS - FULL PERIOD")
+
+    win_trades = trades[trades["PnL (£)"] > 0]
+    loss_trades = trades[trades["PnL (£)"] <= 0]
+
+    print(f"\nTotal trades: {len(trades)}")
+    print(f"Win rate: {len(win_trades)/len(trades)*100:.2f}%")
+    print(f"Average win: £{win_trades['PnL (£)'].mean():.2f}")
+    print(f"Average loss: £{loss_trades['PnL (£)'].mean():.2f}")
+    print(f"Win/Loss ratio: {abs(win_trades['PnL (£)'].mean() / loss_trades['PnL (£)'].mean()):.2f}")
+    print(f"Average holding period: {trades['Holding Days'].mean():.1f} days")
+    print(f"Largest win: £{win_trades['PnL (£)'].max():.2f}")
+    print(f"Largest loss: £{loss_trades['PnL (£)'].min():.2f}")
+
+    print("\n--- Exit Reason Breakdown ---")
+    print(trades["Exit Reason"].value_counts())
+
+    early_exits = trades[trades["Holding Days"] <= params['min_hold_days']]
+    print(f"\nTrades exiting at/before {params['min_hold_days']}-day grace period: {len(early_exits)} ({len(early_exits)/len(trades)*100:.1f}%)")
+
+    stop_trades = trades[trades["Exit Reason"] == "Stop"]
+    profitable_stops = stop_trades[stop_trades["Was Profitable"]]
+    losing_stops = stop_trades[~stop_trades["Was Profitable"]]
+
+    print(f"\n--- Stop Loss Analysis ---")
+    print(f"Total stops: {len(stop_trades)}")
+    if len(stop_trades):
+        print(f"Profitable stops (tight {params['profit_atr_mult']}x ATR): {len(profitable_stops)} ({len(profitable_stops)/len(stop_trades)*100:.1f}%)")
+        print(f"Losing stops (wide {params['initial_atr_mult']}x ATR): {len(losing_stops)} ({len(losing_stops)/len(stop_trades)*100:.1f}%)")
+
+
+def cmd_run(args) -> int:
+    """Full-period, in-sample and out-of-sample backtests with CSV output."""
+    pd.set_option("display.float_format", lambda x: f"{x:,.2f}")
+    cache = StageCache(None if args.no_cache else args.cache_dir)
+    params = OPTIMAL_PARAMS
+
+    _banner("PRODUCTION MOMENTUM STRATEGY - BACKTEST")
+    prices, regime = load_market_data_cached(args.tickers_file, args.start, cache)
+
+    _banner("RUNNING PRODUCTION BACKTEST")
+    print(f"\nParameters:")
+    for k, v in params.items():
+        print(f"  {k}: {v}")
+
+    first_year = prices.index.min().year
+    last_year = prices.index.max().year
+    full = run_backtest(prices, regime, params, f"Full Period ({first_year}-{last_year})", cache)
+    train = run_period(prices, regime, end=args.train_end, params=params,
+                       name=f"In-Sample ({first_year}-{args.train_end[:4]})", cache=cache)
+    test = run_period(prices, regime, start=args.test_start, params=params,
+                      name=f"Out-of-Sample ({args.test_start[:4]}-{last_year})", cache=cache)
+
+    _banner("PERFORMANCE SUMMARY")
+    comparison_df = pd.DataFrame([full["stats"], train["stats"], test["stats"]]).set_index("Strategy")
+    print("\n", comparison_df)
+
+    trades_full = full["trades"]
+    if trades_full.empty:
+        print("\nNo trades generated")
+        return 0
+
+    _print_trade_statistics(trades_full, params)
+
+    _banner("YEARLY PERFORMANCE")
+    yearly = yearly_stats(trades_full)
+    print("\n", yearly)
+
+    _banner("TOP 10 WINNERS")
+    print(trades_full.nlargest(10, 'PnL (£)')[TRADE_COLUMNS])
+
+    _banner("TOP 10 LOSERS")
+    print(trades_full.nsmallest(10, 'PnL (£)')[TRADE_COLUMNS])
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    summary_path = os.path.join(args.output_dir, f"performance_summary_{timestamp}.csv")
+    trades_path = os.path.join(args.output_dir, f"all_trades_{timestamp}.csv")
+    yearly_path = os.path.join(args.output_dir, f"yearly_performance_{timestamp}.csv")
+    comparison_df.to_csv(summary_path)
+    trades_full.to_csv(trades_path, index=False)
+    yearly.to_csv(yearly_path)
+
+    _banner("FILES SAVED")
+    print(f"Performance summary: {summary_path}")
+    print(f"All trades: {trades_path}")
+    print(f"Yearly performance: {yearly_path}")
+    print(f"Stage cache: {cache.hits} hit(s), {cache.misses} miss(es)")
+
+    _banner("BACKTEST COMPLETE")
+    return 0
+
+
+def cmd_walk_forward(args) -> int:
+    """Rolling train/test evaluation with a per-window stats table."""
+    pd.set_option("display.float_format", lambda x: f"{x:,.2f}")
+    cache = StageCache(None if args.no_cache else args.cache_dir)
+
+    _banner("WALK-FORWARD EVALUATION")
+    prices, regime = load_market_data_cached(args.tickers_file, args.start, cache)
+    table = walk_forward(
+        prices, regime, OPTIMAL_PARAMS,
+        train_years=args.train_years,
+        test_months=args.test_months,
+        step_months=args.step_months,
+        anchored=args.anchored,
+        workers=args.workers,
+        cache=cache,
+    )
+
+    _banner("PER-WINDOW PERFORMANCE")
+    print("\n", table)
+    _banner("SUMMARY")
+    print("\n", summarize(table))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(args.output_dir, f"walk_forward_{timestamp}.csv")
+    table.to_csv(path)
+    print(f"\nPer-window results: {path}")
+    return 0
+
+
+def cmd_monte_carlo(args) -> int:
+    """Bootstrap confidence intervals for the full-period backtest."""
+    pd.set_option("display.float_format", lambda x: f"{x:,.2f}")
+    cache = StageCache(None if args.no_cache else args.cache_dir)
+
+    _banner("MONTE CARLO RESAMPLING")
+    prices, regime = load_market_data_cached(args.tickers_file, args.start, cache)
+    result = run_backtest(prices, regime, OPTIMAL_PARAMS, "Full Period", cache)
+    print("\nBacktest:", {k: v for k, v in result["stats"].items() if k != "Strategy"})
+
+    options = {"n_samples": args.samples, "seed": args.seed, "workers": args.workers or None}
+    tables = {
+        f"DAILY RETURNS - BLOCK BOOTSTRAP ({args.block_size}-day blocks)":
+            resample_returns(result["returns"], method="block", block_size=args.block_size, **options),
+        f"DAILY RETURNS - RANDOM START DATES ({args.horizon_days}-day paths)":
+            resample_returns(result["returns"], method="start_date", horizon=args.horizon_days, **options),
+    }
+    if len(result["trades"]) >= 2:
+        tables["TRADE LOG - BOOTSTRAP"] = resample_trades(result["trades"], **options)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    frames = []
+    for title, samples in tables.items():
+        ci = confidence_intervals(samples)
+        _banner(title)
+        print("\n", ci)
+        frames.append(ci.assign(Method=title))
+
+    path = os.path.join(args.output_dir, f"monte_carlo_{timestamp}.csv")
+    pd.concat(frames).to_csv(path)
+    print(f"\nConfidence intervals: {path}")
+    return 0
+
+
+def cmd_clear_cache(args) -> int:
+    removed = StageCache(args.cache_dir).clear()
+    print(f"✓ Removed {removed} cached stage result(s) from {args.cache_dir}")
+    return 0
+
+
+COMMANDS = ("run", "walk-forward", "monte-carlo", "clear-cache")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--cache-dir", default=CACHE_DIR, help=f"Stage cache directory (default: {CACHE_DIR})")
+
+    data = argparse.ArgumentParser(add_help=False, parents=[common])
+    data.add_argument("--tickers-file", default=TICKERS_FILE)
+    data.add_argument("--start", default=DATA_START, help="First date to download")
+    data.add_argument("--output-dir", default=OUTPUT_DIR)
+    data.add_argument("--no-cache", action="store_true", help="Recompute every stage")
+
+    parser = argparse.ArgumentParser(prog="python -m backtest", description="Momentum strategy backtester")
+    sub = parser.add_subparsers(dest="command")
+
+    run = sub.add_parser("run", parents=[data], help="Production backtest with in/out-of-sample split")
+    run.add_argument("--train-end", default=TRAIN_END)
+    run.add_argument("--test-start", default=TEST_START)
+    run.set_defaults(func=cmd_run)
+
+    wf = sub.add_parser("walk-forward", parents=[data], help="Rolling train/test windows on one indicator pass")
+    wf.add_argument("--train-years", type=float, default=3)
+    wf.add_argument("--test-months", type=int, default=12)
+    wf.add_argument("--step-months", type=int, default=None, help="Default: --test-months")
+    wf.add_argument("--anchored", action="store_true", help="Expanding train window from the first date")
+    wf.add_argument("--workers", type=int, default=None, help="Worker processes (1 = in-process)")
+    wf.set_defaults(func=cmd_walk_forward)
+
+    mc = sub.add_parser("monte-carlo", parents=[data], help="Bootstrap confidence intervals for CAGR / Max DD / Sharpe")
+    mc.add_argument("--samples", type=int, default=10_000)
+    mc.add_argument("--block-size", type=int, default=20, help="Days per bootstrap block")
+    mc.add_argument("--horizon-days", type=int, default=252 * 3, help="Path length for random start dates")
+    mc.add_argument("--seed", type=int, default=42)
+    mc.add_argument("--workers", type=int, default=1, help="Worker processes (0 = CPU count)")
+    mc.set_defaults(func=cmd_monte_carlo)
+
+    clear = sub.add_parser("clear-cache", parents=[common], help="Delete cached stage results")
+    clear.set_defaults(func=cmd_clear_cache)
+
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # "run" is the default command, so `python -m backtest --no-cache` works
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv = ["run"] + argv
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,64 @@
+"""
+Backtest Configuration
+
+Strategy parameters and run settings for the production momentum backtest.
+Optimized parameters from extensive backtesting:
+    - 26.37% CAGR, 1.29 Sharpe, -25.38% Max DD
+    - Profit-lock stop loss system with 10-day grace period
+"""
+
+# Mode: 'optimize' or 'production'
+MODE = "production"  # Set to 'optimize' to re-run parameter sweep
+
+# Data split for validation
+TRAIN_END = "2022-12-31"  # In-sample period: 2018 - 2022
+TEST_START = "2023-01-01"  # Out-of-sample: 2023 - 2026
+
+# Optimal parameters (from backtesting)
+OPTIMAL_PARAMS = {
+    'lookback': 252,
+    'top_n': 5,
+    'atr_mult': 2,
+    'rebalance_freq': 'ME',
+    'min_position_pct': 0.05,
+    'max_position_pct': 0.20,
+    'min_hold_days': 10,
+    'risk_off_mode': 'single',
+    'stop_loss_mode': 'profit_lock',
+    'initial_atr_mult': 5,
+    'profit_atr_mult': 2
+}
+
+# Optimization parameter ranges (only used if MODE = 'optimize')
+OPTIMIZE_PARAMS = {
+    'lookbacks': [252],
+    'top_ns': [5],
+    'atr_mults': [2],
+    'rebalance_freqs': ['ME'],
+    'min_position_pcts': [0.05],
+    'max_position_pcts': [0.20],
+    'min_hold_days': [7, 10],
+    'risk_off_modes': ['single'],
+    'stop_loss_modes': ['simple', 'profit_lock'],
+    'initial_atr_mults': [4, 5],
+    'profit_atr_mults': [2, 3]
+}
+
+# Which parameters each stage depends on (drives cache invalidation)
+SIGNAL_PARAMS = ('lookback', 'top_n')
+BACKTEST_PARAMS = (
+    'rebalance_freq', 'atr_mult', 'min_position_pct', 'max_position_pct',
+    'min_hold_days', 'risk_off_mode', 'stop_loss_mode',
+    'initial_atr_mult', 'profit_atr_mult',
+)
+
+INITIAL_CAPITAL = 20000
+DATA_START = "2018-01-01"
+MIN_HISTORY_DAYS = 252 * 3        # Drop tickers with less than 3 years of data
+MA_PERIOD = 200                   # Trend filter / regime moving average
+VOLATILITY_WINDOW = 60            # Inverse-volatility sizing window
+ATR_PERIOD = 14
+
+TICKERS_FILE = "tickers_full_list.csv"
+OUTPUT_DIR = "production_results"
+CACHE_DIR = ".backtest_cache"
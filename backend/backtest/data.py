@@ -0,0 +1,81 @@
+"""
+Backtest Data Loading
+
+Universe and price downloads for the momentum backtest. yfinance is
+imported lazily so the rest of the package works offline.
+"""
+
+from typing import List, Tuple
+
+import pandas as pd
+
+from .config import DATA_START, MIN_HISTORY_DAYS, MA_PERIOD, TICKERS_FILE
+
+
+def load_universe(path: str = TICKERS_FILE) -> List[str]:
+    """Unique tickers from the 'Ticker' column of the universe CSV."""
+    df = pd.read_csv(path)
+    return df["Ticker"].dropna().unique().tolist()
+
+
+def download_in_chunks(tickers: List[str], start: str = DATA_START, chunk_size: int = 50) -> pd.DataFrame:
+    """Adjusted close panel (dates × tickers), forward/back filled."""
+    import yfinance as yf
+
+    chunks = []
+    for i in range(0, len(tickers), chunk_size):
+        data = yf.download(
+            tickers[i:i + chunk_size],
+            start=start,
+            auto_adjust=True,
+            progress=False
+        )["Close"]
+
+        if isinstance(data, pd.Series):
+            data = data.to_frame()
+
+        data = data.dropna(axis=1, how="all")
+        chunks.append(data)
+
+    prices = pd.concat(chunks, axis=1).sort_index()
+    return prices.ffill().bfill()
+
+
+def clean_prices(prices: pd.DataFrame, min_history: int = MIN_HISTORY_DAYS) -> pd.DataFrame:
+    """Drop tickers without enough history for the lookback and trend filter."""
+    return prices.dropna(axis=1, thresh=min_history)
+
+
+def download_regime_indices(start) -> Tuple[pd.Series, pd.Series]:
+    """SPY and FTSE 100 closes used for the risk-on filter."""
+    import yfinance as yf
+
+    spy = yf.download("SPY", start=start, auto_adjust=True, progress=False)["Close"].squeeze()
+    ftse = yf.download("^FTSE", start=start, auto_adjust=True, progress=False)["Close"].squeeze()
+    return spy, ftse
+
+
+def build_regime(spy: pd.Series, ftse: pd.Series, index: pd.DatetimeIndex) -> pd.DataFrame:
+    """Risk-on flags per date: index close above its 200-day MA."""
+    spy_risk_on = (spy > spy.rolling(MA_PERIOD).mean()).reindex(index, fill_value=False).astype(bool)
+    ftse_risk_on = (ftse > ftse.rolling(MA_PERIOD).mean()).reindex(index, fill_value=False).astype(bool)
+    return pd.DataFrame({"spy": spy_risk_on, "ftse": ftse_risk_on}, index=index)
+
+
+def load_market_data(tickers_file: str = TICKERS_FILE, start: str = DATA_START) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Download and clean the universe plus the regime flags
+
+    Returns:
+        (prices, regime) aligned on the same date index
+    """
+    tickers = load_universe(tickers_file)
+    print(f"\nUniverse size: {len(tickers)}")
+
+    print("Downloading price data...")
+    prices = clean_prices(download_in_chunks(tickers, start=start))
+    print(f"Tickers after cleaning: {prices.shape[1]}")
+    print(f"Date range: {prices.index.min().date()} to {prices.index.max().date()}")
+
+    spy, ftse = download_regime_indices(prices.index.min())
+    return prices, build_regime(spy, ftse, prices.index)
@@ -0,0 +1,263 @@
+"""
+Backtest Engine
+
+Day-by-day portfolio simulation: profit-lock trailing stops, regime exits,
+monthly rebalancing with inverse-volatility weights.
+
+Trading costs come from a FeeModel (utils/fee_model.py), the same object
+the live services use. Per-ticker buy / sell rates are resolved once per
+run; the simulation charges percentage rates only (no fixed commission).
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.fee_model import DEFAULT_FEE_MODEL, market_for_ticker
+
+from .config import INITIAL_CAPITAL
+
+
+def resolve_rebalance_freq(freq):
+    """
+    Map pandas >= 2.2 period-end aliases ("ME", "QE", "YE") to the legacy
+    ones ("M", "Q", "Y") when the installed pandas predates them.
+    backend/requirements.txt pins pandas 2.1.
+    """
+    try:
+        pd.tseries.frequencies.to_offset(freq)
+        return freq
+    except ValueError:
+        return freq[:-1] if freq.endswith("E") else freq
+
+
+def is_risk_on(ticker, date, regime, mode="single"):
+    spy_on = bool(regime.at[date, "spy"])
+    ftse_on = bool(regime.at[date, "ftse"])
+    
+    if mode == "single":
+        return ftse_on if ticker.endswith(".L") else spy_on
+    elif mode == "dual":
+        return spy_on or ftse_on
+    elif mode == "dual_strict":
+        return spy_on and ftse_on
+
+
+def transaction_fee(ticker, side, fee_model=DEFAULT_FEE_MODEL):
+    """Percentage cost of one side of a trade in ticker."""
+    return fee_model.rate(market_for_ticker(ticker), side)
+
+
+def backtest(signals, prices, volatility, atr, regime, rebalance_freq, atr_mult, 
+             min_position_pct=0.05, max_position_pct=0.15, min_hold_days=7, 
+             risk_off_mode="single", stop_loss_mode="simple", initial_atr_mult=None,
+             profit_atr_mult=None, initial_capital=INITIAL_CAPITAL, fee_model=DEFAULT_FEE_MODEL):
+    
+    if initial_atr_mult is None:
+        initial_atr_mult = atr_mult * 1.5
+    if profit_atr_mult is None:
+        profit_atr_mult = atr_mult
+    
+    rebalance_dates = prices.resample(resolve_rebalance_freq(rebalance_freq)).last().index
+    sell_fees = fee_model.ticker_rates(prices.columns, "sell")
+    buy_fees = pd.Series(fee_model.ticker_rates(prices.columns, "buy"))
+    holdings = pd.Series(0.0, index=prices.columns)
+    entry_prices = {}
+    entry_dates = {}
+    stop_prices = {}
+    trades = []
+    cash = initial_capital
+    portfolio_values = []
+
+    for date in prices.index:
+        current_positions = list(holdings[holdings > 0].index)
+        
+        # Stop loss with profit-lock logic
+        for t in current_positions:
+            if holdings[t] == 0:
+                continue
+                
+            shares = holdings[t]
+            
+            if date not in atr.index or t not in atr.columns:
+                continue
+            atr_val = atr.loc[date, t]
+            if np.isnan(atr_val):
+                continue
+
+            holding_days = (date - entry_dates[t]).days
+            if holding_days < min_hold_days:
+                continue
+
+            current_price = prices.loc[date, t]
+            entry_price = entry_prices[t]
+            current_profit_pct = (current_price - entry_price) / entry_price
+            
+            if stop_loss_mode == "simple":
+                active_atr_mult = atr_mult
+            elif stop_loss_mode == "tiered":
+                active_atr_mult = initial_atr_mult if holding_days < min_hold_days * 2 else atr_mult
+            elif stop_loss_mode == "profit_lock":
+                active_atr_mult = profit_atr_mult if current_profit_pct > 0 else initial_atr_mult
+            else:
+                active_atr_mult = atr_mult
+
+            current_stop = stop_prices.get(t, -np.inf)
+            new_stop = current_price - active_atr_mult * atr_val
+            stop_prices[t] = max(current_stop, new_stop)
+
+            if current_price <= stop_prices[t]:
+                exit_price = current_price
+                fee = sell_fees[t]
+                exit_adj = exit_price * (1 - fee)
+                pnl = (exit_adj - entry_price) * shares
+
+                trades.append({
+                    "Ticker": t,
+                    "Entry Date": entry_dates[t],
+                    "Exit Date": date,
+                    "Holding Days": holding_days,
+                    "Entry": entry_price,
+                    "Exit": exit_adj,
+                    "PnL (£)": pnl,
+                    "PnL %": round(current_profit_pct * 100, 2),
+                    "Market": "UK" if t.endswith(".L") else "US",
+                    "Exit Reason": "Stop",
+                    "Was Profitable": current_profit_pct > 0
+                })
+
+                cash += shares * exit_adj
+                holdings[t] = 0
+                entry_prices.pop(t, None)
+                entry_dates.pop(t, None)
+                stop_prices.pop(t, None)
+
+        # Risk-off exits
+        for t in current_positions:
+            if holdings[t] == 0:
+                continue
+                
+            shares = holdings[t]
+            
+            if not is_risk_on(t, date, regime, mode=risk_off_mode):
+                holding_days = (date - entry_dates[t]).days
+                exit_price = prices.loc[date, t]
+                entry_price = entry_prices[t]
+                current_profit_pct = (exit_price - entry_price) / entry_price
+                
+                fee = sell_fees[t]
+                exit_adj = exit_price * (1 - fee)
+                pnl = (exit_adj - entry_price) * shares
+
+                trades.append({
+                    "Ticker": t,
+                    "Entry Date": entry_dates[t],
+                    "Exit Date": date,
+                    "Holding Days": holding_days,
+                    "Entry": entry_price,
+                    "Exit": exit_adj,
+                    "PnL (£)": pnl,
+                    "PnL %": round(current_profit_pct * 100, 2),
+                    "Market": "UK" if t.endswith(".L") else "US",
+                    "Exit Reason": "Risk-Off",
+                    "Was Profitable": current_profit_pct > 0
+                })
+
+                cash += shares * exit_adj
+                holdings[t] = 0
+                entry_prices.pop(t, None)
+                entry_dates.pop(t, None)
+                stop_prices.pop(t, None)
+
+        # Rebalancing
+        if date in rebalance_dates:
+            selected = signals.loc[date][signals.loc[date]].index.tolist()
+            selected = [t for t in selected if is_risk_on(t, date, regime, mode=risk_off_mode)]
+
+            exits = []
+            for t in list(holdings[holdings > 0].index):
+                if t not in selected:
+                    exits.append(t)
+            
+            for t in exits:
+                shares = holdings[t]
+                holding_days = (date - entry_dates[t]).days
+                exit_price = prices.loc[date, t]
+                entry_price = entry_prices[t]
+                current_profit_pct = (exit_price - entry_price) / entry_price
+                
+                fee = sell_fees[t]
+                exit_adj = exit_price * (1 - fee)
+                pnl = (exit_adj - entry_price) * shares
+
+                trades.append({
+                    "Ticker": t,
+                    "Entry Date": entry_dates[t],
+                    "Exit Date": date,
+                    "Holding Days": holding_days,
+                    "Entry": entry_price,
+                    "Exit": exit_adj,
+                    "PnL (£)": pnl,
+                    "PnL %": round(current_profit_pct * 100, 2),
+                    "Market": "UK" if t.endswith(".L") else "US",
+                    "Exit Reason": "No longer qualifies",
+                    "Was Profitable": current_profit_pct > 0
+                })
+
+                cash += shares * exit_adj
+                holdings[t] = 0
+                entry_prices.pop(t, None)
+                entry_dates.pop(t, None)
+                stop_prices.pop(t, None)
+
+            portfolio_value = cash + (holdings * prices.loc[date]).sum()
+            num_existing = (holdings > 0).sum()
+            num_new_slots = len(selected) - num_existing
+            
+            if num_new_slots > 0:
+                existing_tickers = holdings[holdings > 0].index.tolist()
+                new_candidates = [t for t in selected if t not in existing_tickers][:num_new_slots]
+                
+                if len(new_candidates) > 0:
+                    available_cash = cash
+                    vols = volatility.loc[date, new_candidates].replace(0, np.nan).dropna()
+                    
+                    if len(vols) > 0:
+                        inv_vol = 1 / vols
+                        weights = inv_vol / inv_vol.sum()
+
+                        weights_constrained = {}
+                        for t, w in weights.items():
+                            weights_constrained[t] = max(min_position_pct, min(w, max_position_pct))
+                        
+                        total_weight = sum(weights_constrained.values())
+                        weights_final = {t: w / total_weight for t, w in weights_constrained.items()}
+
+                        # Fee-inclusive entry prices for every new position at once
+                        buy_tickers = list(weights_final)
+                        buy_prices = prices.loc[date, buy_tickers] * (1 + buy_fees[buy_tickers])
+
+                        for t, w in weights_final.items():
+                            price = buy_prices[t]
+                            alloc = available_cash * w
+                            shares = alloc / price
+
+                            holdings[t] = shares
+                            entry_prices[t] = price
+                            entry_dates[t] = date
+
+                            atr_val = atr.loc[date, t]
+                            if stop_loss_mode == "simple":
+                                stop_prices[t] = price - atr_mult * atr_val
+                            else:
+                                stop_prices[t] = price - initial_atr_mult * atr_val
+
+                            cash -= shares * price
+
+        daily_value = cash + (holdings * prices.loc[date]).sum()
+        portfolio_values.append(daily_value)
+
+    pv = pd.Series(portfolio_values, index=prices.index)
+    returns = pv.pct_change().fillna(0)
+    trades_df = pd.DataFrame(trades)
+
+    return pv, returns, trades_df
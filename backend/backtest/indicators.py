@@ -0,0 +1,37 @@
+"""
+Technical Indicators
+
+Indicator panels (dates × tickers) consumed by the signal and backtest stages.
+"""
+
+import pandas as pd
+
+from .config import ATR_PERIOD, VOLATILITY_WINDOW
+
+
+def compute_atr(prices: pd.DataFrame, period: int = ATR_PERIOD) -> pd.DataFrame:
+    """
+    Close-only ATR: rolling mean of the true range built from closes
+
+    Note:
+        Only closes are downloaded, so high = low = close and the true
+        range reduces to |close - previous close|.
+    """
+    high = prices.copy()
+    low = prices.copy()
+    close = prices.copy()
+
+    tr1 = high - low
+    tr2 = (high - close.shift(1)).abs()
+    tr3 = (low - close.shift(1)).abs()
+
+    tr = pd.concat([tr1, tr2, tr3], axis=1)
+    tr.columns = pd.MultiIndex.from_tuples([(c, "tr") for c in tr.columns])
+    tr = tr.T.groupby(level=0).max().T
+    atr = tr.rolling(period).mean()
+    return atr
+
+
+def compute_volatility(prices: pd.DataFrame, window: int = VOLATILITY_WINDOW) -> pd.DataFrame:
+    """Rolling standard deviation of daily returns (used for inverse-vol weights)."""
+    return prices.pct_change().rolling(window).std()
@@ -0,0 +1,229 @@
+"""
+Monte Carlo Resampling
+
+Confidence intervals for backtest results by resampling either the daily
+return series or the trade log. All paths in a batch are simulated at once
+as a (paths × days) NumPy array; batches can be spread over processes.
+
+Methods:
+    - "block": circular block bootstrap of daily returns (keeps volatility
+      clustering and short-range autocorrelation within each block)
+    - "start_date": contiguous windows from random start dates (how much
+      the result depends on when the strategy was switched on)
+    - resample_trades(): block bootstrap of per-trade returns, compounded
+      at a fixed position size
+
+Every batch draws from its own child seed, so results depend on seed and
+batch_size only — not on the number of workers.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .config import OPTIMAL_PARAMS
+
+
+TRADING_DAYS = 252
+DEFAULT_LEVELS = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+# ============================================================================
+# INDEX GENERATION
+# ============================================================================
+
+def block_bootstrap_indices(n: int, n_paths: int, block_size: int, horizon: int,
+                            rng: np.random.Generator) -> np.ndarray:
+    """
+    Circular block-bootstrap row indices
+
+    Returns:
+        (n_paths, horizon) int array; each row concatenates blocks of
+        block_size consecutive indices starting at random offsets (wrapping at n)
+    """
+    block_size = max(1, min(block_size, n))
+    n_blocks = -(-horizon // block_size)
+    starts = rng.integers(0, n, size=(n_paths, n_blocks, 1))
+    idx = (starts + np.arange(block_size)) % n
+    return idx.reshape(n_paths, -1)[:, :horizon]
+
+
+def start_date_indices(n: int, n_paths: int, horizon: int, rng: np.random.Generator) -> np.ndarray:
+    """(n_paths, horizon) indices of contiguous windows from random start rows."""
+    horizon = min(horizon, n)
+    starts = rng.integers(0, n - horizon + 1, size=(n_paths, 1))
+    return starts + np.arange(horizon)
+
+
+# ============================================================================
+# PATH METRICS
+# ============================================================================
+
+def path_metrics(returns: np.ndarray, periods_per_year: float = TRADING_DAYS) -> Dict[str, np.ndarray]:
+    """
+    CAGR, volatility, Sharpe and max drawdown for every row of a returns matrix
+
+    Definitions match stats.perf_stats (Sharpe = CAGR / annualised volatility).
+
+    Args:
+        returns: (paths × periods) simple returns
+        periods_per_year: Annualisation factor
+
+    Returns:
+        Dict of 1-D arrays (one value per path); percentages for CAGR / vol / max DD
+    """
+    equity = np.cumprod(1.0 + returns, axis=1)
+    years = returns.shape[1] / periods_per_year
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cagr = np.where(equity[:, -1] > 0, equity[:, -1] ** (1.0 / years) - 1.0, -1.0)
+        vol = returns.std(axis=1, ddof=1) * np.sqrt(periods_per_year)
+        sharpe = np.where(vol > 0, cagr / vol, np.nan)
+    peak = np.maximum.accumulate(equity, axis=1)
+    max_dd = (equity / peak - 1.0).min(axis=1)
+    return {
+        "CAGR %": cagr * 100,
+        "Volatility %": vol * 100,
+        "Sharpe": sharpe,
+        "Max DD %": max_dd * 100,
+    }
+
+
+def _simulate_batch(task: Dict) -> Dict[str, np.ndarray]:
+    """Simulate one batch of paths (runs in a worker process)."""
+    rng = np.random.default_rng(task["seed"])
+    values = task["values"]
+    n = len(values)
+
+    if task["method"] == "start_date":
+        idx = start_date_indices(n, task["n_paths"], task["horizon"], rng)
+    else:
+        idx = block_bootstrap_indices(n, task["n_paths"], task["block_size"], task["horizon"], rng)
+
+    sampled = values[idx] * task["scale"]
+    return path_metrics(sampled, task["periods_per_year"])
+
+
+def _run_batches(values: np.ndarray, n_samples: int, batch_size: int, seed: int,
+                 workers: Optional[int], **task) -> Dict[str, np.ndarray]:
+    sizes = [batch_size] * (n_samples // batch_size)
+    if n_samples % batch_size:
+        sizes.append(n_samples % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [{**task, "values": values, "n_paths": size, "seed": s} for size, s in zip(sizes, seeds)]
+
+    if workers == 1 or len(tasks) == 1:
+        results = [_simulate_batch(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_batch, tasks))
+
+    return {k: np.concatenate([r[k] for r in results]) for k in results[0]}
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def resample_returns(
+    returns: pd.Series,
+    n_samples: int = 10_000,
+    method: str = "block",
+    block_size: int = 20,
+    horizon: Optional[int] = None,
+    seed: int = 42,
+    batch_size: int = 1_000,
+    workers: Optional[int] = 1,
+) -> Dict[str, np.ndarray]:
+    """
+    Resample a daily return series into n_samples synthetic equity paths
+
+    Args:
+        returns: Daily returns from backtest()
+        n_samples: Number of paths
+        method: "block" (circular block bootstrap) or "start_date" (random contiguous windows)
+        block_size: Days per block for "block"
+        horizon: Days per path (default: full length; "start_date" needs a shorter horizon to vary)
+        seed: Master RNG seed
+        batch_size: Paths simulated per vectorised batch (bounds memory at batch_size × horizon)
+        workers: Processes for batches (1 = in-process, None = CPU count)
+
+    Returns:
+        Dict of per-path metric arrays (see path_metrics)
+
+    Raises:
+        ValueError: On an unknown method or too few returns
+    """
+    if method not in ("block", "start_date"):
+        raise ValueError(f"Unknown method '{method}' (expected 'block' or 'start_date')")
+
+    values = np.asarray(returns, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) < 2:
+        raise ValueError("Need at least 2 returns to resample")
+
+    return _run_batches(
+        values, n_samples, batch_size, seed, workers,
+        method=method,
+        block_size=block_size,
+        horizon=horizon or len(values),
+        scale=1.0,
+        periods_per_year=TRADING_DAYS,
+    )
+
+
+def resample_trades(
+    trades: pd.DataFrame,
+    n_samples: int = 10_000,
+    position_fraction: float = 1.0 / OPTIMAL_PARAMS['top_n'],
+    block_size: int = 1,
+    seed: int = 42,
+    batch_size: int = 1_000,
+    workers: Optional[int] = 1,
+) -> Dict[str, np.ndarray]:
+    """
+    Resample the trade log into n_samples trade sequences
+
+    Each trade's fee-adjusted return (Exit / Entry - 1) is applied to
+    position_fraction of equity, compounding trade by trade. CAGR and
+    Sharpe are annualised with the log's observed trade frequency.
+
+    Args:
+        trades: Trade log from backtest() (needs Entry, Exit, Entry Date, Exit Date)
+        n_samples: Number of sequences
+        position_fraction: Share of equity per trade (default 1 / top_n)
+        block_size: Consecutive trades per block (1 = plain bootstrap)
+        seed, batch_size, workers: As for resample_returns()
+
+    Returns:
+        Dict of per-sequence metric arrays (see path_metrics)
+
+    Raises:
+        ValueError: If the log has fewer than 2 trades
+    """
+    if len(trades) < 2:
+        raise ValueError("Need at least 2 trades to resample")
+
+    ordered = trades.sort_values("Exit Date")
+    values = (ordered["Exit"].to_numpy(dtype=float) / ordered["Entry"].to_numpy(dtype=float)) - 1.0
+    span_days = (pd.to_datetime(ordered["Exit Date"]).max() - pd.to_datetime(ordered["Entry Date"]).min()).days
+    trades_per_year = len(values) / max(span_days / 365.25, 1 / 365.25)
+
+    return _run_batches(
+        values, n_samples, batch_size, seed, workers,
+        method="block",
+        block_size=block_size,
+        horizon=len(values),
+        scale=position_fraction,
+        periods_per_year=trades_per_year,
+    )
+
+
+def confidence_intervals(samples: Dict[str, np.ndarray],
+                         levels: Sequence[float] = DEFAULT_LEVELS) -> pd.DataFrame:
+    """Quantiles of each metric (rows) at each level (columns), NaNs ignored."""
+    return pd.DataFrame(
+        {f"p{int(round(q * 100))}": [np.nanquantile(v, q) for v in samples.values()] for q in levels},
+        index=list(samples.keys()),
+    )
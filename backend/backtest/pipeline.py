@@ -0,0 +1,157 @@
+"""
+Backtest Pipeline
+
+Runs the strategy stages with explicit inputs and outputs, caching each
+stage so a parameter change only recomputes what depends on it.
+
+Stages:
+    market_data → signals / volatility / atr → backtest → stats
+"""
+
+import hashlib
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from utils.fee_model import DEFAULT_FEE_MODEL, FeeModel
+
+from .cache import StageCache, frame_key, stage_key
+from .config import (
+    OPTIMAL_PARAMS, SIGNAL_PARAMS, BACKTEST_PARAMS, INITIAL_CAPITAL,
+    DATA_START, TICKERS_FILE, VOLATILITY_WINDOW, ATR_PERIOD,
+)
+from .data import load_market_data
+from .engine import backtest
+from .indicators import compute_atr, compute_volatility
+from .signals import compute_signals
+from .stats import perf_stats
+
+
+_NO_CACHE = StageCache(None)
+
+
+def load_market_data_cached(
+    tickers_file: str = TICKERS_FILE,
+    start: str = DATA_START,
+    cache: Optional[StageCache] = None,
+    as_of: Optional[date] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    load_market_data() with the download cached for the day
+
+    The key covers the universe file contents, start date and as_of date
+    (default today), so editing the universe or a new trading day
+    triggers a fresh download.
+    """
+    cache = cache or _NO_CACHE
+    with open(tickers_file, "rb") as f:
+        universe_hash = hashlib.sha256(f.read()).hexdigest()[:20]
+    key = stage_key("market_data", {
+        "universe": universe_hash,
+        "start": start,
+        "as_of": (as_of or date.today()).isoformat(),
+    })
+    return cache.get_or_compute(key, lambda: load_market_data(tickers_file, start))
+
+
+def compute_indicators(
+    prices: pd.DataFrame,
+    params: Dict = OPTIMAL_PARAMS,
+    cache: Optional[StageCache] = None,
+) -> Dict:
+    """
+    Signals, volatility and ATR panels for a price panel (each stage cached)
+
+    Returns:
+        Dict with signals, volatility, atr and the cache key of each stage
+    """
+    cache = cache or _NO_CACHE
+    prices_key = frame_key(prices)
+
+    signal_params = {k: params[k] for k in SIGNAL_PARAMS}
+    signals_key = stage_key("signals", signal_params, prices_key)
+    signals = cache.get_or_compute(signals_key, lambda: compute_signals(prices, **signal_params))
+
+    volatility_key = stage_key("volatility", {"window": VOLATILITY_WINDOW}, prices_key)
+    volatility = cache.get_or_compute(volatility_key, lambda: compute_volatility(prices))
+
+    atr_key = stage_key("atr", {"period": ATR_PERIOD}, prices_key)
+    atr = cache.get_or_compute(atr_key, lambda: compute_atr(prices))
+
+    return {
+        "signals": signals,
+        "volatility": volatility,
+        "atr": atr,
+        "keys": {
+            "prices": prices_key,
+            "signals": signals_key,
+            "volatility": volatility_key,
+            "atr": atr_key,
+        },
+    }
+
+
+def run_backtest(
+    prices: pd.DataFrame,
+    regime: pd.DataFrame,
+    params: Dict = OPTIMAL_PARAMS,
+    name: str = "Backtest",
+    cache: Optional[StageCache] = None,
+    initial_capital: float = INITIAL_CAPITAL,
+    fee_model: FeeModel = DEFAULT_FEE_MODEL,
+) -> Dict:
+    """
+    Run signals, indicators, backtest and stats on one price panel
+
+    Args:
+        prices: Close panel (dates × tickers)
+        regime: Risk-on flags from build_regime(), covering prices.index
+        params: Strategy parameters (see config.OPTIMAL_PARAMS)
+        name: Label for the stats row
+        cache: Stage cache (None = no caching)
+        initial_capital: Starting cash
+        fee_model: Trading costs (e.g. fee_model_for(settings) to match live fees)
+
+    Returns:
+        Dict with signals, volatility, atr, equity, returns, trades, stats
+        and the cache key of each stage
+    """
+    cache = cache or _NO_CACHE
+    indicators = compute_indicators(prices, params, cache)
+    keys = indicators["keys"]
+    signals, volatility, atr = indicators["signals"], indicators["volatility"], indicators["atr"]
+
+    backtest_params = {k: params[k] for k in BACKTEST_PARAMS}
+    backtest_key = stage_key(
+        "backtest", {**backtest_params, "initial_capital": initial_capital, "fees": fee_model.as_dict()},
+        keys["signals"], keys["volatility"], keys["atr"], frame_key(regime),
+    )
+    equity, returns, trades = cache.get_or_compute(
+        backtest_key,
+        lambda: backtest(signals, prices, volatility, atr, regime,
+                         initial_capital=initial_capital, fee_model=fee_model, **backtest_params),
+    )
+
+    return {
+        "signals": signals,
+        "volatility": volatility,
+        "atr": atr,
+        "equity": equity,
+        "returns": returns,
+        "trades": trades,
+        "stats": perf_stats(returns, name, initial_capital),
+        "keys": {**keys, "backtest": backtest_key},
+    }
+
+
+def run_period(
+    prices: pd.DataFrame,
+    regime: pd.DataFrame,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    **kwargs,
+) -> Dict:
+    """run_backtest() on prices.loc[start:end], recomputing indicators on the slice."""
+    sliced = prices.loc[start:end]
+    return run_backtest(sliced, regime.loc[sliced.index], **kwargs)
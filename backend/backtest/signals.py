@@ -0,0 +1,18 @@
+"""
+Momentum Signals
+
+Top-N momentum ranking filtered by the 200-day trend.
+"""
+
+import pandas as pd
+
+from .config import MA_PERIOD
+
+
+def compute_signals(prices: pd.DataFrame, lookback: int, top_n: int, ma_period: int = MA_PERIOD) -> pd.DataFrame:
+    """Boolean panel: True where a ticker ranks top_n on momentum and trades above its MA."""
+    momentum = prices.pct_change(lookback)
+    ranks = momentum.rank(axis=1, ascending=False, na_option="bottom", method="first")
+    trend = prices > prices.rolling(ma_period).mean()
+    signals = (trend) & (ranks <= top_n)
+    return signals.fillna(False).astype(bool)
@@ -0,0 +1,46 @@
+"""
+Performance Statistics
+
+Return-series and trade-log summaries for backtest results.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .config import INITIAL_CAPITAL
+
+
+def perf_stats(returns, name, initial_capital=INITIAL_CAPITAL):
+    equity = (1 + returns).cumprod()
+    cagr = equity.iloc[-1]**(252 / len(returns)) - 1
+    vol = returns.std() * np.sqrt(252)
+    dd = equity / equity.cummax() - 1
+    sharpe = np.nan if vol == 0 else cagr / vol
+    
+    downside = returns.copy()
+    downside[downside > 0] = 0
+    sortino = np.nan if downside.std() == 0 else cagr / (downside.std() * np.sqrt(252))
+    calmar = np.nan if dd.min() == 0 else cagr / abs(dd.min())
+
+    return {
+        "Strategy": name,
+        "CAGR %": round(cagr * 100, 2),
+        "Volatility %": round(vol * 100, 2),
+        "Sharpe": round(sharpe, 2) if not np.isnan(sharpe) else np.nan,
+        "Sortino": round(sortino, 2) if not np.isnan(sortino) else np.nan,
+        "Calmar": round(calmar, 2) if not np.isnan(calmar) else np.nan,
+        "Max DD %": round(dd.min() * 100, 2),
+        "Final Value (£)": round(equity.iloc[-1] * initial_capital, 0)
+    }
+
+
+def yearly_stats(trades):
+    """Trade count, P&L, hold and win rate grouped by entry year."""
+    trades = trades.assign(**{"Entry Year": pd.to_datetime(trades["Entry Date"]).dt.year})
+    yearly = trades.groupby('Entry Year').agg({
+        'PnL (£)': ['count', 'mean', 'sum'],
+        'Holding Days': 'mean',
+        'Was Profitable': lambda x: x.sum() / len(x) * 100
+    })
+    yearly.columns = ['Num Trades', 'Avg PnL (£)', 'Total PnL (£)', 'Avg Hold Days', 'Win Rate %']
+    return yearly
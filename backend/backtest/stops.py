@@ -0,0 +1,308 @@
+"""
+Vectorised Stop Simulation
+
+Trailing-stop paths and first stop-hit dates for many trades at once, for
+stop-policy research (e.g. sweeping ATR multipliers over a trade log).
+
+Stop rules are the engine's (engine.backtest):
+    - Initial stop at entry: entry - atr_mult × ATR ("simple") or
+      entry - initial_atr_mult × ATR (other modes)
+    - Each later day, once the position is min_hold_days (calendar) old and
+      ATR is available, the stop trails to max(stop, price - mult × ATR):
+        "simple":      mult = atr_mult
+        "tiered":      initial_atr_mult before 2 × min_hold_days, then atr_mult
+        "profit_lock": profit_atr_mult while in profit, else initial_atr_mult
+    - The trade stops out on the first such day with price <= stop
+    - Grace-period days neither move the stop nor check it
+
+Because each day's candidate stop depends only on that day's price and ATR,
+the stop path is a cumulative maximum along the day axis. Trades are
+simulated together as (trades × days) arrays, DAY_BLOCK days at a time,
+with stopped-out trades dropped between blocks. Results match the
+day-by-day engine exactly.
+
+Usage:
+    from backtest.stops import entries_from_trades, simulate_stops, sweep_stops
+
+    entries = entries_from_trades(trades)          # from backtest()
+    result = simulate_stops(prices, atr, entries, mode="profit_lock",
+                            initial_atr_mult=5, profit_atr_mult=2, min_hold_days=10)
+    grid = sweep_stops(prices, atr, entries, {"initial_atr_mult": [3, 4, 5],
+                                               "profit_atr_mult": [1.5, 2, 3]})
+"""
+
+import itertools
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .config import OPTIMAL_PARAMS
+
+
+STOP_MODES = ("simple", "tiered", "profit_lock")
+DEFAULT_BATCH_SIZE = 2048
+DAY_BLOCK = 32  # Days simulated per array step before exited trades are dropped
+
+
+def entries_from_trades(trades: pd.DataFrame, with_end_dates: bool = False) -> pd.DataFrame:
+    """
+    Entries table from a backtest() trade log
+
+    Args:
+        trades: Trade log with "Ticker", "Entry Date", "Entry" and "Exit Date"
+        with_end_dates: Close each simulated trade on its logged exit date
+            (replays the strategy's other exits); otherwise run to the end
+
+    Returns:
+        DataFrame with ticker, entry_date, entry_price (and end_date)
+    """
+    entries = pd.DataFrame({
+        "ticker": trades["Ticker"].to_numpy(),
+        "entry_date": pd.to_datetime(trades["Entry Date"]).to_numpy(),
+        "entry_price": trades["Entry"].to_numpy(dtype=float),
+    })
+    if with_end_dates:
+        entries["end_date"] = pd.to_datetime(trades["Exit Date"]).to_numpy()
+    return entries
+
+
+def _multipliers(mode: str, atr_mult: float, initial_atr_mult: Optional[float],
+                 profit_atr_mult: Optional[float]):
+    if mode not in STOP_MODES:
+        raise ValueError(f"Unknown stop mode: {mode} (expected one of {', '.join(STOP_MODES)})")
+    # Same defaults as engine.backtest
+    if initial_atr_mult is None:
+        initial_atr_mult = atr_mult * 1.5
+    if profit_atr_mult is None:
+        profit_atr_mult = atr_mult
+    return float(atr_mult), float(initial_atr_mult), float(profit_atr_mult)
+
+
+def _simulate_batch(price_values, atr_values, day_numbers, cols, start_rows, end_rows,
+                    entry_prices, mode, atr_mult, initial_atr_mult, profit_atr_mult,
+                    min_hold_days, return_paths):
+    n = len(start_rows)
+    horizon = int((end_rows - start_rows).max()) if n else 0
+    last_row = len(day_numbers) - 1
+
+    entry_atr = atr_values[start_rows, cols]
+    initial_stop = entry_prices - (atr_mult if mode == "simple" else initial_atr_mult) * entry_atr
+    # Engine: a NaN ATR at entry leaves a NaN stop, which never trails or triggers
+    live = ~np.isnan(initial_stop)
+
+    running_stop = initial_stop.copy()
+    exit_offset = np.full(n, -1)
+    exit_price = np.full(n, np.nan)
+    exit_stop = np.full(n, np.nan)
+    paths = np.full((n, horizon), np.nan) if return_paths else None
+
+    # Walk the day axis in blocks, dropping trades once they stop out or
+    # their window ends, so short-lived trades cost a block or two
+    pending = np.flatnonzero(live & (end_rows > start_rows))
+    first_day = 1
+    while pending.size and first_day <= horizon:
+        last_day = min(first_day + DAY_BLOCK - 1, horizon)
+        offsets = np.arange(first_day, last_day + 1)
+
+        starts = start_rows[pending]
+        rows = starts[:, None] + offsets[None, :]
+        in_window = rows <= end_rows[pending][:, None]
+        rows = np.minimum(rows, last_row)
+        col_idx = np.broadcast_to(cols[pending][:, None], rows.shape)
+
+        price = price_values[rows, col_idx]
+        atr = atr_values[rows, col_idx]
+        holding_days = day_numbers[rows] - day_numbers[starts][:, None]
+
+        if mode == "simple":
+            mult = atr_mult
+        elif mode == "tiered":
+            mult = np.where(holding_days < min_hold_days * 2, initial_atr_mult, atr_mult)
+        else:
+            entry = entry_prices[pending][:, None]
+            mult = np.where((price - entry) / entry > 0, profit_atr_mult, initial_atr_mult)
+
+        active = in_window & (holding_days >= min_hold_days) & ~np.isnan(atr) & ~np.isnan(price)
+        candidate = np.where(active, price - mult * atr, -np.inf)
+        stops = np.maximum.accumulate(
+            np.column_stack([running_stop[pending], candidate]), axis=1
+        )[:, 1:]
+        hit = active & (price <= stops)
+
+        hit_any = hit.any(axis=1)
+        first = hit.argmax(axis=1)
+        stopped = pending[hit_any]
+        exit_offset[stopped] = offsets[first[hit_any]]
+        exit_price[stopped] = price[hit_any, first[hit_any]]
+        exit_stop[stopped] = stops[hit_any, first[hit_any]]
+
+        if return_paths:
+            # NaN after the exit day and outside the trade's window
+            cutoff = np.where(hit_any, first, len(offsets))[:, None]
+            keep = in_window & (np.arange(len(offsets))[None, :] <= cutoff)
+            paths[pending, first_day - 1:last_day] = np.where(keep, stops, np.nan)
+
+        running_stop[pending] = np.where(hit_any, exit_stop[pending], stops[:, -1])
+        still_open = ~hit_any & (end_rows[pending] > starts + last_day)
+        pending = pending[still_open]
+        first_day = last_day + 1
+
+    hit = exit_offset >= 0
+    result = {
+        "initial_stop": initial_stop,
+        "hit": hit,
+        "exit_row": np.where(hit, start_rows + exit_offset, -1),
+        "exit_price": exit_price,
+        "exit_stop": exit_stop,
+        "last_stop": running_stop,
+    }
+    if return_paths:
+        result["paths"] = paths
+    return result
+
+
+def simulate_stops(
+    prices: pd.DataFrame,
+    atr: pd.DataFrame,
+    entries: pd.DataFrame,
+    mode: str = OPTIMAL_PARAMS["stop_loss_mode"],
+    atr_mult: float = OPTIMAL_PARAMS["atr_mult"],
+    initial_atr_mult: Optional[float] = OPTIMAL_PARAMS["initial_atr_mult"],
+    profit_atr_mult: Optional[float] = OPTIMAL_PARAMS["profit_atr_mult"],
+    min_hold_days: int = OPTIMAL_PARAMS["min_hold_days"],
+    return_paths: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict:
+    """
+    Trailing-stop path and first stop-hit for every entry
+
+    Args:
+        prices: Close panel (dates × tickers)
+        atr: ATR panel (reindexed to prices)
+        entries: DataFrame with ticker, entry_date, entry_price and optional
+            end_date (last day the trade is held; default: last price date)
+        mode: "simple", "tiered" or "profit_lock"
+        atr_mult, initial_atr_mult, profit_atr_mult: Stop multipliers
+            (None → engine defaults: 1.5 × atr_mult and atr_mult)
+        min_hold_days: Grace period in calendar days
+        return_paths: Also return the (trades × days) stop paths
+        batch_size: Trades simulated per array (bounds memory at
+            batch_size × DAY_BLOCK, plus the paths if requested)
+
+    Returns:
+        Dictionary with:
+            - trades: entries plus initial_stop, hit, exit_date, exit_price,
+              stop_at_exit, holding_days, return_pct and last_stop
+            - paths: DataFrame of stop levels (trade × day offset), if requested
+
+    Raises:
+        ValueError: If mode is unknown or an entry's ticker / date is not in prices
+    """
+    atr_mult, initial_atr_mult, profit_atr_mult = _multipliers(
+        mode, atr_mult, initial_atr_mult, profit_atr_mult
+    )
+    atr = atr.reindex(index=prices.index, columns=prices.columns)
+
+    dates = prices.index
+    missing = set(entries["ticker"]) - set(prices.columns)
+    if missing:
+        raise ValueError(f"Tickers not in prices: {', '.join(sorted(missing)[:5])}")
+    start_rows = dates.get_indexer(pd.to_datetime(entries["entry_date"]))
+    if (start_rows < 0).any():
+        raise ValueError("Entry dates must be trading days in prices.index")
+    if "end_date" in entries:
+        end_rows = dates.searchsorted(pd.to_datetime(entries["end_date"]), side="right") - 1
+    else:
+        end_rows = np.full(len(entries), len(dates) - 1)
+    end_rows = np.maximum(end_rows, start_rows)
+
+    cols = prices.columns.get_indexer(entries["ticker"])
+    price_values = prices.to_numpy(dtype=float)
+    atr_values = atr.to_numpy(dtype=float)
+    day_numbers = dates.values.astype("datetime64[D]").astype(np.int64)
+    entry_prices = entries["entry_price"].to_numpy(dtype=float)
+
+    parts = []
+    for lo in range(0, len(entries), batch_size):
+        hi = lo + batch_size
+        parts.append(_simulate_batch(
+            price_values, atr_values, day_numbers, cols[lo:hi], start_rows[lo:hi], end_rows[lo:hi],
+            entry_prices[lo:hi], mode, atr_mult, initial_atr_mult, profit_atr_mult,
+            min_hold_days, return_paths,
+        ))
+
+    def joined(key):
+        return np.concatenate([p[key] for p in parts]) if parts else np.array([])
+
+    exit_rows = joined("exit_row").astype(np.int64)
+    hit = joined("hit").astype(bool)
+    exit_dates = pd.DatetimeIndex(np.where(hit, dates.values[np.maximum(exit_rows, 0)], np.datetime64("NaT")))
+    exit_prices = joined("exit_price")
+
+    trades = entries.reset_index(drop=True).copy()
+    trades["initial_stop"] = joined("initial_stop")
+    trades["hit"] = hit
+    trades["exit_date"] = exit_dates
+    trades["exit_price"] = exit_prices
+    trades["stop_at_exit"] = joined("exit_stop")
+    trades["holding_days"] = (exit_dates - pd.DatetimeIndex(pd.to_datetime(trades["entry_date"]))).days
+    trades["return_pct"] = (exit_prices - entry_prices) / entry_prices * 100
+    trades["last_stop"] = joined("last_stop")
+
+    result = {"trades": trades}
+    if return_paths:
+        width = max((p["paths"].shape[1] for p in parts), default=0)
+        padded = [np.pad(p["paths"], ((0, 0), (0, width - p["paths"].shape[1])), constant_values=np.nan)
+                  for p in parts]
+        result["paths"] = pd.DataFrame(
+            np.vstack(padded) if padded else np.empty((0, 0)),
+            columns=pd.RangeIndex(1, width + 1, name="day"),
+        )
+    return result
+
+
+def sweep_stops(
+    prices: pd.DataFrame,
+    atr: pd.DataFrame,
+    entries: pd.DataFrame,
+    grid: Dict[str, Sequence],
+    base_params: Dict = None,
+) -> pd.DataFrame:
+    """
+    simulate_stops() over every combination of grid values
+
+    Args:
+        prices, atr, entries: As for simulate_stops()
+        grid: {parameter: values} over mode, atr_mult, initial_atr_mult,
+            profit_atr_mult and min_hold_days
+        base_params: Fixed values for parameters not in grid
+            (default: OPTIMAL_PARAMS stop settings)
+
+    Returns:
+        One row per combination: the parameters, trades, stopped (count),
+        stop_rate, mean_holding_days and mean_return_pct of stopped trades
+    """
+    base = {
+        "mode": OPTIMAL_PARAMS["stop_loss_mode"],
+        "atr_mult": OPTIMAL_PARAMS["atr_mult"],
+        "initial_atr_mult": OPTIMAL_PARAMS["initial_atr_mult"],
+        "profit_atr_mult": OPTIMAL_PARAMS["profit_atr_mult"],
+        "min_hold_days": OPTIMAL_PARAMS["min_hold_days"],
+        **(base_params or {}),
+    }
+    names = list(grid)
+    rows = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = {**base, **dict(zip(names, values))}
+        trades = simulate_stops(prices, atr, entries, **params)["trades"]
+        stopped = trades[trades["hit"]]
+        rows.append({
+            **params,
+            "trades": len(trades),
+            "stopped": len(stopped),
+            "stop_rate": len(stopped) / len(trades) if len(trades) else 0.0,
+            "mean_holding_days": float(stopped["holding_days"].mean()) if len(stopped) else None,
+            "mean_return_pct": float(stopped["return_pct"].mean()) if len(stopped) else None,
+        })
+    return pd.DataFrame(rows)
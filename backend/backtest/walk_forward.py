@@ -0,0 +1,175 @@
+"""
+Walk-Forward Evaluation
+
+Rolling train/test evaluation of the strategy. Signals, volatility and ATR
+are computed once over the full history; each window then backtests a
+date slice of those panels, so every window starts fully warmed up
+(no lost lookback at the boundaries) and costs one cheap backtest per
+segment instead of a full indicator recompute.
+
+Windows run in parallel across processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from utils.fee_model import DEFAULT_FEE_MODEL, FeeModel
+
+from .cache import StageCache
+from .config import OPTIMAL_PARAMS, BACKTEST_PARAMS, INITIAL_CAPITAL
+from .engine import backtest
+from .pipeline import compute_indicators
+from .stats import perf_stats
+
+
+def rolling_windows(
+    index: pd.DatetimeIndex,
+    train_years: float = 3,
+    test_months: int = 12,
+    step_months: Optional[int] = None,
+    anchored: bool = False,
+) -> List[Dict]:
+    """
+    Train/test date ranges over an index
+
+    Args:
+        index: Trading dates
+        train_years: In-sample length (ignored for the start when anchored)
+        test_months: Out-of-sample length
+        step_months: Shift between windows (default: test_months, i.e. back-to-back tests)
+        anchored: Train always starts at the first date (expanding window)
+
+    Returns:
+        List of dicts with window, train_start, train_end, test_start, test_end.
+        Only windows whose test period ends within the index are returned.
+    """
+    step_months = step_months or test_months
+    first, last = index.min(), index.max()
+    windows = []
+
+    train_start = first
+    train_end = first + pd.DateOffset(months=int(round(train_years * 12)))
+    while True:
+        test_start = train_end + pd.Timedelta(days=1)
+        test_end = train_end + pd.DateOffset(months=test_months)
+        if test_end > last:
+            break
+        windows.append({
+            "window": len(windows) + 1,
+            "train_start": (first if anchored else train_start).date().isoformat(),
+            "train_end": train_end.date().isoformat(),
+            "test_start": test_start.date().isoformat(),
+            "test_end": test_end.date().isoformat(),
+        })
+        train_start = train_start + pd.DateOffset(months=step_months)
+        train_end = train_end + pd.DateOffset(months=step_months)
+
+    return windows
+
+
+def _backtest_segment(segment: Dict) -> Dict:
+    """Backtest one pre-sliced segment (runs in a worker process)."""
+    _, returns, trades = backtest(
+        segment["signals"], segment["prices"], segment["volatility"], segment["atr"], segment["regime"],
+        initial_capital=segment["initial_capital"], fee_model=segment["fee_model"],
+        **segment["backtest_params"],
+    )
+    stats = perf_stats(returns, segment["label"], segment["initial_capital"])
+    stats["Trades"] = len(trades)
+    return stats
+
+
+def _slice(panels: Dict, regime: pd.DataFrame, start: str, end: str) -> Dict:
+    # Positional row slices of the full-history panels (no indicator recompute)
+    index = panels["prices"].index
+    lo = index.searchsorted(pd.Timestamp(start), side="left")
+    hi = index.searchsorted(pd.Timestamp(end), side="right")
+    sliced = {name: panel.iloc[lo:hi] for name, panel in panels.items()}
+    sliced["regime"] = regime.loc[sliced["prices"].index]
+    return sliced
+
+
+def walk_forward(
+    prices: pd.DataFrame,
+    regime: pd.DataFrame,
+    params: Dict = OPTIMAL_PARAMS,
+    train_years: float = 3,
+    test_months: int = 12,
+    step_months: Optional[int] = None,
+    anchored: bool = False,
+    workers: Optional[int] = None,
+    cache: Optional[StageCache] = None,
+    initial_capital: float = INITIAL_CAPITAL,
+    fee_model: FeeModel = DEFAULT_FEE_MODEL,
+) -> pd.DataFrame:
+    """
+    Evaluate the strategy over rolling train/test windows
+
+    Args:
+        prices: Close panel over the full history
+        regime: Risk-on flags covering prices.index
+        params: Strategy parameters
+        train_years, test_months, step_months, anchored: See rolling_windows()
+        workers: Process count (None = CPU count, 1 = run in this process)
+        cache: Stage cache for the one-off indicator pass
+        initial_capital: Starting cash for every segment
+        fee_model: Trading costs (e.g. fee_model_for(settings) to match live fees)
+
+    Returns:
+        DataFrame with one row per window and segment ("train" / "test"):
+        window dates, perf_stats columns and trade count
+
+    Raises:
+        ValueError: If the history is too short for a single window
+    """
+    windows = rolling_windows(prices.index, train_years, test_months, step_months, anchored)
+    if not windows:
+        raise ValueError(
+            f"History {prices.index.min().date()} to {prices.index.max().date()} is too short "
+            f"for a {train_years}y train + {test_months}m test window"
+        )
+
+    # One indicator pass over the full history; windows backtest slices of it
+    indicators = compute_indicators(prices, params, cache)
+    panels = {
+        "prices": prices,
+        "signals": indicators["signals"],
+        "volatility": indicators["volatility"],
+        "atr": indicators["atr"],
+    }
+    backtest_params = {k: params[k] for k in BACKTEST_PARAMS}
+
+    segments, rows = [], []
+    for w in windows:
+        for segment, start, end in (
+            ("train", w["train_start"], w["train_end"]),
+            ("test", w["test_start"], w["test_end"]),
+        ):
+            segments.append({
+                **_slice(panels, regime, start, end),
+                "label": f"W{w['window']} {segment}",
+                "backtest_params": backtest_params,
+                "initial_capital": initial_capital,
+                "fee_model": fee_model,
+            })
+            rows.append({"Window": w["window"], "Segment": segment, "Start": start, "End": end})
+
+    if workers == 1:
+        results = [_backtest_segment(s) for s in segments]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_backtest_segment, segments))
+
+    table = pd.DataFrame([{**row, **stats} for row, stats in zip(rows, results)])
+    return table.drop(columns=["Strategy"]).set_index(["Window", "Segment"])
+
+
+def summarize(table: pd.DataFrame) -> pd.DataFrame:
+    """Mean, median, worst and share-positive of key stats per segment."""
+    metrics = ["CAGR %", "Sharpe", "Max DD %"]
+    grouped = table.reset_index().groupby("Segment")
+    summary = grouped[metrics].agg(["mean", "median", "min"])
+    summary[("CAGR %", "positive %")] = grouped["CAGR %"].apply(lambda s: (s > 0).mean() * 100)
+    return summary.sort_index(axis=1)
@@ -0,0 +1,21 @@
+"""
+Benchmarks Package
+
+Offline performance and numerical-drift harnesses for the Trading Assistant
+backend, plus a load generator for a locally running API. Nothing in this
+package is imported by the FastAPI app.
+
+Modules:
+    - synthetic: Seeded generators for trade histories and snapshot series
+    - analytics_reference: Independent NumPy implementations of analytics metrics
+    - analytics_benchmark: Scale benchmark for AnalyticsService / ValidationService
+    - backtest_benchmark: Per-stage timing of the momentum backtest on synthetic universes
+    - load_test: Scenario-driven virtual users against a running API (throughput, latency, errors)
+    - import_time: Cold-start import time of the API, per package, in fresh interpreters
+
+Usage (from backend/):
+    python -m benchmarks.analytics_benchmark --sizes 10,1000 --output results.json
+    python -m benchmarks.backtest_benchmark --scenarios 100x2,600x5 --output backtest.json
+    python -m benchmarks.load_test --users 20 --duration 60 --output load.json
+    python -m benchmarks.import_time --check
+"""
@@ -0,0 +1,323 @@
+"""
+Analytics Scale Benchmark
+
+Measures how AnalyticsService scales and checks its numbers at every scale.
+
+For each dataset size (default 10, 1k, 100k, 1M rows) the harness:
+    1. Generates a seeded synthetic trade history and snapshot series
+    2. Times every AnalyticsService._calculate_* method plus the full
+       calculate_metrics_from_data() pipeline (best of N repeats)
+    3. Records peak traced memory per method (separate tracemalloc pass,
+       so tracing overhead never pollutes the timings)
+    4. Compares the ValidationService metric set against the independent
+       NumPy reference in analytics_reference.py, using test_data TOLERANCE
+    5. Checks structural properties that must hold for any input
+       (win rate bounds, drawdown sign, bucket counts summing to n, ...)
+
+It also times ValidationService.validate_all() against the canonical
+dataset so the fixed validation baseline is reported alongside.
+
+Usage (from backend/):
+    python -m benchmarks.analytics_benchmark
+    python -m benchmarks.analytics_benchmark --sizes 10,1000 --repeat 5 --output bench.json
+
+Exit code is 1 if any drift or property check fails, so the harness can gate CI.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from config import API_VERSION
+from services.analytics_service import AnalyticsService
+from services.validation_service import ValidationService, METRIC_SEVERITY
+from test_data.validation_data import TOLERANCE
+
+from benchmarks.synthetic import generate_trades, generate_portfolio_history
+from benchmarks.analytics_reference import compute_reference_metrics
+
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+DEFAULT_SEED = 42
+
+# Tolerance for metrics that test_data.TOLERANCE does not list explicitly
+DEFAULT_TOLERANCE = 0.01
+
+
+# ============================================================================
+# METHOD ARGUMENT MAP
+# ============================================================================
+
+def _method_args(trades: List[Dict], history: List[Dict]) -> Dict[str, Tuple]:
+    """
+    Positional arguments for each AnalyticsService._calculate_* method.
+
+    Every _calculate_* method must appear here — _collect_methods() fails
+    loudly when a new one is added, so the benchmark can't silently skip it.
+    """
+    sorted_trades = sorted(trades, key=lambda t: t.get('exit_date', ''))
+    return {
+        "_calculate_executive_metrics": (trades, history),
+        "_calculate_sharpe": (trades, history),
+        "_calculate_max_drawdown": (history,),
+        "_calculate_recovery_factor": (history,),
+        "_calculate_advanced_metrics": (trades, history),
+        "_calculate_streaks": (sorted_trades,),
+        "_calculate_underwater": (sorted_trades,),
+        "_calculate_market_comparison": (trades,),
+        "_calculate_exit_reasons": (trades,),
+        "_calculate_monthly_data": (trades,),
+        "_calculate_day_of_week": (trades,),
+        "_calculate_holding_periods": (trades,),
+        "_calculate_top_performers": (trades,),
+        "_calculate_consistency_metrics": (trades,),
+    }
+
+
+def _collect_methods(service: AnalyticsService, args: Dict[str, Tuple]) -> Dict[str, Callable]:
+    names = sorted(m for m in dir(service) if m.startswith("_calculate_"))
+    missing = [m for m in names if m not in args]
+    if missing:
+        raise RuntimeError(
+            f"Benchmark has no argument mapping for: {', '.join(missing)}. "
+            "Add them to _method_args()."
+        )
+    return {name: getattr(service, name) for name in names}
+
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def _time_call(fn: Callable, args: Tuple, repeat: int) -> Dict:
+    """Best and mean wall time over `repeat` calls, in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "best_ms": round(min(samples), 3),
+        "mean_ms": round(sum(samples) / len(samples), 3),
+    }
+
+
+def _peak_memory(fn: Callable, args: Tuple) -> float:
+    """Peak traced allocation during one call, in MiB."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 3)
+
+
+# ============================================================================
+# DRIFT & PROPERTY CHECKS
+# ============================================================================
+
+def _service_metric_set(service: AnalyticsService, trades: List[Dict], history: List[Dict]) -> Dict:
+    """Extract the ValidationService metric set from AnalyticsService output."""
+    result = service.calculate_metrics_from_data(trades, history, period="all_time", min_trades=0)
+    exec_m = result.get("executive_metrics", {})
+    adv_m = result.get("advanced_metrics", {})
+    trade_sharpe, _ = service._calculate_sharpe(trades, [])
+
+    return {
+        "sharpe_ratio": exec_m.get("sharpe_ratio", 0.0),
+        "sharpe_ratio_trade_method": round(trade_sharpe, 2),
+        "max_drawdown_percent": exec_m.get("max_drawdown", {}).get("percent", 0.0),
+        "profit_factor": exec_m.get("profit_factor", 0.0),
+        "recovery_factor": exec_m.get("recovery_factor", 0.0),
+        "expectancy": exec_m.get("expectancy", 0.0),
+        "risk_reward_ratio": exec_m.get("risk_reward_ratio", 0.0),
+        "win_streak": adv_m.get("win_streak", 0),
+        "loss_streak": adv_m.get("loss_streak", 0),
+        "avg_hold_winners": adv_m.get("avg_hold_winners", 0.0),
+        "avg_hold_losers": adv_m.get("avg_hold_losers", 0.0),
+        "trade_frequency": adv_m.get("trade_frequency", 0.0),
+        "capital_efficiency": adv_m.get("capital_efficiency", 0.0),
+        "days_underwater": adv_m.get("days_underwater", 0),
+    }, result
+
+
+def _drift_checks(actual: Dict, reference: Dict) -> List[Dict]:
+    checks = []
+    for metric, expected in reference.items():
+        tolerance = TOLERANCE.get(metric, TOLERANCE.get(metric.replace("_trade_method", ""), DEFAULT_TOLERANCE))
+        # Service values are rounded to 2dp (1dp for hold averages) — allow for that
+        allowance = max(tolerance, 0.05 if metric.startswith("avg_hold") else 0.005)
+        if tolerance == 0:
+            allowance = 0
+        diff = abs(actual[metric] - expected)
+        checks.append({
+            "metric": metric,
+            "severity": METRIC_SEVERITY.get(metric, "low"),
+            "actual": actual[metric],
+            "reference": round(expected, 6),
+            "diff": round(diff, 6),
+            "status": "pass" if diff <= allowance else "fail",
+        })
+    return checks
+
+
+def _property_checks(result: Dict, n_trades: int) -> List[Dict]:
+    """Invariants that must hold for any input, whatever the values."""
+    summary = result["summary"]
+    exec_m = result["executive_metrics"]
+    adv_m = result["advanced_metrics"]
+    props = {
+        "win_rate_in_range": 0 <= summary["win_rate"] <= 100,
+        "max_drawdown_non_positive": exec_m["max_drawdown"]["percent"] <= 0,
+        "profit_factor_non_negative": exec_m["profit_factor"] >= 0,
+        "streaks_bounded_by_trades": adv_m["win_streak"] + adv_m["loss_streak"] <= n_trades,
+        "days_underwater_non_negative": adv_m["days_underwater"] >= 0,
+        "exit_reason_counts_sum_to_n": sum(r["count"] for r in result["exit_reasons"]) == n_trades,
+        "day_of_week_counts_sum_to_n": sum(d["trade_count"] for d in result["day_of_week"]) == n_trades,
+        "holding_buckets_cover_n": sum(h["trades"] for h in result["holding_periods"]) == n_trades,
+        "monthly_data_at_most_12": len(result["monthly_data"]) <= 12,
+        "top_performers_at_most_5": (
+            len(result["top_performers"]["winners"]) <= 5
+            and len(result["top_performers"]["losers"]) <= 5
+        ),
+        "market_counts_sum_to_n": sum(
+            m["total_trades"] for m in result["market_comparison"].values()
+        ) == n_trades,
+    }
+    return [{"property": name, "status": "pass" if ok else "fail"} for name, ok in props.items()]
+
+
+# ============================================================================
+# RUNNERS
+# ============================================================================
+
+def benchmark_size(n: int, seed: int = DEFAULT_SEED, repeat: int = 3, trace_memory: bool = True) -> Dict:
+    """
+    Benchmark every analytics method on a synthetic dataset of n rows
+
+    Args:
+        n: Number of trades and snapshots to generate
+        seed: RNG seed for the dataset
+        repeat: Timing repeats per method (best is reported)
+        trace_memory: Run the tracemalloc peak-memory pass
+
+    Returns:
+        Dict with per-method timings/memory, drift checks and property checks
+    """
+    gen_start = time.perf_counter()
+    trades = generate_trades(n, seed)
+    history = generate_portfolio_history(n, seed)
+    generation_ms = round((time.perf_counter() - gen_start) * 1000, 1)
+
+    service = AnalyticsService()
+    args = _method_args(trades, history)
+    methods = _collect_methods(service, args)
+    methods["calculate_metrics_from_data"] = service.calculate_metrics_from_data
+    args["calculate_metrics_from_data"] = (trades, history, "all_time", 0)
+
+    timings = {}
+    for name, fn in methods.items():
+        timings[name] = _time_call(fn, args[name], repeat)
+        if trace_memory:
+            timings[name]["peak_mib"] = _peak_memory(fn, args[name])
+
+    actual, result = _service_metric_set(service, trades, history)
+    ref_start = time.perf_counter()
+    reference = compute_reference_metrics(trades, history)
+    reference_ms = round((time.perf_counter() - ref_start) * 1000, 3)
+
+    drift = _drift_checks(actual, reference)
+    properties = _property_checks(result, n)
+
+    return {
+        "rows": n,
+        "seed": seed,
+        "generation_ms": generation_ms,
+        "reference_ms": reference_ms,
+        "methods": timings,
+        "drift": drift,
+        "properties": properties,
+        "passed": all(c["status"] == "pass" for c in drift + properties),
+    }
+
+
+def benchmark_validation(repeat: int = 3) -> Dict:
+    """Time ValidationService.validate_all() on the canonical dataset."""
+    service = ValidationService()
+    timing = _time_call(service.validate_all, (), repeat)
+    summary = service.validate_all()["summary"]
+    return {
+        **timing,
+        "total": summary["total"],
+        "passed": summary["passed"],
+        "failed": summary["failed"],
+    }
+
+
+def run(sizes: List[int], seed: int = DEFAULT_SEED, repeat: int = 3, trace_memory: bool = True) -> Dict:
+    """Run the validation baseline and every requested size; return the full report."""
+    return {
+        "benchmark": "analytics",
+        "api_version": API_VERSION,
+        "python": platform.python_version(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "validation_baseline": benchmark_validation(repeat),
+        "sizes": [benchmark_size(n, seed, repeat, trace_memory) for n in sizes],
+    }
+
+
+def _print_report(report: Dict) -> None:
+    baseline = report["validation_baseline"]
+    print("=" * 70)
+    print("ANALYTICS BENCHMARK")
+    print("=" * 70)
+    print(f"ValidationService.validate_all: {baseline['best_ms']:.2f} ms "
+          f"({baseline['passed']}/{baseline['total']} passed)")
+
+    for size in report["sizes"]:
+        print(f"\n--- {size['rows']:,} rows (seed {size['seed']}) ---")
+        print(f"{'method':<36}{'best ms':>12}{'mean ms':>12}{'peak MiB':>12}")
+        for name, t in size["methods"].items():
+            peak = f"{t['peak_mib']:.2f}" if "peak_mib" in t else "-"
+            print(f"{name:<36}{t['best_ms']:>12.2f}{t['mean_ms']:>12.2f}{peak:>12}")
+
+        failures = [c for c in size["drift"] + size["properties"] if c["status"] != "pass"]
+        if failures:
+            print(f"❌ {len(failures)} check(s) failed:")
+            for f in failures:
+                print(f"   {f}")
+        else:
+            print(f"✓ {len(size['drift'])} drift checks and {len(size['properties'])} property checks passed")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark AnalyticsService at scale")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated dataset sizes (default: 10,1000,100000,1000000)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats per method")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    report = run(sizes, seed=args.seed, repeat=args.repeat, trace_memory=not args.no_memory)
+    _print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.output}")
+
+    return 0 if all(s["passed"] for s in report["sizes"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Analytics Reference Implementation
+
+Independent, vectorised NumPy implementations of the metrics checked by
+ValidationService. Used by the analytics benchmark to detect numerical
+drift in AnalyticsService at scales the 5-trade validation dataset
+cannot reach.
+
+Formulas follow docs/specs/metrics_definitions.md and mirror the tie-breaking
+rules of AnalyticsService (stable sort by date string, first maximum wins,
+pnl <= 0 counted as a loss for streaks). Values are returned unrounded.
+"""
+
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def _days(iso_dates: List[str]) -> np.ndarray:
+    """ISO date strings (YYYY-MM-DD, optional time part) → int64 day numbers."""
+    return np.array([d[:10] for d in iso_dates], dtype="datetime64[D]").astype(np.int64)
+
+
+def _equity_sorted(portfolio_history: List[Dict]) -> np.ndarray:
+    dates = np.array([h.get("snapshot_date", "") for h in portfolio_history])
+    order = np.argsort(dates, kind="stable")
+    values = np.array([float(h.get("total_value", 0)) for h in portfolio_history], dtype=float)
+    return values[order], dates[order]
+
+
+def portfolio_sharpe(portfolio_history: List[Dict]) -> Optional[float]:
+    """Portfolio-method Sharpe (sample variance, ×√252), or None if not applicable."""
+    if len(portfolio_history) < 30:
+        return None
+    equity, _ = _equity_sorted(portfolio_history)
+    prev, curr = equity[:-1], equity[1:]
+    valid = prev > 0
+    returns = (curr[valid] - prev[valid]) / prev[valid] * 100
+    if len(returns) < 2:
+        return None
+    std = returns.std(ddof=1)
+    if std <= 0:
+        return None
+    return float(returns.mean() / std * math.sqrt(252))
+
+
+def trade_sharpe(trades: List[Dict]) -> Optional[float]:
+    """Trade-method Sharpe (annualised trade returns, sample variance), or None."""
+    if len(trades) < 10:
+        return None
+    kept = [t for t in trades if t.get("pnl_percent", 0) is not None]
+    hold = np.maximum(
+        1,
+        _days([t["exit_date"] for t in kept]) - _days([t["entry_date"] for t in kept]),
+    )
+    pnl_pct = np.array([t.get("pnl_percent", 0) for t in kept], dtype=float)
+    annualised = pnl_pct / hold * 252
+    if len(annualised) < 2:
+        return None
+    std = annualised.std(ddof=1)
+    if std <= 0:
+        return None
+    return float(annualised.mean() / std)
+
+
+def max_drawdown(portfolio_history: List[Dict]) -> Dict:
+    """Largest peak-to-trough decline in equity: percent (negative), amount, date."""
+    if not portfolio_history:
+        return {"percent": 0.0, "amount": 0.0, "date": None}
+    equity, dates = _equity_sorted(portfolio_history)
+    peak = np.maximum.accumulate(np.maximum(equity, 0))
+    drawdown = peak - equity
+    idx = int(np.argmax(drawdown))
+    amount = float(drawdown[idx])
+    if amount <= 0:
+        return {"percent": 0.0, "amount": 0.0, "date": None}
+    percent = amount / peak[idx] * 100 if peak[idx] > 0 else 0.0
+    return {"percent": -percent, "amount": amount, "date": str(dates[idx])}
+
+
+def recovery_factor(portfolio_history: List[Dict]) -> float:
+    """Net equity change over the period divided by the largest drawdown amount."""
+    if len(portfolio_history) < 2:
+        return 0.0
+    equity, _ = _equity_sorted(portfolio_history)
+    profit = equity[-1] - equity[0]
+    max_dd = float((np.maximum.accumulate(np.maximum(equity, 0)) - equity).max())
+    if max_dd > 0 and profit > 0:
+        return float(profit / max_dd)
+    return 0.0
+
+
+def streaks(pnl_sorted: np.ndarray) -> tuple:
+    """Longest run of winners (pnl > 0) and of non-winners (pnl <= 0)."""
+    if len(pnl_sorted) == 0:
+        return 0, 0
+    wins = pnl_sorted > 0
+    change = np.flatnonzero(np.diff(wins.astype(np.int8))) + 1
+    bounds = np.concatenate(([0], change, [len(wins)]))
+    lengths = np.diff(bounds)
+    run_is_win = wins[bounds[:-1]]
+    max_win = int(lengths[run_is_win].max()) if run_is_win.any() else 0
+    max_loss = int(lengths[~run_is_win].max()) if (~run_is_win).any() else 0
+    return max_win, max_loss
+
+
+def days_underwater(pnl_sorted: np.ndarray, exit_days_sorted: np.ndarray) -> int:
+    """Longest gap (days) between an equity peak and a later trade still below it."""
+    if len(pnl_sorted) == 0:
+        return 0
+    running = np.cumsum(pnl_sorted)
+    prior_peak = np.maximum(0, np.concatenate(([-np.inf], np.maximum.accumulate(running)[:-1])))
+    is_peak = running >= prior_peak
+    idx = np.arange(len(running))
+    last_peak = np.maximum.accumulate(np.where(is_peak, idx, -1))
+    underwater = (~is_peak) & (last_peak >= 0)
+    if not underwater.any():
+        return 0
+    gaps = exit_days_sorted[underwater] - exit_days_sorted[last_peak[underwater]]
+    return int(max(0, gaps.max()))
+
+
+def compute_reference_metrics(trades: List[Dict], portfolio_history: List[Dict]) -> Dict:
+    """
+    Compute the ValidationService metric set from raw data
+
+    Args:
+        trades: Closed trades (same shape as AnalyticsService input)
+        portfolio_history: Snapshots (same shape as AnalyticsService input)
+
+    Returns:
+        Dict keyed by ValidationService metric names, unrounded.
+        Sharpe keys are 0.0 when the method's data threshold is not met,
+        matching AnalyticsService's "insufficient_data" fallback.
+    """
+    pnl = np.array([t.get("pnl", 0) for t in trades], dtype=float)
+    hold = np.array([t.get("holding_days", 0) for t in trades], dtype=float)
+    cost = np.array([t.get("total_cost", 0) for t in trades], dtype=float)
+
+    winners = pnl > 0
+    losers = pnl < 0
+    n = len(trades)
+
+    win_rate = winners.sum() / n * 100 if n else 0.0
+    avg_win = pnl[winners].mean() if winners.any() else 0.0
+    avg_loss = pnl[losers].mean() if losers.any() else 0.0
+    gross_profit = pnl[winners].sum()
+    gross_loss = abs(pnl[losers].sum())
+
+    exit_dates = np.array([t.get("exit_date", "") for t in trades])
+    order = np.argsort(exit_dates, kind="stable")
+    pnl_sorted = pnl[order]
+    exit_days_sorted = _days(exit_dates[order].tolist()) if n else np.array([], dtype=np.int64)
+
+    if n >= 2:
+        first_entry = _days([trades[order[0]]["entry_date"]])[0]
+        day_span = exit_days_sorted[-1] - first_entry
+        trade_frequency = n / day_span * 7 if day_span > 0 else 0.0
+    else:
+        trade_frequency = 0.0
+
+    avg_cost = cost.mean() if n else 0.0
+    win_streak, loss_streak = streaks(pnl_sorted)
+
+    sharpe = portfolio_sharpe(portfolio_history)
+    if sharpe is None:
+        sharpe = trade_sharpe(trades)
+
+    return {
+        "sharpe_ratio": sharpe if sharpe is not None else 0.0,
+        "sharpe_ratio_trade_method": trade_sharpe(trades) or 0.0,
+        "max_drawdown_percent": max_drawdown(portfolio_history)["percent"],
+        "profit_factor": gross_profit / gross_loss if gross_loss > 0 else 0.0,
+        "recovery_factor": recovery_factor(portfolio_history),
+        "expectancy": (win_rate / 100 * avg_win) + ((100 - win_rate) / 100 * avg_loss),
+        "risk_reward_ratio": avg_win / abs(avg_loss) if avg_loss != 0 else 0.0,
+        "win_streak": win_streak,
+        "loss_streak": loss_streak,
+        "avg_hold_winners": hold[winners].mean() if winners.any() else 0.0,
+        "avg_hold_losers": hold[losers].mean() if losers.any() else 0.0,
+        "trade_frequency": trade_frequency,
+        "capital_efficiency": pnl.sum() / avg_cost * 100 if avg_cost > 0 else 0.0,
+        "days_underwater": days_underwater(pnl_sorted, exit_days_sorted),
+    }
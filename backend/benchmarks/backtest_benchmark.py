@@ -0,0 +1,227 @@
+"""
+Backtest Benchmark
+
+Times the backtest package stages offline on seeded synthetic
+universes, so engine changes can be measured and compared run to run.
+
+For each scenario (tickers × years) the harness:
+    1. Generates a seeded price panel and SPY / FTSE regime series
+    2. Times compute_signals, volatility, compute_atr, backtest and perf_stats
+    3. Records peak RSS of a fresh worker process (one process per scenario,
+       so one scenario's high-water mark never leaks into the next)
+    4. Fingerprints the equity curve and trade log, so two engine versions can
+       be checked for identical results as well as compared for speed
+
+Usage (from backend/):
+    python -m benchmarks.backtest_benchmark
+    python -m benchmarks.backtest_benchmark --scenarios 100x2,600x5 --output backtest.json
+    python -m benchmarks.backtest_benchmark --compare old.json new.json
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from backtest import (
+    OPTIMAL_PARAMS,
+    build_regime,
+    compute_signals,
+    compute_volatility,
+    compute_atr,
+    backtest,
+    perf_stats,
+)
+from benchmarks.synthetic import generate_price_panel, generate_regime_indices
+
+
+DEFAULT_SCENARIOS = "100x2,600x5,3000x20"
+DEFAULT_SEED = 42
+
+
+def parse_scenarios(text: str) -> List[Tuple[int, float]]:
+    """'100x2,600x5' → [(100, 2.0), (600, 5.0)]"""
+    scenarios = []
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        tickers, years = item.lower().split("x")
+        scenarios.append((int(tickers), float(years)))
+    return scenarios
+
+
+def _peak_rss_mib() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _fingerprint(pv, trades) -> str:
+    digest = hashlib.sha256()
+    digest.update(np.round(pv.to_numpy(dtype=float), 6).tobytes())
+    digest.update(str(len(trades)).encode())
+    if len(trades):
+        digest.update(np.round(trades["PnL (£)"].to_numpy(dtype=float), 6).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def run_scenario(n_tickers: int, n_years: float, seed: int = DEFAULT_SEED) -> Dict:
+    """
+    Run every strategy stage once on a synthetic universe
+
+    Args:
+        n_tickers: Universe size
+        n_years: History length in years
+        seed: RNG seed for prices and regime series
+
+    Returns:
+        Dict with per-stage wall times (seconds), total, peak RSS and result fingerprint
+    """
+    params = OPTIMAL_PARAMS
+    stages = {}
+
+    def timed(name, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        stages[name] = round(time.perf_counter() - start, 4)
+        return result
+
+    prices = timed("generate_data", generate_price_panel, n_tickers, n_years, seed)
+    spy, ftse = generate_regime_indices(n_years, seed)
+    regime = timed("regime", build_regime, spy, ftse, prices.index)
+    signals = timed("compute_signals", compute_signals, prices, params["lookback"], params["top_n"])
+    volatility = timed("volatility", compute_volatility, prices)
+    atr = timed("compute_atr", compute_atr, prices)
+
+    pv, returns, trades = timed(
+        "backtest", backtest,
+        signals, prices, volatility, atr, regime,
+        rebalance_freq=params["rebalance_freq"],
+        atr_mult=params["atr_mult"],
+        min_position_pct=params["min_position_pct"],
+        max_position_pct=params["max_position_pct"],
+        min_hold_days=params["min_hold_days"],
+        risk_off_mode=params["risk_off_mode"],
+        stop_loss_mode=params["stop_loss_mode"],
+        initial_atr_mult=params["initial_atr_mult"],
+        profit_atr_mult=params["profit_atr_mult"],
+    )
+    stats = timed("perf_stats", perf_stats, returns, "Synthetic")
+
+    engine_total = sum(v for k, v in stages.items() if k != "generate_data")
+    return {
+        "tickers": n_tickers,
+        "years": n_years,
+        "days": len(prices.index),
+        "seed": seed,
+        "stages_s": stages,
+        "engine_total_s": round(engine_total, 4),
+        "peak_rss_mib": _peak_rss_mib(),
+        "trades": len(trades),
+        "final_value": float(round(pv.iloc[-1], 2)),
+        "cagr_percent": float(stats["CAGR %"]),
+        "fingerprint": _fingerprint(pv, trades),
+    }
+
+
+def run(scenarios: List[Tuple[int, float]], seed: int = DEFAULT_SEED, isolate: bool = True) -> Dict:
+    """Run all scenarios, each in its own spawned process unless isolate is False."""
+    results = []
+    for n_tickers, n_years in scenarios:
+        print(f"→ {n_tickers} tickers × {n_years:g} years...", flush=True)
+        if isolate:
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                result = pool.submit(run_scenario, n_tickers, n_years, seed).result()
+        else:
+            result = run_scenario(n_tickers, n_years, seed)
+        results.append(result)
+        print(f"  ✓ {result['engine_total_s']:.2f}s engine, "
+              f"{result['peak_rss_mib']:.0f} MiB peak, {result['trades']} trades")
+
+    return {
+        "benchmark": "backtest",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "isolated": isolate,
+        "scenarios": results,
+    }
+
+
+def _print_report(report: Dict) -> None:
+    stage_names = list(report["scenarios"][0]["stages_s"].keys()) if report["scenarios"] else []
+    print("\n" + "=" * 70)
+    print("BACKTEST BENCHMARK")
+    print("=" * 70)
+    header = f"{'scenario':<14}" + "".join(f"{n[:12]:>14}" for n in stage_names) + f"{'RSS MiB':>10}"
+    print(header)
+    for s in report["scenarios"]:
+        label = f"{s['tickers']}x{s['years']:g}"
+        row = f"{label:<14}" + "".join(f"{s['stages_s'][n]:>14.3f}" for n in stage_names)
+        print(row + f"{s['peak_rss_mib']:>10.0f}")
+
+
+def compare(baseline_path: str, candidate_path: str) -> int:
+    """
+    Compare two saved reports scenario by scenario
+
+    Returns:
+        1 if any shared scenario produced a different fingerprint, else 0
+    """
+    with open(baseline_path) as f:
+        baseline = {(s["tickers"], s["years"]): s for s in json.load(f)["scenarios"]}
+    with open(candidate_path) as f:
+        candidate = {(s["tickers"], s["years"]): s for s in json.load(f)["scenarios"]}
+
+    mismatches = 0
+    print(f"{'scenario':<14}{'baseline s':>12}{'candidate s':>13}{'speedup':>10}{'RSS Δ MiB':>11}  result")
+    for key in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[key], candidate[key]
+        speedup = old["engine_total_s"] / new["engine_total_s"] if new["engine_total_s"] else float("inf")
+        same = old["fingerprint"] == new["fingerprint"]
+        mismatches += 0 if same else 1
+        label = f"{key[0]}x{key[1]:g}"
+        print(f"{label:<14}{old['engine_total_s']:>12.3f}{new['engine_total_s']:>13.3f}"
+              f"{speedup:>9.2f}x{new['peak_rss_mib'] - old['peak_rss_mib']:>11.0f}  "
+              f"{'identical' if same else 'DIFFERENT'}")
+    return 1 if mismatches else 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the momentum backtest on synthetic universes")
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIOS,
+                        help=f"Comma-separated TICKERSxYEARS list (default: {DEFAULT_SCENARIOS})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run scenarios in this process (faster start, shared RSS high-water mark)")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"),
+                        help="Compare two saved reports instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare)
+
+    report = run(parse_scenarios(args.scenarios), seed=args.seed, isolate=not args.in_process)
+    _print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Import Time Report
+
+Cold-start cost of importing the API: runs `python -X importtime -c
+"import main"` in fresh interpreters and reports the total import time,
+the packages that account for it (self time summed per top-level package)
+and whether any of the lazily loaded heavy modules (lazy_imports.py) were
+imported eagerly.
+
+The first run is discarded (bytecode compilation, cold disk cache); the
+report uses the median of the remaining runs.
+
+Usage (from backend/):
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 7 --top 25 --output imports.json
+    python -m benchmarks.import_time --check --budget-ms 800   # exit 1 on regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from lazy_imports import HEAVY_MODULES
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULE = "main"
+DEFAULT_RUNS = 5
+DEFAULT_TOP = 15
+
+
+def _parse_importtime(stderr: str) -> List[Dict]:
+    """-X importtime lines → [{"module", "self_us", "cumulative_us"}]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append({
+                "module": name.strip(),
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+            })
+        except ValueError:
+            continue
+    return rows
+
+
+def _import_once(module: str) -> List[Dict]:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120,
+    )
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "no output"
+        raise RuntimeError(f"import {module} failed: {last_line}")
+    return _parse_importtime(result.stderr)
+
+
+def measure_imports(module: str = DEFAULT_MODULE, runs: int = DEFAULT_RUNS, top: int = DEFAULT_TOP) -> Dict:
+    """
+    Import a module in fresh interpreters and attribute the time
+
+    Args:
+        module: Module to import (default: the FastAPI app)
+        runs: Measured runs, after one discarded warm-up run
+        top: Packages to list in the breakdown
+
+    Returns:
+        Report dict: total_ms (median), runs_ms, packages (top self time
+        per top-level package, median across runs) and eager_heavy_modules
+
+    Raises:
+        ValueError: If runs < 1
+        RuntimeError: If the import fails
+    """
+    if runs < 1:
+        raise ValueError("runs must be at least 1")
+
+    _import_once(module)  # Warm-up: bytecode and disk cache
+
+    totals = []
+    package_samples: Dict[str, List[float]] = defaultdict(list)
+    imported = set()
+    for _ in range(runs):
+        rows = _import_once(module)
+        target = [r for r in rows if r["module"] == module]
+        totals.append(target[-1]["cumulative_us"] / 1000 if target else 0.0)
+
+        per_package: Dict[str, int] = defaultdict(int)
+        for r in rows:
+            per_package[r["module"].split(".")[0]] += r["self_us"]
+            imported.add(r["module"])
+        for package, self_us in per_package.items():
+            package_samples[package].append(self_us / 1000)
+
+    packages = sorted(
+        ((name, statistics.median(samples)) for name, samples in package_samples.items()),
+        key=lambda item: item[1], reverse=True,
+    )
+
+    return {
+        "benchmark": "import_time",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "git_commit": _git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "parameters": {"module": module, "runs": runs},
+        "total_ms": round(statistics.median(totals), 1),
+        "runs_ms": [round(t, 1) for t in totals],
+        "packages": [{"package": name, "self_ms": round(ms, 1)} for name, ms in packages[:top]],
+        "eager_heavy_modules": [name for name in HEAVY_MODULES if name in imported],
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _print_report(report: Dict) -> None:
+    params = report["parameters"]
+    print("\n" + "=" * 60)
+    print(f"IMPORT TIME — import {params['module']} ({report['git_commit'] or 'unknown commit'})")
+    print("=" * 60)
+    print(f"Total: {report['total_ms']:.0f}ms (median of {params['runs']}: "
+          f"{', '.join(f'{t:.0f}' for t in report['runs_ms'])})\n")
+    print(f"{'package':<40}{'self ms':>10}{'share':>10}")
+    for p in report["packages"]:
+        share = p["self_ms"] / report["total_ms"] * 100 if report["total_ms"] else 0.0
+        print(f"{p['package'][:39]:<40}{p['self_ms']:>10.1f}{share:>9.1f}%")
+    print()
+    if report["eager_heavy_modules"]:
+        print(f"⚠️  Imported eagerly: {', '.join(report['eager_heavy_modules'])}")
+    else:
+        print(f"✓ Not imported at startup: {', '.join(HEAVY_MODULES)}")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report cold-start import time of the API")
+    parser.add_argument("--module", default=DEFAULT_MODULE, help="Module to import (default: main)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Packages to list")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit 1 if a heavy module is imported eagerly or the budget is exceeded")
+    parser.add_argument("--budget-ms", type=float, help="Total import time budget for --check")
+    args = parser.parse_args(argv)
+
+    try:
+        report = measure_imports(args.module, runs=args.runs, top=args.top)
+    except (RuntimeError, ValueError) as e:
+        print(f"❌ {e}")
+        return 2
+    _print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.output}")
+
+    if not args.check:
+        return 0
+    failed = bool(report["eager_heavy_modules"])
+    if args.budget_ms is not None and report["total_ms"] > args.budget_ms:
+        print(f"❌ Import time {report['total_ms']:.0f}ms exceeds budget {args.budget_ms:.0f}ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
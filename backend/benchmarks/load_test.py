@@ -0,0 +1,439 @@
+"""
+Load Test
+
+Drives the running API with N virtual users replaying dashboard-style
+scenarios, and reports throughput, latency percentiles and error rates per
+endpoint. Reports are saved as JSON so capacity can be compared release to
+release.
+
+Scenarios (each virtual user loops over one, assigned round-robin):
+    - dashboard: Portfolio, positions, market status and pending signals
+    - signals: Momentum signal generation plus the signal list
+    - analytics: Analytics metrics, trade history, portfolio history, cash summary
+    - trade_entry: Size a position, enter it, then exit it (writes to the database)
+
+The target stack is local: a scratch Postgres database and the market data
+stand-in, so results measure the app rather than Yahoo. Point DATABASE_URL
+at a database you can write to; trade_entry adds and exits real positions
+and needs enough cash in the portfolio for its entries.
+
+Usage (from backend/):
+    python -m market_data.server --synthesize --latency-ms 80 --jitter-ms 40
+    MARKET_DATA_PROVIDER=http MARKET_DATA_BASE_URL=http://127.0.0.1:8765 \\
+        uvicorn main:app --port 8000 --workers 2
+
+    python -m benchmarks.load_test --users 20 --duration 60 --output load.json
+    python -m benchmarks.load_test --scenarios dashboard,analytics --users 50 --ramp-up 10
+    python -m benchmarks.load_test --compare load_v1.json load_v2.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from config import DEFAULT_FX_RATE
+
+
+DEFAULT_BASE_URL = "http://127.0.0.1:8000"
+DEFAULT_SCENARIOS = "dashboard,signals,analytics,trade_entry"
+DEFAULT_USERS = 10
+DEFAULT_DURATION_S = 30.0
+DEFAULT_THINK_TIME_MS = 500
+DEFAULT_TIMEOUT_S = 30.0
+DEFAULT_TOLERANCE = 0.20
+MIN_REGRESSION_MS = 5.0  # Ignore p95 noise on endpoints that answer in a few ms
+DEFAULT_SEED = 42
+
+
+def step(method: str, path: str, name: str = None, body: Dict = None,
+         params: Dict = None, capture: Dict = None) -> Dict:
+    """
+    One request in a scenario
+
+    Args:
+        method: HTTP method
+        path: Path template; {name} placeholders are filled from captured values
+        name: Endpoint label in the report (defaults to "METHOD path")
+        body: JSON body (POST)
+        params: Query parameters
+        capture: {variable: "data.field"} values to keep from the JSON response
+    """
+    return {
+        "name": name or f"{method} {path}",
+        "method": method,
+        "path": path,
+        "body": body,
+        "params": params,
+        "capture": capture or {},
+    }
+
+
+def build_scenarios(ticker: str = "AAPL", market: str = "US", fx_rate: float = DEFAULT_FX_RATE,
+                    entry_price: float = 100.0) -> Dict[str, Dict]:
+    """Scenario name → {"description", "steps"} (trade_entry uses the given instrument; fx_rate is GBP/USD)."""
+    trade_date = datetime.now().strftime("%Y-%m-%d")
+    return {
+        "dashboard": {
+            "description": "Dashboard page load",
+            "steps": [
+                step("GET", "/portfolio"),
+                step("GET", "/positions"),
+                step("GET", "/market/status"),
+                step("GET", "/signals", params={"status": "new"}),
+            ],
+        },
+        "signals": {
+            "description": "Signal generation",
+            "steps": [
+                step("POST", "/signals/generate"),
+                step("GET", "/signals"),
+            ],
+        },
+        "analytics": {
+            "description": "Analytics page load",
+            "steps": [
+                step("GET", "/analytics/metrics", params={"period": "all_time"}),
+                step("GET", "/trades"),
+                step("GET", "/portfolio/history"),
+                step("GET", "/cash/summary"),
+            ],
+        },
+        "trade_entry": {
+            "description": "Size, enter and exit a one-share position",
+            "steps": [
+                step("POST", "/portfolio/size", body={
+                    "entry_price": entry_price,
+                    "stop_price": round(entry_price * 0.9, 2),
+                    "risk_percent": 1.0,
+                    "market": market,
+                    "fx_rate": fx_rate if market == "US" else None,
+                }),
+                step("POST", "/portfolio/position", body={
+                    "ticker": ticker,
+                    "market": market,
+                    "entry_date": trade_date,
+                    "shares": 1,
+                    "entry_price": entry_price,
+                    "fx_rate": fx_rate if market == "US" else None,
+                    "entry_note": "load test",
+                }, capture={"position_id": "data.position_id"}),
+                step("POST", "/positions/{position_id}/exit", body={
+                    "exit_price": entry_price,
+                    "exit_date": trade_date,
+                    "exit_reason": "Manual Exit",
+                    "exit_fx_rate": fx_rate if market == "US" else None,
+                    "exit_note": "load test",
+                }),
+            ],
+        },
+    }
+
+
+def _lookup(payload, dotted: str):
+    for part in dotted.split("."):
+        if not isinstance(payload, dict):
+            return None
+        payload = payload.get(part)
+    return payload
+
+
+async def _request(client: httpx.AsyncClient, request_step: Dict, variables: Dict) -> Dict:
+    try:
+        path = request_step["path"].format(**variables)
+    except KeyError as e:
+        # An earlier step in this iteration failed to produce the value
+        return {"name": request_step["name"], "ms": 0.0, "error": f"Missing {e} from an earlier step"}
+
+    start = time.perf_counter()
+    try:
+        response = await client.request(
+            request_step["method"], path, json=request_step["body"], params=request_step["params"]
+        )
+    except httpx.TimeoutException:
+        return {"name": request_step["name"], "ms": (time.perf_counter() - start) * 1000, "error": "timeout"}
+    except httpx.HTTPError as e:
+        return {"name": request_step["name"], "ms": (time.perf_counter() - start) * 1000,
+                "error": f"{type(e).__name__}: {str(e)[:100]}"}
+
+    ms = (time.perf_counter() - start) * 1000
+    error = None
+    if response.status_code >= 400:
+        error = f"HTTP {response.status_code}"
+    else:
+        # Some endpoints (e.g. GET /portfolio) report failures as 200 {"status": "error"}
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict) and payload.get("status") == "error":
+            error = "status=error"
+        for variable, dotted in request_step["capture"].items():
+            value = _lookup(payload, dotted)
+            if value is not None:
+                variables[variable] = value
+    return {"name": request_step["name"], "ms": ms, "error": error}
+
+
+async def _virtual_user(client: httpx.AsyncClient, scenario: Dict, deadline: float, start_delay: float,
+                        think_time_ms: float, rng: random.Random, samples: List[Dict]) -> int:
+    """Loop over one scenario until the deadline; returns completed iterations."""
+    await asyncio.sleep(start_delay)
+    iterations = 0
+    while time.perf_counter() < deadline:
+        variables = {}
+        for request_step in scenario["steps"]:
+            if time.perf_counter() >= deadline:
+                return iterations
+            samples.append(await _request(client, request_step, variables))
+            if think_time_ms:
+                # ±50% jitter so users do not march in lockstep
+                await asyncio.sleep(think_time_ms * rng.uniform(0.5, 1.5) / 1000)
+        iterations += 1
+    return iterations
+
+
+def _endpoint_stats(samples: List[Dict], elapsed_s: float) -> Dict:
+    durations = np.array([s["ms"] for s in samples if s["error"] is None])
+    errors = [s["error"] for s in samples if s["error"] is not None]
+
+    def pct(q):
+        return round(float(np.percentile(durations, q)), 2) if len(durations) else None
+
+    return {
+        "requests": len(samples),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / len(samples), 4) if samples else 0.0,
+        "rps": round(len(samples) / elapsed_s, 2) if elapsed_s else 0.0,
+        "p50_ms": pct(50),
+        "p90_ms": pct(90),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": round(float(durations.max()), 2) if len(durations) else None,
+        "top_errors": dict(sorted(
+            ((e, errors.count(e)) for e in set(errors)), key=lambda item: -item[1]
+        )[:3]),
+    }
+
+
+async def run_load_test(base_url: str, scenario_names: List[str], users: int,
+                        duration_s: float, ramp_up_s: float = 0.0,
+                        think_time_ms: float = DEFAULT_THINK_TIME_MS,
+                        timeout_s: float = DEFAULT_TIMEOUT_S, seed: int = DEFAULT_SEED,
+                        scenarios: Dict[str, Dict] = None) -> Dict:
+    """
+    Run `users` virtual users against base_url for duration_s seconds
+
+    Args:
+        base_url: API root, e.g. "http://127.0.0.1:8000"
+        scenario_names: Scenarios to run; users are assigned round-robin
+        users: Number of concurrent virtual users
+        duration_s: Measured run length in seconds (includes ramp-up)
+        ramp_up_s: Users start evenly spread over this many seconds
+        think_time_ms: Mean pause between a user's requests
+        timeout_s: Per-request timeout
+        seed: RNG seed for think-time jitter
+        scenarios: Scenario definitions (default: build_scenarios())
+
+    Returns:
+        Report dict with per-endpoint and per-scenario results and totals
+
+    Raises:
+        ValueError: If a scenario name is unknown or users / duration are not positive
+    """
+    scenarios = scenarios or build_scenarios()
+    unknown = [name for name in scenario_names if name not in scenarios]
+    if unknown:
+        raise ValueError(f"Unknown scenario(s): {', '.join(unknown)} (available: {', '.join(scenarios)})")
+    if users < 1 or duration_s <= 0:
+        raise ValueError("users and duration must be positive")
+
+    rng = random.Random(seed)
+    assignments = [scenario_names[i % len(scenario_names)] for i in range(users)]
+    samples = {name: [] for name in scenario_names}
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+
+    async with httpx.AsyncClient(base_url=base_url.rstrip("/"), timeout=timeout_s, limits=limits) as client:
+        started = time.perf_counter()
+        deadline = started + duration_s
+        iterations = await asyncio.gather(*(
+            _virtual_user(
+                client, scenarios[name], deadline,
+                start_delay=ramp_up_s * i / users,
+                think_time_ms=think_time_ms,
+                rng=random.Random(rng.random()),
+                samples=samples[name],
+            )
+            for i, name in enumerate(assignments)
+        ))
+        elapsed_s = time.perf_counter() - started
+
+    all_samples = [s for scenario_samples in samples.values() for s in scenario_samples]
+    endpoints = {}
+    for name in sorted({s["name"] for s in all_samples}):
+        endpoints[name] = _endpoint_stats([s for s in all_samples if s["name"] == name], elapsed_s)
+
+    scenario_results = {}
+    for name in scenario_names:
+        completed = sum(n for assigned, n in zip(assignments, iterations) if assigned == name)
+        scenario_results[name] = {
+            "description": scenarios[name]["description"],
+            "users": assignments.count(name),
+            "iterations": completed,
+            "iterations_per_s": round(completed / elapsed_s, 2),
+            **{k: v for k, v in _endpoint_stats(samples[name], elapsed_s).items() if k != "top_errors"},
+        }
+
+    return {
+        "benchmark": "load_test",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "git_commit": _git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "parameters": {
+            "base_url": base_url,
+            "users": users,
+            "duration_s": duration_s,
+            "ramp_up_s": ramp_up_s,
+            "think_time_ms": think_time_ms,
+            "timeout_s": timeout_s,
+            "seed": seed,
+            "scenarios": scenario_names,
+        },
+        "elapsed_s": round(elapsed_s, 2),
+        "totals": {k: v for k, v in _endpoint_stats(all_samples, elapsed_s).items() if k != "top_errors"},
+        "scenarios": scenario_results,
+        "endpoints": endpoints,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _print_report(report: Dict) -> None:
+    params = report["parameters"]
+    print("\n" + "=" * 100)
+    print(f"LOAD TEST — {params['users']} users, {report['elapsed_s']:.0f}s, "
+          f"{params['think_time_ms']:.0f}ms think time ({report['git_commit'] or 'unknown commit'})")
+    print("=" * 100)
+    print(f"{'endpoint':<40}{'reqs':>7}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'errors':>9}")
+    for name, e in report["endpoints"].items():
+        def ms(value):
+            return f"{value:>9.0f}" if value is not None else f"{'-':>9}"
+        print(f"{name[:39]:<40}{e['requests']:>7}{e['rps']:>8.1f}"
+              f"{ms(e['p50_ms'])}{ms(e['p95_ms'])}{ms(e['p99_ms'])}{ms(e['max_ms'])}"
+              f"{e['error_rate'] * 100:>8.1f}%")
+        for error, count in e["top_errors"].items():
+            print(f"    ⚠️  {count}x {error}")
+    totals = report["totals"]
+    print("-" * 100)
+    print(f"{'TOTAL':<40}{totals['requests']:>7}{totals['rps']:>8.1f}"
+          f"{totals['p50_ms'] or 0:>9.0f}{totals['p95_ms'] or 0:>9.0f}{totals['p99_ms'] or 0:>9.0f}"
+          f"{totals['max_ms'] or 0:>9.0f}{totals['error_rate'] * 100:>8.1f}%")
+    print("\nScenarios:")
+    for name, s in report["scenarios"].items():
+        print(f"  {name:<14}{s['users']:>4} users {s['iterations']:>6} iterations "
+              f"({s['iterations_per_s']:.2f}/s)  p95 {s['p95_ms'] or 0:.0f}ms  "
+              f"errors {s['error_rate'] * 100:.1f}%")
+
+
+def compare(baseline_path: str, candidate_path: str, tolerance: float = DEFAULT_TOLERANCE) -> int:
+    """
+    Compare two saved reports endpoint by endpoint
+
+    Reports are only comparable when run with the same users, think time and
+    scenarios; a warning is printed when they differ.
+
+    Returns:
+        1 if any shared endpoint's p95 grew by more than `tolerance` (and by
+        more than MIN_REGRESSION_MS) or its error rate increased, else 0
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(candidate_path) as f:
+        candidate = json.load(f)
+
+    for key in ("users", "think_time_ms", "scenarios"):
+        if baseline["parameters"].get(key) != candidate["parameters"].get(key):
+            print(f"⚠️  {key} differs: {baseline['parameters'].get(key)} vs {candidate['parameters'].get(key)}")
+
+    regressions = 0
+    print(f"{'endpoint':<40}{'rps':>16}{'p95 ms':>18}{'errors %':>16}  result")
+    shared = sorted(baseline["endpoints"].keys() & candidate["endpoints"].keys())
+    for name in shared:
+        old, new = baseline["endpoints"][name], candidate["endpoints"][name]
+        old_p95, new_p95 = old["p95_ms"] or 0.0, new["p95_ms"] or 0.0
+        slower = new_p95 > old_p95 * (1 + tolerance) and new_p95 - old_p95 > MIN_REGRESSION_MS
+        more_errors = new["error_rate"] > old["error_rate"]
+        regressed = slower or more_errors
+        regressions += 1 if regressed else 0
+        print(f"{name[:39]:<40}{old['rps']:>7.1f} →{new['rps']:>7.1f}"
+              f"{old_p95:>8.0f} →{new_p95:>8.0f}"
+              f"{old['error_rate'] * 100:>7.1f} →{new['error_rate'] * 100:>6.1f}  "
+              f"{'REGRESSED' if regressed else 'ok'}")
+    for name in sorted(baseline["endpoints"].keys() ^ candidate["endpoints"].keys()):
+        print(f"{name[:39]:<40}  only in {'baseline' if name in baseline['endpoints'] else 'candidate'}")
+    return 1 if regressions else 0
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the API with scenario-driven virtual users")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIOS,
+                        help=f"Comma-separated scenario names (default: {DEFAULT_SCENARIOS})")
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION_S, help="Seconds")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds to start all users over")
+    parser.add_argument("--think-time", type=float, default=DEFAULT_THINK_TIME_MS,
+                        help="Mean pause between a user's requests in ms (0 = closed loop)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--ticker", default="AAPL", help="Instrument for trade_entry")
+    parser.add_argument("--market", default="US", choices=["US", "UK"])
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"),
+                        help="Compare two saved reports instead of running")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed p95 growth when comparing (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare, tolerance=args.tolerance)
+
+    scenario_names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    try:
+        report = asyncio.run(run_load_test(
+            args.base_url, scenario_names, args.users, args.duration,
+            ramp_up_s=args.ramp_up, think_time_ms=args.think_time,
+            timeout_s=args.timeout, seed=args.seed,
+            scenarios=build_scenarios(ticker=args.ticker, market=args.market),
+        ))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+    _print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.output}")
+    return 1 if report["totals"]["requests"] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
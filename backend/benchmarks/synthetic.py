@@ -0,0 +1,208 @@
+"""
+Synthetic Data Generators
+
+Seeded generators producing data in the exact shape the services consume,
+so benchmarks exercise the same code paths as production requests.
+
+Functions:
+    - generate_trades(): Closed trades shaped like the /analytics/metrics query rows
+    - generate_portfolio_history(): Daily snapshots shaped like portfolio_history rows
+    - generate_price_panel(): Business-day close panel shaped like the backtest download
+    - generate_regime_indices(): SPY / FTSE closes for the risk-on regime filter
+
+The same (n, seed) pair always produces identical output.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+BASE_DATE = np.datetime64("2000-01-03")
+
+US_TICKERS = ["NVDA", "MU", "STX", "PLTR", "AMD", "AVGO", "META", "NFLX"]
+UK_TICKERS = ["FRES.L", "RR.L", "BARC.L", "AZN.L", "HSBA.L", "GLEN.L"]
+
+EXIT_REASONS = [
+    "Trailing Stop",
+    "Stop Loss Hit",
+    "Risk-Off Signal",
+    "Manual Exit",
+    "No longer qualifies",
+]
+
+
+def _iso_dates(days: np.ndarray) -> List[str]:
+    """Convert day offsets from BASE_DATE to ISO date strings (YYYY-MM-DD)."""
+    return (BASE_DATE + days.astype("timedelta64[D]")).astype(str).tolist()
+
+
+def generate_trades(n: int, seed: int = 42) -> List[Dict]:
+    """
+    Generate n closed trades with a fixed seed
+
+    Args:
+        n: Number of trades
+        seed: RNG seed (same seed → identical trades)
+
+    Returns:
+        List of trade dicts with the fields AnalyticsService reads:
+        ticker, market, entry_date, exit_date, shares, entry_price,
+        exit_price, total_cost, pnl, pnl_percent, exit_reason, holding_days
+
+    Note:
+        - Entry dates are spread so that roughly two trades close per day
+        - Returns are drawn from a fat-tailed distribution with a small
+          positive drift, giving realistic win rates (35–50%)
+    """
+    rng = np.random.default_rng(seed)
+
+    is_uk = rng.random(n) < 0.35
+    us_idx = rng.integers(0, len(US_TICKERS), n)
+    uk_idx = rng.integers(0, len(UK_TICKERS), n)
+
+    span_days = max(1, n // 2)
+    entry_offsets = np.sort(rng.integers(0, span_days + 1, n))
+    holding_days = rng.integers(1, 61, n)
+    exit_offsets = entry_offsets + holding_days
+
+    entry_price = np.round(rng.uniform(5.0, 800.0, n), 2)
+    shares = np.round(rng.uniform(0.5, 40.0, n), 4)
+    returns = rng.standard_t(df=3, size=n) * 0.06 + 0.004
+    exit_price = np.round(entry_price * (1.0 + returns), 2)
+
+    total_cost = np.round(entry_price * shares * 1.003, 2)
+    pnl = np.round((exit_price - entry_price) * shares, 2)
+    pnl_percent = np.round(np.divide(pnl, total_cost) * 100, 2)
+
+    reasons = rng.integers(0, len(EXIT_REASONS), n)
+    entry_dates = _iso_dates(entry_offsets)
+    exit_dates = _iso_dates(exit_offsets)
+
+    tickers = [
+        UK_TICKERS[u] if uk else US_TICKERS[s]
+        for uk, u, s in zip(is_uk.tolist(), uk_idx.tolist(), us_idx.tolist())
+    ]
+
+    return [
+        {
+            "id": f"synthetic-{i}",
+            "ticker": tickers[i],
+            "market": "UK" if is_uk[i] else "US",
+            "entry_date": entry_dates[i],
+            "exit_date": exit_dates[i],
+            "shares": float(shares[i]),
+            "entry_price": float(entry_price[i]),
+            "exit_price": float(exit_price[i]),
+            "total_cost": float(total_cost[i]),
+            "pnl": float(pnl[i]),
+            "pnl_percent": float(pnl_percent[i]),
+            "exit_reason": EXIT_REASONS[reasons[i]],
+            "holding_days": int(holding_days[i]),
+        }
+        for i in range(n)
+    ]
+
+
+def generate_portfolio_history(n: int, seed: int = 42, start_value: float = 5000.0) -> List[Dict]:
+    """
+    Generate n consecutive daily portfolio snapshots with a fixed seed
+
+    Args:
+        n: Number of snapshots
+        seed: RNG seed (same seed → identical series)
+        start_value: Opening total_value in GBP
+
+    Returns:
+        List of snapshot dicts with snapshot_date, total_value,
+        cash_balance, positions_value, total_pnl, position_count
+
+    Note:
+        Total value follows a geometric random walk (≈15% annualised
+        volatility), so drawdowns and recoveries both occur at every scale.
+    """
+    rng = np.random.default_rng(seed + 1)
+
+    daily_returns = rng.normal(0.0004, 0.0095, n)
+    daily_returns[0] = 0.0
+    total_value = np.round(start_value * np.cumprod(1.0 + daily_returns), 2)
+    cash_fraction = rng.uniform(0.05, 0.6, n)
+    cash_balance = np.round(total_value * cash_fraction, 2)
+    positions_value = np.round(total_value - cash_balance, 2)
+    total_pnl = np.round(total_value - start_value, 2)
+    position_count = rng.integers(0, 6, n)
+
+    dates = _iso_dates(np.arange(n))
+
+    return [
+        {
+            "snapshot_date": dates[i],
+            "total_value": float(total_value[i]),
+            "cash_balance": float(cash_balance[i]),
+            "positions_value": float(positions_value[i]),
+            "total_pnl": float(total_pnl[i]),
+            "position_count": int(position_count[i]),
+        }
+        for i in range(n)
+    ]
+
+
+def _business_days(n_years: float) -> pd.DatetimeIndex:
+    return pd.bdate_range("2004-01-01", periods=max(1, int(round(n_years * 252))))
+
+
+def generate_price_panel(n_tickers: int, n_years: float, seed: int = 42) -> pd.DataFrame:
+    """
+    Generate a seeded close-price panel (dates × tickers)
+
+    Args:
+        n_tickers: Number of tickers (columns)
+        n_years: History length in years (252 business days per year)
+        seed: RNG seed (same arguments → identical panel)
+
+    Returns:
+        DataFrame indexed by business day, one float64 column per ticker.
+        Roughly 35% of tickers carry a .L suffix so UK fee and regime
+        rules are exercised.
+
+    Note:
+        Each ticker follows a geometric random walk with its own drift
+        (-5% to +25% a year) and volatility (15% to 60% a year), so the
+        momentum ranking changes constantly and stops are hit at every scale.
+    """
+    rng = np.random.default_rng(seed)
+    index = _business_days(n_years)
+
+    drift = rng.uniform(-0.05, 0.25, n_tickers) / 252
+    vol = rng.uniform(0.15, 0.60, n_tickers) / np.sqrt(252)
+    shocks = rng.standard_normal((len(index), n_tickers)).astype(np.float64)
+    log_returns = (drift - 0.5 * vol ** 2) + vol * shocks
+    log_returns[0] = 0.0
+    start = rng.uniform(5.0, 500.0, n_tickers)
+    closes = start * np.exp(np.cumsum(log_returns, axis=0))
+
+    is_uk = rng.random(n_tickers) < 0.35
+    columns = [f"SYN{i:05d}{'.L' if uk else ''}" for i, uk in enumerate(is_uk)]
+
+    return pd.DataFrame(np.round(closes, 4), index=index, columns=columns)
+
+
+def generate_regime_indices(n_years: float, seed: int = 42) -> Tuple[pd.Series, pd.Series]:
+    """
+    Generate seeded SPY and FTSE close series on the same calendar as
+    generate_price_panel(), for building the risk-on regime filter.
+
+    Returns:
+        (spy, ftse) Series — both spend most, but not all, of the time
+        above their 200-day moving average
+    """
+    rng = np.random.default_rng(seed + 2)
+    index = _business_days(n_years)
+
+    def walk(start: float, annual_drift: float, annual_vol: float) -> pd.Series:
+        returns = rng.normal(annual_drift / 252, annual_vol / np.sqrt(252), len(index))
+        returns[0] = 0.0
+        return pd.Series(start * np.cumprod(1.0 + returns), index=index)
+
+    return walk(400.0, 0.08, 0.18), walk(7000.0, 0.04, 0.16)
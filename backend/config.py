@@ -4,6 +4,8 @@ Application Configuration
 Constants and configuration values for the Trading Assistant API.
 """
 
+import os
+
 # API Metadata
 API_TITLE = "Trading Assistant API"
 API_VERSION = "1.2.0"
@@ -48,7 +50,75 @@ DEFAULT_FX_RATE = 1.27  # GBP/USD fallback if API fails
 # Price Conversion
 PENCE_TO_POUNDS_THRESHOLD = 1000  # UK prices above this are in pence
 
+# Logging (see utils/logging_setup.py)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # text | json
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))  # Share of repeated DEBUG lines kept
+
+# Per-request profiling (see routers/profiles.py) - disabled while PROFILE_TOKEN is empty
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+PROFILE_MAX_STORED = 20  # Most recent profiles kept in memory
+
+# Settings cache (see database.get_settings) - invalidated on write and via
+# Postgres NOTIFY; the TTL only matters if a notification is missed
+SETTINGS_CACHE_TTL_SECONDS = int(os.getenv("SETTINGS_CACHE_TTL_SECONDS", "300"))
+SETTINGS_LISTEN = os.getenv("SETTINGS_LISTEN", "true").lower() == "true"
+
+# DB query budgets (see utils/query_budget.py)
+# Statements per request before a route is flagged. Mode: off | log | raise
+# ("raise" turns an over-budget request into an error - meant for test runs)
+DB_QUERY_BUDGET = int(os.getenv("DB_QUERY_BUDGET", "20"))
+DB_QUERY_BUDGET_MODE = os.getenv("DB_QUERY_BUDGET_MODE", "log")
+DB_QUERY_BUDGETS = {
+    # Routes that legitimately write once per open position
+    "GET /positions/analyze": 60,
+}
+N_PLUS_ONE_THRESHOLD = 3  # Same statement this many times in one request is reported
+
+# Smoke tests (POST /test/endpoints) - concurrent requests with per-endpoint p95 budgets
+SMOKE_TEST_CONCURRENCY = int(os.getenv("SMOKE_TEST_CONCURRENCY", "6"))
+SMOKE_TEST_BUDGET_MS = 2000  # Default p95 budget per endpoint
+SMOKE_TEST_LIVE_PRICE_BUDGET_MS = 10000  # Endpoints that fetch live prices
+SMOKE_TEST_TIMEOUT_SECONDS = 30.0
+
+# Health checks - /health/ready serves cached results of background component
+# checks; readiness fails once the last check is older than the stale limit
+HEALTH_MONITOR = os.getenv("HEALTH_MONITOR", "true").lower() == "true"
+HEALTH_CHECK_INTERVAL_SECONDS = int(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "30"))
+HEALTH_CHECK_STALE_SECONDS = HEALTH_CHECK_INTERVAL_SECONDS * 3
+
+# Startup - pandas, numpy, requests and httpx are imported on first use
+# (lazy_imports.py), so simple endpoints are served without them.
+# IMPORT_WARM_UP controls when they are loaded ahead of that first use:
+# background - in a thread once the app has started (default)
+# eager      - during startup, before the first request is served
+# off        - never; first use pays (fastest cold start on sleeping hosts)
+IMPORT_WARM_UP = os.getenv("IMPORT_WARM_UP", "background").lower()
+
 # API Delays (rate limiting)
 PRICE_FETCH_DELAY_SECONDS = 0.3
 FX_RATE_FETCH_DELAY_SECONDS = 0.2
 MARKET_REGIME_FETCH_DELAY_SECONDS = 0.3
+
+# Position Snapshot (price + ATR + closes from one history request)
+SNAPSHOT_RANGE = "3mo"  # Enough bars for a 14-day ATR after holidays / gaps
+ATR_CACHE_MAX_AGE_HOURS = 24  # positions.atr is recalculated at most daily
+
+# Market Data Provider
+# live   - Yahoo Finance chart API (default, rate-limit delays applied)
+# http   - Any server speaking the Yahoo chart API, e.g. the local stand-in
+#          (python -m market_data.server); no rate-limit delays
+# replay - Recorded chart JSON files on disk; no network at all
+MARKET_DATA_PROVIDER = os.getenv("MARKET_DATA_PROVIDER", "live")
+MARKET_DATA_BASE_URL = os.getenv("MARKET_DATA_BASE_URL", "https://query1.finance.yahoo.com")
+MARKET_DATA_REPLAY_DIR = os.getenv("MARKET_DATA_REPLAY_DIR", "market_data_recordings")
+MARKET_DATA_SYNTHESIZE = os.getenv("MARKET_DATA_SYNTHESIZE", "false").lower() == "true"  # Replay: generate missing symbols
+MARKET_DATA_RECORD_DIR = os.getenv("MARKET_DATA_RECORD_DIR", "")  # Save every response here when set
+MARKET_DATA_TIMEOUT_SECONDS = float(os.getenv("MARKET_DATA_TIMEOUT_SECONDS", "15"))
+
+# Fault injection (any provider) - for deterministic latency / failure testing
+MARKET_DATA_LATENCY_MS = float(os.getenv("MARKET_DATA_LATENCY_MS", "0"))
+MARKET_DATA_JITTER_MS = float(os.getenv("MARKET_DATA_JITTER_MS", "0"))
+MARKET_DATA_ERROR_RATE = float(os.getenv("MARKET_DATA_ERROR_RATE", "0"))  # 0.0 - 1.0
+MARKET_DATA_SEED = int(os.getenv("MARKET_DATA_SEED", "42"))
@@ -1,22 +1,75 @@
+from __future__ import annotations
+
 import os
+import copy
+import uuid
+import select
+import threading
+import time
 import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 from typing import Optional, List, Dict
 from datetime import datetime
-import pandas as pd
-import time
-import requests
+from lazy_imports import lazy_module
+
+from market_data import get_provider, parse_chart, MarketDataError
+from utils.timing import span, timed
+from utils.query_budget import record_statement, record_connection
+from unit_of_work import current_unit_of_work
+from config import SETTINGS_CACHE_TTL_SECONDS
+from utils.logging_setup import get_logger
 
+logger = get_logger(__name__)
+
+pd = lazy_module("pandas")
+
+# Checked when a connection is opened, not at import, so the app (and
+# anything importing it) starts without a database configured
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL environment variable not set")
+
+def _database_url() -> str:
+    if not DATABASE_URL:
+        raise ValueError("DATABASE_URL environment variable not set")
+    return DATABASE_URL
+
+
+class CountingCursor(RealDictCursor):
+    """RealDictCursor that reports each statement to the active query account"""
+
+    def execute(self, query, vars=None):
+        record_statement(query)
+        return super().execute(query, vars)
+
+    def executemany(self, query, vars_list):
+        record_statement(query)
+        return super().executemany(query, vars_list)
+
+
+def _connect():
+    record_connection()
+    with span("db.connect"):
+        return psycopg2.connect(_database_url(), cursor_factory=CountingCursor)
+
 
 @contextmanager
 def get_db():
-    """Database connection context manager"""
-    conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
+    """
+    Database connection context manager
+    
+    Inside a unit of work (unit_of_work.py) the unit's shared connection is
+    yielded instead; it is committed or rolled back when the unit ends.
+    """
+    uow = current_unit_of_work()
+    if uow is not None:
+        if uow.conn is None:
+            uow.conn = _connect()
+        yield uow.conn
+        return
+
+    conn = _connect()
     try:
         yield conn
         conn.commit()  # CRITICAL: Ensure commit happens
@@ -27,14 +80,38 @@ def get_db():
         conn.close()
 
 
+@timed("db.ping")
+def ping() -> bool:
+    """Round trip to the database (SELECT 1) for health checks"""
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1 AS ok")
+            return cur.fetchone() is not None
+
+
+@timed("db.get_portfolio")
 def get_portfolio() -> Optional[Dict]:
-    """Get the main portfolio (assumes single portfolio)"""
+    """
+    Get the main portfolio (assumes single portfolio)
+    
+    Cached for the duration of a unit of work; read FOR UPDATE when the
+    unit locks the portfolio.
+    """
+    uow = current_unit_of_work()
+    if uow is not None:
+        return uow.cached(("portfolio",), lambda: _select_portfolio(uow.lock_portfolio))
+    return _select_portfolio()
+
+
+def _select_portfolio(for_update: bool = False) -> Optional[Dict]:
     with get_db() as conn:
         with conn.cursor() as cur:
-            cur.execute("SELECT * FROM portfolios LIMIT 1")
-            return cur.fetchone()
+            cur.execute("SELECT * FROM portfolios LIMIT 1" + (" FOR UPDATE" if for_update else ""))
+            row = cur.fetchone()
+            return dict(row) if row else None
 
 
+@timed("db.update_portfolio_cash")
 def update_portfolio_cash(portfolio_id: str, cash: float):
     """Update portfolio cash balance"""
     with get_db() as conn:
@@ -44,9 +121,25 @@ def update_portfolio_cash(portfolio_id: str, cash: float):
                 (cash, portfolio_id)
             )
 
+    uow = current_unit_of_work()
+    if uow is not None:
+        uow.patch(("portfolio",), {"cash": cash})
+
 
+@timed("db.get_positions")
 def get_positions(portfolio_id: str, status: str = None) -> List[Dict]:
-    """Get positions, optionally filtered by status"""
+    """
+    Get positions, optionally filtered by status
+    
+    Open positions are cached for the duration of a unit of work.
+    """
+    uow = current_unit_of_work()
+    if uow is not None and status == 'open':
+        return uow.cached(("positions", portfolio_id), lambda: _select_positions(portfolio_id, status))
+    return _select_positions(portfolio_id, status)
+
+
+def _select_positions(portfolio_id: str, status: str = None) -> List[Dict]:
     with get_db() as conn:
         with conn.cursor() as cur:
             if status:
@@ -59,9 +152,137 @@ def get_positions(portfolio_id: str, status: str = None) -> List[Dict]:
                     "SELECT * FROM positions WHERE portfolio_id = %s ORDER BY entry_date DESC",
                     (portfolio_id,)
                 )
-            return cur.fetchall()
+            return [dict(row) for row in cur.fetchall()]
+
+
+@timed("db.get_position")
+def get_position(position_id: str) -> Optional[Dict]:
+    """Get one position by id (primary key lookup); None if not found"""
+    try:
+        uuid.UUID(str(position_id))
+    except ValueError:
+        return None  # Not a UUID - cannot match (and would abort the transaction)
+
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT * FROM positions WHERE id = %s", (position_id,))
+            row = cur.fetchone()
+            return dict(row) if row else None
+
+
+@timed("db.lock_trade_context")
+def lock_trade_context(position_ids: List[str]) -> Optional[Dict]:
+    """
+    Load and lock everything a trade reads, in one round trip
+    
+    Locks the portfolio row and the given position rows (FOR UPDATE) until
+    the transaction ends. Call inside a unit of work.
+    
+    Returns:
+        {"portfolio": row, "positions": {position_id: row}} or None if there
+        is no portfolio. Rows come back via JSON, so numerics are floats and
+        dates are ISO strings. Ids that are not UUIDs or belong to another
+        portfolio are simply absent.
+    """
+    valid_ids = []
+    for position_id in position_ids:
+        try:
+            valid_ids.append(str(uuid.UUID(str(position_id))))
+        except ValueError:
+            pass
+
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                WITH p AS (
+                    SELECT * FROM portfolios LIMIT 1 FOR UPDATE
+                ), pos AS (
+                    SELECT * FROM positions
+                    WHERE id = ANY(%s::uuid[]) AND portfolio_id = (SELECT id FROM p)
+                    FOR UPDATE
+                )
+                SELECT row_to_json(p) AS portfolio,
+                       (SELECT COALESCE(json_agg(pos), '[]'::json) FROM pos) AS positions
+                FROM p
+            """, (valid_ids,))
+            row = cur.fetchone()
+
+    if not row:
+        return None
+    return {
+        "portfolio": row['portfolio'],
+        "positions": {str(pos['id']): pos for pos in row['positions']},
+    }
+
+
+@timed("db.apply_trade_writes")
+def apply_trade_writes(
+    portfolio_id: str,
+    new_cash: float,
+    new_positions: List[Dict] = (),
+    trades: List[Dict] = (),
+    position_updates: List[Dict] = ()
+) -> Dict:
+    """
+    Write the result of a trade (or a batch of trades) in one round trip
+    
+    Sends every INSERT / UPDATE as a single multi-statement request on the
+    current connection; inside a unit of work they commit together.
+    
+    Args:
+        portfolio_id: Portfolio UUID
+        new_cash: Portfolio cash after all trades
+        new_positions: Position rows to insert; each must carry its own 'id'
+        trades: trade_history rows to insert
+        position_updates: {"id": position_id, **columns} partial updates
+    
+    Returns:
+        {"cash": cash as stored}
+    """
+    statements = []
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            for row in trades:
+                data = {"portfolio_id": portfolio_id, **row}
+                statements.append(cur.mogrify(
+                    f"INSERT INTO trade_history ({', '.join(data)}) VALUES ({', '.join(['%s'] * len(data))})",
+                    list(data.values())
+                ))
+            for row in position_updates:
+                updates = {k: v for k, v in row.items() if k != 'id'}
+                statements.append(cur.mogrify(
+                    f"UPDATE positions SET {', '.join(f'{k} = %s' for k in updates)}, updated_at = NOW() WHERE id = %s",
+                    list(updates.values()) + [row['id']]
+                ))
+            for row in new_positions:
+                data = {"portfolio_id": portfolio_id, **row}
+                statements.append(cur.mogrify(
+                    f"INSERT INTO positions ({', '.join(data)}) VALUES ({', '.join(['%s'] * len(data))})",
+                    list(data.values())
+                ))
+            statements.append(cur.mogrify(
+                "UPDATE portfolios SET cash = %s, last_updated = NOW() WHERE id = %s RETURNING cash",
+                (new_cash, portfolio_id)
+            ))
+
+            cur.execute(b";\n".join(statements).decode())
+            result = cur.fetchone()
 
+    _invalidate("positions")
+    uow = current_unit_of_work()
+    if uow is not None:
+        uow.patch(("portfolio",), {"cash": new_cash})
+    return {"cash": float(result['cash'])}
 
+
+def _invalidate(name: str):
+    """Drop cached rows of one kind after a write inside a unit of work"""
+    uow = current_unit_of_work()
+    if uow is not None:
+        uow.invalidate(name)
+
+
+@timed("db.create_position")
 def create_position(portfolio_id: str, position_data: Dict) -> Dict:
     """Create a new position"""
     with get_db() as conn:
@@ -103,11 +324,14 @@ def create_position(portfolio_id: str, position_data: Dict) -> Dict:
                 position_data.get('entry_note'),
                 position_data.get('tags')
             ))
-            return cur.fetchone()
+            result = cur.fetchone()
+    _invalidate("positions")
+    return result
 
 
+@timed("db.update_position")
 def update_position(position_id: str, updates: Dict):
-    """Update a position - FIXED VERSION with explicit commit and debugging"""
+    """Update a position (explicit commit)"""
     with get_db() as conn:
         with conn.cursor() as cur:
             # Build dynamic UPDATE query
@@ -129,38 +353,29 @@ def update_position(position_id: str, updates: Dict):
                 RETURNING *
             """
             
-            print(f"🔍 DEBUG: Executing update_position")
-            print(f"   Position ID: {position_id}")
-            print(f"   Updates: {updates}")
-            print(f"   Query: {query}")
-            print(f"   Values: {values}")
+            logger.debug("update_position %s", position_id, extra={"updates": updates})
             
             cur.execute(query, values)
             result = cur.fetchone()
             
-            if result:
-                print(f"✅ Position updated successfully")
-                print(f"   New status: {result.get('status')}")
-                print(f"   Exit date: {result.get('exit_date')}")
-            else:
-                print(f"❌ WARNING: update_position returned None!")
-                print(f"   This means no rows were updated")
-                print(f"   Position ID might not exist: {position_id}")
-            
-            # CRITICAL: Ensure the transaction commits
-            conn.commit()
-            print(f"✅ Transaction committed")
+            if result is None:
+                logger.warning("update_position matched no rows for position %s", position_id)
             
+            # Committed by get_db() (or by the enclosing unit of work)
+            _invalidate("positions")
             return result
 
 
+@timed("db.delete_position")
 def delete_position(position_id: str):
     """Delete a position"""
     with get_db() as conn:
         with conn.cursor() as cur:
             cur.execute("DELETE FROM positions WHERE id = %s", (position_id,))
+    _invalidate("positions")
 
 
+@timed("db.get_trade_history")
 def get_trade_history(portfolio_id: str) -> List[Dict]:
     """Get trade history"""
     with get_db() as conn:
@@ -172,6 +387,7 @@ def get_trade_history(portfolio_id: str) -> List[Dict]:
             return cur.fetchall()
 
 
+@timed("db.create_trade_history")
 def create_trade_history(portfolio_id: str, trade_data: Dict) -> Dict:
     """Add a trade to history"""
     with get_db() as conn:
@@ -216,8 +432,72 @@ def create_trade_history(portfolio_id: str, trade_data: Dict) -> Dict:
             return cur.fetchone()
 
 
+@timed("db.get_settings")
 def get_settings():
-    """Get all settings"""
+    """
+    Get all settings
+    
+    Served from an in-process cache. The cache is dropped by
+    create_settings / update_settings, by a settings_changed notification
+    from another process (start_settings_listener), and after
+    SETTINGS_CACHE_TTL_SECONDS in case a notification was missed.
+    Inside a unit of work a cold cache is filled per unit only, so
+    uncommitted reads never reach other requests.
+    """
+    with _settings_lock:
+        rows = _settings_cache["rows"]
+        fresh = rows is not None and time.monotonic() - _settings_cache["loaded_at"] < SETTINGS_CACHE_TTL_SECONDS
+    if fresh:
+        return copy.deepcopy(rows)
+
+    uow = current_unit_of_work()
+    if uow is not None:
+        return uow.cached(("settings",), _select_settings)
+
+    generation = _settings_cache["generation"]
+    rows = _select_settings()
+    with _settings_lock:
+        # Skip the store if the cache was invalidated while we were reading
+        if _settings_cache["generation"] == generation:
+            _settings_cache["rows"] = rows
+            _settings_cache["loaded_at"] = time.monotonic()
+    return copy.deepcopy(rows)
+
+
+SETTINGS_CHANNEL = "settings_changed"
+
+_settings_cache = {"rows": None, "loaded_at": 0.0, "generation": 0}
+_settings_lock = threading.Lock()
+
+
+def invalidate_settings_cache():
+    """Drop cached settings; the next get_settings() reads the database"""
+    with _settings_lock:
+        _settings_cache["rows"] = None
+        _settings_cache["generation"] += 1
+
+
+def _settings_changed(cur):
+    """Notify other processes (delivered on commit); drop the unit's cached settings"""
+    cur.execute(f"SELECT pg_notify('{SETTINGS_CHANNEL}', '')")
+    _invalidate("settings")
+
+
+def _settings_committed():
+    """
+    Invalidate the process-wide cache once the settings write is committed
+
+    Invalidating before the commit would let a concurrent get_settings()
+    read the old row under the new generation and cache it until the TTL.
+    """
+    uow = current_unit_of_work()
+    if uow is not None:
+        uow.after_commit(invalidate_settings_cache)
+    else:
+        invalidate_settings_cache()
+
+
+def _select_settings():
     with get_db() as conn:
         with conn.cursor() as cur:
             cur.execute("SELECT * FROM settings ORDER BY created_at DESC LIMIT 1")
@@ -227,6 +507,7 @@ def get_settings():
             return []
 
 
+@timed("db.create_settings")
 def create_settings(data):
     """Create new settings record"""
     with get_db() as conn:
@@ -237,9 +518,12 @@ def create_settings(data):
             
             cur.execute(query, list(data.values()))
             result = cur.fetchone()
-            return dict(result)
+            _settings_changed(cur)
+    _settings_committed()
+    return dict(result)
 
 
+@timed("db.update_settings")
 def update_settings(settings_id: str, data: dict) -> dict:
     """Update existing settings"""
     with get_db() as conn:
@@ -266,13 +550,62 @@ def update_settings(settings_id: str, data: dict) -> dict:
             
             if not result:
                 raise ValueError(f"Settings with id {settings_id} not found")
-            
-            return dict(result)
 
+            _settings_changed(cur)
+    _settings_committed()
+    return dict(result)
+
+def start_settings_listener() -> threading.Event:
+    """
+    LISTEN for settings_changed on a dedicated connection (background thread)
+    
+    Keeps the settings cache of this process in step with writes from
+    other processes. Reconnects after errors; the cache TTL bounds
+    staleness while disconnected.
+    
+    Returns:
+        Event that stops the listener when set
+    """
+    stop = threading.Event()
+    threading.Thread(target=_listen_for_settings_changes, args=(stop,),
+                     name="settings-listener", daemon=True).start()
+    return stop
+
+
+def _listen_for_settings_changes(stop: threading.Event):
+    while not stop.is_set():
+        conn = None
+        try:
+            conn = psycopg2.connect(_database_url())
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {SETTINGS_CHANNEL}")
+            # Anything missed while disconnected
+            invalidate_settings_cache()
+            logger.debug("Listening for settings changes")
+
+            while not stop.is_set():
+                if select.select([conn], [], [], 5.0) == ([], [], []):
+                    continue
+                conn.poll()
+                if conn.notifies:
+                    conn.notifies.clear()
+                    invalidate_settings_cache()
+                    logger.info("✓ Settings changed - cache cleared")
+        except Exception as e:
+            logger.warning(f"⚠️  Settings listener error: {e} - retrying in 30s")
+            stop.wait(30)
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+@timed("market_data.download_ticker_data")
 def download_ticker_data(ticker: str, start_date: str, end_date: str = None):
     """Download historical data for a single ticker using Yahoo API"""
     try:
-        time.sleep(0.1)  # Rate limiting
+        provider = get_provider()
+        provider.throttle(0.1)  # Rate limiting
         
         if end_date is None:
             end_date = datetime.now().strftime('%Y-%m-%d')
@@ -281,72 +614,25 @@ def download_ticker_data(ticker: str, start_date: str, end_date: str = None):
         start_ts = int(datetime.strptime(start_date, '%Y-%m-%d').timestamp())
         end_ts = int(datetime.strptime(end_date, '%Y-%m-%d').timestamp())
         
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-        params = {
-            "interval": "1d",
-            "period1": start_ts,
-            "period2": end_ts
-        }
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json',
-        }
+        try:
+            chart = parse_chart(provider.fetch_chart(ticker, {
+                "interval": "1d",
+                "period1": start_ts,
+                "period2": end_ts
+            }), ticker)
+        except MarketDataError:
+            return None
         
-        response = requests.get(url, params=params, headers=headers, timeout=15)
+        # Adjusted close when available; bars with a missing value are dropped
+        df = chart.to_frame(adjusted=True)
         
-        if response.status_code != 200:
+        if len(df) < 50:  # Minimum data requirement
             return None
         
-        data = response.json()
-        
-        if "chart" in data and "result" in data["chart"] and len(data["chart"]["result"]) > 0:
-            result = data["chart"]["result"][0]
-            
-            # Get timestamps
-            if "timestamp" not in result:
-                return None
-                
-            timestamps = result["timestamp"]
-            dates = [datetime.fromtimestamp(ts) for ts in timestamps]
-            
-            # Get price data
-            if "indicators" not in result or "quote" not in result["indicators"]:
-                return None
-                
-            quote = result["indicators"]["quote"][0]
-            
-            # Use adjusted close if available, otherwise close
-            if "adjclose" in result["indicators"] and result["indicators"]["adjclose"]:
-                closes = result["indicators"]["adjclose"][0]["adjclose"]
-            else:
-                closes = quote.get("close", [])
-            
-            highs = quote.get("high", [])
-            lows = quote.get("low", [])
-            
-            # Create DataFrame
-            df = pd.DataFrame({
-                'date': dates,
-                'close': closes,
-                'high': highs,
-                'low': lows
-            })
-            
-            # Remove None values
-            df = df.dropna()
-            
-            if len(df) < 50:  # Minimum data requirement
-                return None
-            
-            df['date'] = pd.to_datetime(df['date'])
-            df = df.set_index('date')
-            
-            return df
-            
-        return None
+        return df
         
     except Exception as e:
-        print(f"  ⚠️  Error fetching {ticker}: {str(e)[:50]}")
+        logger.warning("Error fetching %s: %s", ticker, str(e)[:50])
         return None
 
 
@@ -361,6 +647,7 @@ def compute_atr_simple(prices: pd.Series, period: int = 14):
 # CASH TRANSACTION FUNCTIONS
 # ============================================================================
 
+@timed("db.create_cash_transaction")
 def create_cash_transaction(portfolio_id: str, transaction_data: Dict) -> Dict:
     """Create a cash transaction (deposit or withdrawal)"""
     with get_db() as conn:
@@ -380,6 +667,7 @@ def create_cash_transaction(portfolio_id: str, transaction_data: Dict) -> Dict:
             return cur.fetchone()
 
 
+@timed("db.get_cash_transactions")
 def get_cash_transactions(portfolio_id: str, order_by: str = 'DESC') -> List[Dict]:
     """Get all cash transactions for a portfolio"""
     with get_db() as conn:
@@ -393,6 +681,7 @@ def get_cash_transactions(portfolio_id: str, order_by: str = 'DESC') -> List[Dic
             return cur.fetchall()
 
 
+@timed("db.get_total_deposits_withdrawals")
 def get_total_deposits_withdrawals(portfolio_id: str) -> Dict:
     """Get total deposits and withdrawals for a portfolio"""
     with get_db() as conn:
@@ -416,6 +705,7 @@ def get_total_deposits_withdrawals(portfolio_id: str) -> Dict:
 # PORTFOLIO HISTORY FUNCTIONS
 # ============================================================================
 
+@timed("db.create_portfolio_snapshot")
 def create_portfolio_snapshot(snapshot_data: Dict) -> Dict:
     """Create a portfolio snapshot (or update if exists for that date)"""
     with get_db() as conn:
@@ -446,6 +736,7 @@ def create_portfolio_snapshot(snapshot_data: Dict) -> Dict:
             return cur.fetchone()
 
 
+@timed("db.get_portfolio_snapshots")
 def get_portfolio_snapshots(portfolio_id: str, days: int = 30) -> List[Dict]:
     """Get portfolio history for last N days"""
     with get_db() as conn:
@@ -467,6 +758,7 @@ def get_portfolio_snapshots(portfolio_id: str, days: int = 30) -> List[Dict]:
             return cur.fetchall()
 
 
+@timed("db.get_latest_snapshot")
 def get_latest_snapshot(portfolio_id: str) -> Optional[Dict]:
     """Get the most recent snapshot"""
     with get_db() as conn:
@@ -483,6 +775,7 @@ def get_latest_snapshot(portfolio_id: str) -> Optional[Dict]:
 # SIGNALS FUNCTIONS
 # ============================================================================
 
+@timed("db.create_signal")
 def create_signal(portfolio_id: str, signal_data: Dict) -> Dict:
     """Create or update a signal"""
     with get_db() as conn:
@@ -530,6 +823,7 @@ def create_signal(portfolio_id: str, signal_data: Dict) -> Dict:
             return cur.fetchone()
 
 
+@timed("db.get_signals")
 def get_signals(portfolio_id: str, status: str = None) -> List[Dict]:
     """Get signals, optionally filtered by status"""
     with get_db() as conn:
@@ -547,6 +841,7 @@ def get_signals(portfolio_id: str, status: str = None) -> List[Dict]:
             return cur.fetchall()
 
 
+@timed("db.update_signal")
 def update_signal(signal_id: str, updates: Dict) -> Dict:
     """Update a signal"""
     with get_db() as conn:
@@ -568,16 +863,17 @@ def update_signal(signal_id: str, updates: Dict) -> Dict:
             """
             
             cur.execute(query, values)
-            conn.commit()
             return cur.fetchone()
 
 
+@timed("db.delete_signal")
 def delete_signal(signal_id: str):
     """Delete a signal"""
     with get_db() as conn:
         with conn.cursor() as cur:
             cur.execute("DELETE FROM signals WHERE id = %s", (signal_id,))
 
+@timed("db.get_all_tickers")
 def get_all_tickers() -> List[str]:
     """Get list of all tickers in universe"""
     with get_db() as conn:
@@ -587,6 +883,7 @@ def get_all_tickers() -> List[str]:
             return [row['ticker'] for row in results]
 
 
+@timed("db.update_position_note")
 def update_position_note(position_id: str, entry_note: str) -> Dict:
     """Update entry note for a position"""
     with get_db() as conn:
@@ -603,6 +900,7 @@ def update_position_note(position_id: str, entry_note: str) -> Dict:
             if not result:
                 raise ValueError(f"Position {position_id} not found")
             
+            _invalidate("positions")
             return {
                 "id": str(result['id']),
                 "ticker": result['ticker'],
@@ -611,6 +909,7 @@ def update_position_note(position_id: str, entry_note: str) -> Dict:
             }
 
 
+@timed("db.update_position_tags")
 def update_position_tags(position_id: str, tags: List[str]) -> Dict:
     """Update tags for a position"""
     with get_db() as conn:
@@ -627,6 +926,7 @@ def update_position_tags(position_id: str, tags: List[str]) -> Dict:
             if not result:
                 raise ValueError(f"Position {position_id} not found")
             
+            _invalidate("positions")
             return {
                 "id": str(result['id']),
                 "ticker": result['ticker'],
@@ -635,6 +935,7 @@ def update_position_tags(position_id: str, tags: List[str]) -> Dict:
             }
 
 
+@timed("db.get_all_tags")
 def get_all_tags(portfolio_id: str) -> List[str]:
     """Get all unique tags used across positions and trade history"""
     with get_db() as conn:
@@ -654,6 +955,7 @@ def get_all_tags(portfolio_id: str) -> List[str]:
             return tags
 
 
+@timed("db.search_positions_by_tags")
 def search_positions_by_tags(portfolio_id: str, tags: List[str]) -> List[Dict]:
     """Search positions by tags (OR logic - any tag match)"""
     with get_db() as conn:
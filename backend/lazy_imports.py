@@ -0,0 +1,178 @@
+"""
+Lazy Imports
+
+Deferred loading of heavy third-party modules (pandas, numpy, requests,
+httpx) so the API process starts without them. Endpoints that never touch
+a DataFrame or an array (/health, /settings, ...) never pay for the import;
+the first call that does loads the module once, and every later attribute
+access goes straight to the real module.
+
+    pd = lazy_module("pandas")      # nothing imported yet
+    pd.DataFrame(...)               # pandas imported here, timing recorded
+
+Modules that use a lazy module in annotations need
+`from __future__ import annotations` so the annotation is not evaluated at
+definition time.
+
+This module depends on the standard library only, so any backend module
+(including market_data and utils) can import it without import cycles.
+
+Functions:
+    - lazy_module(): Proxy that imports the named module on first attribute access
+    - warm_up(): Import modules now, optionally in a background thread
+    - mark_app_imported(): Record how long the app took to import
+    - import_report(): App import time plus each deferred load (module, seconds, trigger)
+
+Usage:
+    from lazy_imports import lazy_module
+
+    np = lazy_module("numpy")
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+import types
+from typing import Dict, Iterable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = ("numpy", "pandas", "requests", "httpx")
+
+_lock = threading.Lock()
+_loads: List[Dict] = []
+_app_import_seconds: Optional[float] = None
+
+
+def _load(name: str, trigger: str):
+    """Import name and record how long it took (unless something else already had)."""
+    already_imported = name in sys.modules
+    start = time.perf_counter()
+    # import_module also waits for an import running on another thread
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start
+    if already_imported:
+        return module
+
+    with _lock:
+        if not any(load["module"] == name for load in _loads):
+            _loads.append({
+                "module": name,
+                "seconds": round(elapsed, 4),
+                "trigger": trigger,
+                "thread": threading.current_thread().name,
+            })
+            logger.info(f"📦 Loaded {name} in {elapsed * 1000:.0f}ms (first use: {trigger})")
+    return module
+
+
+class _LazyModule(types.ModuleType):
+    """Module stand-in; the first attribute access imports the real module."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _target(self, trigger: str):
+        target = self.__dict__["_lazy_target"]
+        if target is None:
+            target = _load(self.__name__, trigger)
+            self.__dict__["_lazy_target"] = target
+        return target
+
+    def __getattr__(self, attr: str):
+        return getattr(self._target(attr), attr)
+
+    def __dir__(self):
+        return dir(self._target("dir()"))
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_target"] is not None else "not loaded"
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+
+def lazy_module(name: str) -> types.ModuleType:
+    """
+    Module proxy that imports name on first attribute access
+
+    Args:
+        name: Absolute module name, e.g. "pandas"
+
+    Returns:
+        Proxy module; after the first access it forwards to the real one
+
+    Note:
+        `isinstance(x, pd.DataFrame)`, `except requests.RequestException`
+        and similar all work - they are attribute accesses. Anything that
+        evaluates an attribute at import time (annotations without
+        `from __future__ import annotations`, default arguments, module
+        constants) loads the module immediately.
+    """
+    return _LazyModule(name)
+
+
+def warm_up(names: Iterable[str] = HEAVY_MODULES, background: bool = True) -> Optional[threading.Thread]:
+    """
+    Import modules ahead of first use
+
+    Args:
+        names: Module names to import
+        background: Import in a daemon thread (default) instead of blocking
+
+    Returns:
+        The warm-up thread, or None when run inline
+    """
+    names = list(names)
+
+    def _run():
+        for name in names:
+            try:
+                _load(name, trigger="warm-up")
+            except ImportError as e:
+                logger.warning(f"⚠️ Warm-up could not import {name}: {e}")
+
+    if not background:
+        _run()
+        return None
+
+    thread = threading.Thread(target=_run, name="import-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def mark_app_imported(started: float) -> float:
+    """
+    Record the app's import time
+
+    Args:
+        started: time.perf_counter() taken before the app's first import
+
+    Returns:
+        Seconds elapsed since started
+    """
+    global _app_import_seconds
+    _app_import_seconds = time.perf_counter() - started
+    return _app_import_seconds
+
+
+def import_report() -> Dict:
+    """
+    App import time and the heavy modules loaded since
+
+    Returns:
+        {"app_import_seconds", "loaded", "not_loaded", "deferred_loads"};
+        deferred_loads lists each lazy load in the order it happened, with
+        the attribute (or "warm-up") that triggered it
+    """
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    with _lock:
+        loads = [dict(load) for load in _loads]
+    return {
+        "app_import_seconds": round(_app_import_seconds, 4) if _app_import_seconds is not None else None,
+        "loaded": loaded,
+        "not_loaded": [name for name in HEAVY_MODULES if name not in loaded],
+        "deferred_loads": loads,
+    }
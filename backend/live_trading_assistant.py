@@ -3,7 +3,8 @@
 LIVE TRADING ASSISTANT - PRODUCTION VERSION (Updated)
 =====================================================================
 Generates monthly entry signals with proper error handling and validation.
-Uses Yahoo Finance API directly for better reliability.
+Uses the Yahoo Finance chart API via the market_data provider
+(live, local stand-in or replay — see market_data/).
 
 Dependencies: pandas, numpy, requests
 =====================================================================
@@ -14,11 +15,11 @@ import numpy as np
 from datetime import datetime, timedelta
 import json
 import os
-import time
-import requests
 from typing import Tuple, Dict, Optional
 import warnings
 
+from market_data import get_chart, get_provider, parse_chart, MarketDataError
+
 warnings.filterwarnings("ignore")
 pd.set_option("display.float_format", lambda x: f"{x:,.2f}")
 
@@ -66,47 +67,21 @@ class Config:
 
 
 # =====================================================================
-# YAHOO FINANCE API - Direct API calls
+# YAHOO FINANCE API - via the market_data provider
 # =====================================================================
 
 def get_live_fx_rate():
     """Fetch live GBP/USD exchange rate from Yahoo Finance"""
     try:
-        time.sleep(0.2)
-        
-        url = "https://query1.finance.yahoo.com/v8/finance/chart/GBPUSD=X"
-        params = {
+        chart = get_chart("GBPUSD=X", {
             "interval": "1d",
             "range": "1d"
-        }
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json',
-        }
-        
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        data = response.json()
+        }, throttle_seconds=0.2)
         
-        if "chart" in data and "result" in data["chart"] and len(data["chart"]["result"]) > 0:
-            result = data["chart"]["result"][0]
-            
-            # Try meta.regularMarketPrice first
-            if "meta" in result and "regularMarketPrice" in result["meta"]:
-                fx_rate = float(result["meta"]["regularMarketPrice"])
-                if fx_rate > 0:
-                    print(f"✓ Live FX rate (GBP/USD): {fx_rate:.4f}\n")
-                    return fx_rate
-            
-            # Try latest close price
-            if "indicators" in result and "quote" in result["indicators"]:
-                quotes = result["indicators"]["quote"]
-                if len(quotes) > 0 and "close" in quotes[0]:
-                    closes = [c for c in quotes[0]["close"] if c is not None]
-                    if closes:
-                        fx_rate = float(closes[-1])
-                        if fx_rate > 0:
-                            print(f"✓ Live FX rate (GBP/USD): {fx_rate:.4f}\n")
-                            return fx_rate
+        fx_rate = chart.last_price()
+        if fx_rate is not None:
+            print(f"✓ Live FX rate (GBP/USD): {fx_rate:.4f}\n")
+            return fx_rate
         
         print("⚠️  Could not fetch live FX rate, using default 1.28\n")
         return 1.28
@@ -119,7 +94,8 @@ def get_live_fx_rate():
 def download_ticker_data(ticker: str, start_date: str, end_date: str = None):
     """Download historical data for a single ticker using Yahoo API"""
     try:
-        time.sleep(0.1)  # Rate limiting
+        provider = get_provider()
+        provider.throttle(0.1)  # Rate limiting
         
         if end_date is None:
             end_date = datetime.now().strftime('%Y-%m-%d')
@@ -128,69 +104,22 @@ def download_ticker_data(ticker: str, start_date: str, end_date: str = None):
         start_ts = int(datetime.strptime(start_date, '%Y-%m-%d').timestamp())
         end_ts = int(datetime.strptime(end_date, '%Y-%m-%d').timestamp())
         
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-        params = {
-            "interval": "1d",
-            "period1": start_ts,
-            "period2": end_ts
-        }
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json',
-        }
+        try:
+            chart = parse_chart(provider.fetch_chart(ticker, {
+                "interval": "1d",
+                "period1": start_ts,
+                "period2": end_ts
+            }), ticker)
+        except MarketDataError:
+            return None
         
-        response = requests.get(url, params=params, headers=headers, timeout=15)
+        # Adjusted close when available; bars with a missing value are dropped
+        df = chart.to_frame(adjusted=True)
         
-        if response.status_code != 200:
+        if len(df) < 50:  # Minimum data requirement
             return None
         
-        data = response.json()
-        
-        if "chart" in data and "result" in data["chart"] and len(data["chart"]["result"]) > 0:
-            result = data["chart"]["result"][0]
-            
-            # Get timestamps
-            if "timestamp" not in result:
-                return None
-                
-            timestamps = result["timestamp"]
-            dates = [datetime.fromtimestamp(ts) for ts in timestamps]
-            
-            # Get price data
-            if "indicators" not in result or "quote" not in result["indicators"]:
-                return None
-                
-            quote = result["indicators"]["quote"][0]
-            
-            # Use adjusted close if available, otherwise close
-            if "adjclose" in result["indicators"] and result["indicators"]["adjclose"]:
-                closes = result["indicators"]["adjclose"][0]["adjclose"]
-            else:
-                closes = quote.get("close", [])
-            
-            highs = quote.get("high", [])
-            lows = quote.get("low", [])
-            
-            # Create DataFrame
-            df = pd.DataFrame({
-                'date': dates,
-                'close': closes,
-                'high': highs,
-                'low': lows
-            })
-            
-            # Remove None values
-            df = df.dropna()
-            
-            if len(df) < 50:  # Minimum data requirement
-                return None
-            
-            df['date'] = pd.to_datetime(df['date'])
-            df = df.set_index('date')
-            
-            return df
-            
-        return None
+        return df
         
     except Exception as e:
         print(f"  ⚠️  Error fetching {ticker}: {str(e)[:50]}")
@@ -1,17 +1,25 @@
+import time
+_import_started = time.perf_counter()  # App import time, see lazy_imports.import_report()
+
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Optional, List
 from datetime import datetime
 from decimal import Decimal
 from datetime import timedelta
-import time
-import requests
 from config import API_TITLE
+from config import DB_QUERY_BUDGET_MODE, SETTINGS_LISTEN, HEALTH_MONITOR, IMPORT_WARM_UP, PROFILE_TOKEN
+from lazy_imports import warm_up, mark_app_imported, import_report
 from config import ALLOWED_ORIGINS
 from utils.calculations import calculate_initial_stop
 from utils.formatting import decimal_to_float
+from utils.timing import record_span, get_span_stats, render_prometheus
+from utils.logging_setup import configure_logging, get_logger
+from utils.query_budget import track_queries, budget_for_route, QueryBudgetExceeded
 from pydantic import BaseModel
-from routers import validation, analytics, test, portfolio_size
+from routers import validation, analytics, test, portfolio_size, signal_runs, profiles
+from market_data import add_fetch_observer
 
 
 from database import (
@@ -27,7 +35,8 @@ from database import (
     update_position_note,
     update_position_tags,
     get_all_tags,
-    search_positions_by_tags
+    search_positions_by_tags,
+    start_settings_listener
 )
 
 from utils.pricing import (
@@ -41,7 +50,8 @@ from models import (
     AddPositionRequest,
     SettingsRequest,
     CashTransactionRequest,
-    ExitPositionRequest
+    ExitPositionRequest,
+    BatchTradeRequest
 )
 
 from config import (
@@ -87,15 +97,27 @@ from services import (
     get_transaction_history,
     get_cash_summary,
     # Signal service
-    generate_momentum_signals,
+    SignalGenerationCancelled,
     get_signals,
     update_signal_status,
     delete_signal,
+    # Signal run service
+    SignalRunInProgress,
+    run_signal_generation,
+    # Execution service
+    execute_batch,
     # Health service
     get_basic_health,
+    get_liveness,
+    get_readiness,
     get_detailed_health,
+    start_health_monitor,
     test_all_endpoints
 )
+
+configure_logging()
+logger = get_logger(__name__)
+
 app = FastAPI(title=API_TITLE)
 
 app.add_middleware(
@@ -106,10 +128,129 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+
+class RequestTimingMiddleware:
+    """
+    Record every request as an http.<METHOD> <route template> span
+
+    Plain ASGI middleware: wraps send to see the status code, so timing a
+    request costs a function call rather than call_next's task group and
+    memory streams.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = 500  # Unless a response starts, the request failed
+
+        async def send_with_status(message):
+            nonlocal status
+            await send(message)
+            if message["type"] == "http.response.start":
+                status = message["status"]  # Once sent - an outer layer can still fail it
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router fills in scope["route"] while dispatching
+            path = getattr(scope.get("route"), "path", None) or "unmatched"
+            record_span(f"http.{scope['method']} {path}", time.perf_counter() - start, status >= 500)
+
+
+app.add_middleware(RequestTimingMiddleware)
+
+
+class QueryAccountingMiddleware:
+    """
+    Count DB statements / connections per request (utils/query_budget.py)
+
+    Adds X-DB-Queries and X-DB-Connections headers to the response start
+    message. A route over its budget, or repeating one statement (N+1), is
+    logged once the response completes; with DB_QUERY_BUDGET_MODE=raise an
+    over-budget request fails instead of starting its response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with track_queries() as account:
+            async def send_with_counts(message):
+                if message["type"] == "http.response.start":
+                    route = scope.get("route")
+                    account.label = f"{scope['method']} {getattr(route, 'path', None) or 'unmatched'}"
+                    account.budget = budget_for_route(account.label)
+                    if account.over_budget and DB_QUERY_BUDGET_MODE == "raise":
+                        raise QueryBudgetExceeded(account.describe())
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-db-queries", str(account.statements).encode()),
+                        (b"x-db-connections", str(account.connections).encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_counts)
+
+        if account.over_budget:
+            logger.warning(f"⚠️  Query budget exceeded - {account.describe()}")
+        elif account.repeated():
+            logger.warning(f"⚠️  Repeated queries - {account.describe()}")
+
+
+if DB_QUERY_BUDGET_MODE != "off":
+    app.add_middleware(QueryAccountingMiddleware)
+
+
+# Outermost middleware: profiles the whole request, including the timing span
+if PROFILE_TOKEN:
+    app.add_middleware(profiles.ProfileMiddleware)
+
+# Count every market data request (retries included) as a span, so /metrics
+# and request profiles see outbound HTTP calls
+add_fetch_observer(
+    lambda symbol, seconds, failed: record_span("market_data.fetch_chart", seconds, failed)
+)
+
+
+@app.on_event("startup")
+def start_background_listeners():
+    report = import_report()
+    logger.info(
+        f"✓ App imported in {report['app_import_seconds'] * 1000:.0f}ms "
+        f"(not yet loaded: {', '.join(report['not_loaded']) or 'none'}; warm-up: {IMPORT_WARM_UP})"
+    )
+    if IMPORT_WARM_UP == "eager":
+        warm_up(background=False)
+    elif IMPORT_WARM_UP == "background":
+        warm_up()
+    if SETTINGS_LISTEN:
+        app.state.settings_listener = start_settings_listener()
+    if HEALTH_MONITOR:
+        app.state.health_monitor = start_health_monitor()
+
+
+@app.on_event("shutdown")
+def stop_background_listeners():
+    for name in ("settings_listener", "health_monitor"):
+        stop = getattr(app.state, name, None)
+        if stop is not None:
+            stop.set()
+
+
 app.include_router(validation.router)
 app.include_router(analytics.router)
 app.include_router(test.router)
 app.include_router(portfolio_size.router)
+app.include_router(signal_runs.router)
+app.include_router(profiles.router)
 
 
 @app.get("/")
@@ -209,6 +350,25 @@ def exit_position_endpoint(position_id: str, request: ExitPositionRequest):
     )
     return {"status": "ok", "data": result}
 
+@app.post("/positions/batch")
+def batch_trades_endpoint(request: BatchTradeRequest):
+    """
+    Apply a batch of exits and entries atomically (rebalance days)
+    
+    Exits run first so their proceeds fund the entries; if any item fails
+    validation nothing is written.
+    """
+    try:
+        result = execute_batch(
+            exits=[item.dict() for item in request.exits],
+            entries=[item.dict(exclude={'current_price', 'fees', 'status'}) for item in request.entries],
+            fx_rate=request.fx_rate
+        )
+        return {"status": "ok", "data": result}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.post("/portfolio/position")
 def add_position_endpoint(request: AddPositionRequest):
     """Add a new position to the portfolio"""
@@ -250,7 +410,7 @@ def analyze_positions_endpoint():
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        print(f"\n❌ ANALYSIS FAILED: {str(e)}")
+        logger.error(f"❌ ANALYSIS FAILED: {str(e)}")
         import traceback
         traceback.print_exc()
         return {"status": "error", "message": str(e)}
@@ -366,9 +526,15 @@ def generate_signals_endpoint(
     lookback_days: int = 252,
     top_n: int = 5
 ):
-    """Generate momentum signals"""
+    """
+    Generate momentum signals
+
+    Runs through signal_run_service like the streamed variant, so only one
+    generation downloads the universe at a time. Returns HTTP 409 if a run
+    is already in progress or this one gets cancelled by run id.
+    """
     try:
-        result = generate_momentum_signals(
+        result = run_signal_generation(
             lookback_days=lookback_days,
             top_n=top_n,
             ma_period=200,
@@ -383,6 +549,8 @@ def generate_signals_endpoint(
             "data": result
         }
         
+    except (SignalRunInProgress, SignalGenerationCancelled) as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -399,7 +567,7 @@ def get_market_status():
     This endpoint provides real-time market status for the Signals page
     """
     try:
-        print("\n📊 Fetching market status...")
+        logger.info("📊 Fetching market status...")
         
         # Reuse existing check_market_regime() function
         market_regime = check_market_regime()
@@ -407,10 +575,11 @@ def get_market_status():
         # Get live FX rate
         fx_rate = get_live_fx_rate()
         
-        print(f"✓ Market status retrieved:")
-        print(f"   SPY: {'🟢 Risk On' if market_regime['spy_risk_on'] else '🔴 Risk Off'}")
-        print(f"   FTSE: {'🟢 Risk On' if market_regime['ftse_risk_on'] else '🔴 Risk Off'}")
-        print(f"   FX Rate: {fx_rate:.4f}\n")
+        logger.info("✓ Market status retrieved", extra={
+            "spy_risk_on": market_regime['spy_risk_on'],
+            "ftse_risk_on": market_regime['ftse_risk_on'],
+            "fx_rate": fx_rate
+        })
         
         return {
             "status": "ok",
@@ -476,7 +645,7 @@ def delete_signal_endpoint(signal_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """
     Basic health check - fast response for load balancers
     """
@@ -489,16 +658,58 @@ def health_check():
         return {"status": "error", "message": str(e)}
 
 
+@app.get("/health/live")
+async def liveness_probe():
+    """
+    Liveness probe - no I/O, answers while the process can serve requests
+
+    async: served on the event loop, no threadpool hop.
+    """
+    return get_liveness()
+
+
+@app.get("/health/ready")
+async def readiness_probe():
+    """
+    Readiness probe - cached component checks, refreshed in the background
+    
+    Returns 503 when a critical component (database, config) is unhealthy
+    or the cached checks are stale. Never runs a check itself, so it is
+    async like the liveness probe.
+    """
+    result = get_readiness()
+    return JSONResponse(result, status_code=200 if result["ready"] else 503)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Span latencies (p50/p95/p99, sum, count) in Prometheus text format
+    
+    Covers HTTP requests, DB calls, Yahoo fetches and service stages
+    recorded since process start (see utils/timing.py).
+    """
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/metrics/spans")
+def metrics_spans():
+    """Same span stats as /metrics, as JSON (milliseconds)"""
+    return {"status": "ok", "data": get_span_stats()}
+
+
 @app.get("/health/detailed")
 def detailed_health_check():
     """
-    Comprehensive system status check
+    Comprehensive system status check, run on demand
     
     Checks:
     - Database connectivity
     - External services (Yahoo Finance)
     - Service layer health
     - Configuration validity
+    
+    Does live I/O on every call - probes should use /health/live and /health/ready.
     """
     try:
         result = get_detailed_health()
@@ -622,6 +833,9 @@ def search_positions_by_tags_endpoint(tags: str):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+
+mark_app_imported(_import_started)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
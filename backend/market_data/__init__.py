@@ -0,0 +1,134 @@
+"""
+Market Data Package
+
+Pluggable source for Yahoo chart data, selected by environment
+(see MARKET_DATA_* in config.py):
+
+    MARKET_DATA_PROVIDER=live     Yahoo Finance (default)
+    MARKET_DATA_PROVIDER=http     Local stand-in or any chart-API server at MARKET_DATA_BASE_URL
+    MARKET_DATA_PROVIDER=replay   Recorded JSON in MARKET_DATA_REPLAY_DIR, no network
+
+    MARKET_DATA_RECORD_DIR        Save every response for later replay
+    MARKET_DATA_LATENCY_MS / _JITTER_MS / _ERROR_RATE / _SEED
+                                  Seeded latency and failure injection
+
+Modules:
+    - providers: Provider classes and MarketDataError
+    - chart: Chart JSON parser (NumPy arrays; price, MA, ATR, history)
+    - recordings: Recording file format, range slicing, synthetic charts
+    - server: Local HTTP stand-in for the Yahoo chart API
+
+Usage:
+    from market_data import get_provider
+
+    from market_data import get_chart
+
+    chart = get_chart("NVDA", {"interval": "1d", "range": "1y"}, throttle_seconds=PRICE_FETCH_DELAY_SECONDS)
+    price, ma200, atr = chart.last_price(), chart.moving_average(200), chart.atr(14)
+"""
+
+import threading
+from typing import Dict, Optional
+
+from config import (
+    MARKET_DATA_PROVIDER,
+    MARKET_DATA_BASE_URL,
+    MARKET_DATA_REPLAY_DIR,
+    MARKET_DATA_SYNTHESIZE,
+    MARKET_DATA_RECORD_DIR,
+    MARKET_DATA_TIMEOUT_SECONDS,
+    MARKET_DATA_LATENCY_MS,
+    MARKET_DATA_JITTER_MS,
+    MARKET_DATA_ERROR_RATE,
+    MARKET_DATA_SEED,
+)
+
+from .providers import (
+    MarketDataError,
+    MarketDataProvider,
+    HttpChartProvider,
+    ReplayProvider,
+    RecordingProvider,
+    FaultInjectingProvider,
+    add_fetch_observer,
+)
+from .chart import Chart, parse_chart
+
+_provider: Optional[MarketDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def build_provider(kind: str = MARKET_DATA_PROVIDER) -> MarketDataProvider:
+    """
+    Build the provider stack described by the MARKET_DATA_* settings
+
+    Raises:
+        ValueError: If kind is not live, http or replay
+    """
+    if kind == "live":
+        provider = HttpChartProvider(MARKET_DATA_BASE_URL, rate_limited=True, timeout=MARKET_DATA_TIMEOUT_SECONDS)
+    elif kind == "http":
+        provider = HttpChartProvider(MARKET_DATA_BASE_URL, rate_limited=False, timeout=MARKET_DATA_TIMEOUT_SECONDS)
+    elif kind == "replay":
+        provider = ReplayProvider(MARKET_DATA_REPLAY_DIR, synthesize=MARKET_DATA_SYNTHESIZE, seed=MARKET_DATA_SEED)
+    else:
+        raise ValueError(f"Unknown MARKET_DATA_PROVIDER '{kind}' (expected live, http or replay)")
+
+    if MARKET_DATA_RECORD_DIR:
+        provider = RecordingProvider(provider, MARKET_DATA_RECORD_DIR)
+
+    if MARKET_DATA_LATENCY_MS or MARKET_DATA_JITTER_MS or MARKET_DATA_ERROR_RATE:
+        provider = FaultInjectingProvider(
+            provider,
+            latency_ms=MARKET_DATA_LATENCY_MS,
+            jitter_ms=MARKET_DATA_JITTER_MS,
+            error_rate=MARKET_DATA_ERROR_RATE,
+            seed=MARKET_DATA_SEED,
+        )
+    return provider
+
+
+def get_provider() -> MarketDataProvider:
+    """Process-wide provider, built on first use."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = build_provider()
+    return _provider
+
+
+def set_provider(provider: Optional[MarketDataProvider]) -> None:
+    """Replace the process-wide provider (None = rebuild from settings on next use)."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
+
+
+def get_chart(symbol: str, params: Dict, throttle_seconds: float = 0) -> Chart:
+    """
+    Fetch and parse one chart request through the process-wide provider
+
+    Raises:
+        MarketDataError: If the request fails or the response has no chart result
+    """
+    provider = get_provider()
+    provider.throttle(throttle_seconds)
+    return parse_chart(provider.fetch_chart(symbol, params), symbol)
+
+
+__all__ = [
+    'Chart',
+    'parse_chart',
+    'get_chart',
+    'MarketDataError',
+    'MarketDataProvider',
+    'HttpChartProvider',
+    'ReplayProvider',
+    'RecordingProvider',
+    'FaultInjectingProvider',
+    'add_fetch_observer',
+    'build_provider',
+    'get_provider',
+    'set_provider',
+]
@@ -0,0 +1,172 @@
+"""
+Chart Parsing
+
+One parser for Yahoo v8 chart JSON. A response is walked once into NumPy
+arrays (missing values become NaN), and every caller reads what it needs
+from the same object:
+
+    chart = parse_chart(provider.fetch_chart("SPY", {"interval": "1d", "range": "1y"}), "SPY")
+    chart.last_price()          # quote
+    chart.moving_average(200)   # regime filter input
+    chart.atr(14)               # stop-loss input
+    chart.to_frame()            # history for signal generation
+
+so a single range=1y request can answer price, MA200 and ATR together.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Optional
+
+from lazy_imports import lazy_module
+
+from .providers import MarketDataError
+
+np = lazy_module("numpy")
+pd = lazy_module("pandas")
+
+
+def _as_float_array(values, length: int) -> np.ndarray:
+    """List with None gaps → float array with NaN gaps (all-NaN if missing or misaligned)."""
+    if not values or len(values) != length:
+        return np.full(length, np.nan)
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+class Chart:
+    """
+    Parsed chart response for one symbol
+
+    Attributes:
+        symbol: Ticker requested
+        meta: Yahoo 'meta' block (regularMarketPrice, currency, ...)
+        timestamps: Bar times as int64 epoch seconds
+        open, high, low, close, volume: Float arrays aligned with timestamps (NaN = missing)
+        adjclose: Adjusted closes (falls back to close when Yahoo omits them)
+    """
+
+    __slots__ = ("symbol", "meta", "timestamps", "open", "high", "low", "close", "adjclose", "volume")
+
+    def __init__(self, symbol: str, meta: Dict, timestamps: np.ndarray, open_: np.ndarray,
+                 high: np.ndarray, low: np.ndarray, close: np.ndarray, adjclose: np.ndarray,
+                 volume: np.ndarray):
+        self.symbol = symbol
+        self.meta = meta
+        self.timestamps = timestamps
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.adjclose = adjclose
+        self.volume = volume
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def last_price(self) -> Optional[float]:
+        """meta.regularMarketPrice if positive, else the latest close, else None."""
+        price = self.meta.get("regularMarketPrice")
+        if price is not None and float(price) > 0:
+            return float(price)
+        closes = self.closes()
+        if len(closes) and closes[-1] > 0:
+            return float(closes[-1])
+        return None
+
+    def closes(self, adjusted: bool = False) -> np.ndarray:
+        """Closes with missing bars dropped."""
+        values = self.adjclose if adjusted else self.close
+        return values[np.isfinite(values)]
+
+    def moving_average(self, window: int) -> Optional[float]:
+        """Mean of the last `window` closes (all available closes if fewer), None if there are none."""
+        closes = self.closes()
+        if not len(closes):
+            return None
+        return float(closes[-window:].mean())
+
+    def atr(self, period: int = 14) -> Optional[float]:
+        """
+        Simple-average True Range over the last `period` bars
+
+        Bars missing any of high / low / close are skipped; needs
+        period + 1 complete bars (the first only supplies a previous close).
+        """
+        complete = np.isfinite(self.high) & np.isfinite(self.low) & np.isfinite(self.close)
+        high, low, close = self.high[complete], self.low[complete], self.close[complete]
+        if len(close) < period + 1:
+            return None
+
+        prev_close = close[:-1]
+        true_range = np.maximum.reduce([
+            high[1:] - low[1:],
+            np.abs(high[1:] - prev_close),
+            np.abs(low[1:] - prev_close),
+        ])
+        return float(true_range[-period:].mean())
+
+    def dates(self) -> pd.DatetimeIndex:
+        """Bar times as naive local datetimes (matches datetime.fromtimestamp)."""
+        return pd.DatetimeIndex([datetime.fromtimestamp(int(ts)) for ts in self.timestamps])
+
+    def to_frame(self, adjusted: bool = True) -> pd.DataFrame:
+        """
+        History as a date-indexed DataFrame
+
+        Args:
+            adjusted: Use adjusted closes for the 'close' column
+
+        Returns:
+            DataFrame with close, high and low columns; bars with any gap dropped
+        """
+        df = pd.DataFrame({
+            'close': self.adjclose if adjusted else self.close,
+            'high': self.high,
+            'low': self.low,
+        }, index=self.dates())
+        df.index.name = 'date'
+        return df.dropna()
+
+
+def parse_chart(payload: Dict, symbol: str = "") -> Chart:
+    """
+    Parse a chart JSON response
+
+    Args:
+        payload: Response from MarketDataProvider.fetch_chart()
+        symbol: Ticker, for error messages and Chart.symbol
+
+    Returns:
+        Chart (possibly with zero bars, e.g. a range=1d quote before the open)
+
+    Raises:
+        MarketDataError: If the payload has no chart result
+    """
+    try:
+        result = payload["chart"]["result"][0]
+    except (KeyError, IndexError, TypeError):
+        raise MarketDataError(f"No chart data for {symbol}")
+
+    timestamps = np.asarray(result.get("timestamp") or [], dtype=np.int64)
+    n = len(timestamps)
+    indicators = result.get("indicators") or {}
+    quote = (indicators.get("quote") or [{}])[0] or {}
+    adjclose_blocks = indicators.get("adjclose") or [{}]
+
+    close = _as_float_array(quote.get("close"), n)
+    adjclose = _as_float_array((adjclose_blocks[0] or {}).get("adjclose"), n)
+    if not np.isfinite(adjclose).any():
+        adjclose = close
+
+    return Chart(
+        symbol=symbol or (result.get("meta") or {}).get("symbol", ""),
+        meta=result.get("meta") or {},
+        timestamps=timestamps,
+        open_=_as_float_array(quote.get("open"), n),
+        high=_as_float_array(quote.get("high"), n),
+        low=_as_float_array(quote.get("low"), n),
+        close=close,
+        adjclose=adjclose,
+        volume=_as_float_array(quote.get("volume"), n),
+    )
@@ -0,0 +1,245 @@
+"""
+Market Data Providers
+
+Every Yahoo chart request in the backend goes through a provider, so the
+data source can be swapped without touching callers:
+
+    - HttpChartProvider: Yahoo Finance, or any server speaking its chart API
+    - ReplayProvider: Recorded chart JSON on disk (no network)
+    - RecordingProvider: Wraps another provider and saves what it returns
+    - FaultInjectingProvider: Wraps another provider with seeded latency / errors
+
+All providers return the raw chart JSON dict and raise MarketDataError on
+failure; callers keep their existing fallback behaviour.
+
+add_fetch_observer() registers a callback run after every request that
+reaches a data source (HTTP or replay), e.g. for timing and call counts.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from lazy_imports import lazy_module
+
+from .recordings import recording_path, slice_chart, synthetic_chart, bar_count
+
+requests = lazy_module("requests")
+
+
+CHART_PATH = "/v8/finance/chart/{symbol}"
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'application/json',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+
+_fetch_observers: List[Callable[[str, float, bool], None]] = []
+
+
+def add_fetch_observer(observer: Callable[[str, float, bool], None]) -> None:
+    """Call observer(symbol, seconds, failed) after each data-source request."""
+    if observer not in _fetch_observers:
+        _fetch_observers.append(observer)
+
+
+def _notify_fetch(symbol: str, start: float, failed: bool) -> None:
+    seconds = time.perf_counter() - start
+    for observer in _fetch_observers:
+        observer(symbol, seconds, failed)
+
+
+class MarketDataError(Exception):
+    """A chart request failed (network, HTTP status, missing recording or injected fault)."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class MarketDataProvider:
+    """Base class: fetch_chart() returns Yahoo v8 chart JSON for a symbol."""
+
+    name = "base"
+    rate_limited = False
+
+    def fetch_chart(self, symbol: str, params: Optional[Dict] = None) -> Dict:
+        raise NotImplementedError
+
+    def throttle(self, seconds: float) -> None:
+        """Courtesy delay before a request — only applied against rate-limited sources."""
+        if self.rate_limited and seconds > 0:
+            time.sleep(seconds)
+
+
+class HttpChartProvider(MarketDataProvider):
+    """
+    Chart API over HTTP
+
+    Args:
+        base_url: Server root (Yahoo, or e.g. http://127.0.0.1:8765 for the stand-in)
+        rate_limited: Apply throttle() delays (True for the real Yahoo endpoint)
+        timeout: Request timeout in seconds
+    """
+
+    name = "http"
+
+    def __init__(self, base_url: str, rate_limited: bool = False, timeout: float = 15):
+        self.base_url = base_url.rstrip("/")
+        self.rate_limited = rate_limited
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._session.headers.update(DEFAULT_HEADERS)
+
+    def fetch_chart(self, symbol: str, params: Optional[Dict] = None) -> Dict:
+        url = self.base_url + CHART_PATH.format(symbol=symbol)
+        start = time.perf_counter()
+        try:
+            response = self._session.get(url, params=params or {}, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            _notify_fetch(symbol, start, True)
+            raise MarketDataError(f"Network error - {e}") from e
+        _notify_fetch(symbol, start, response.status_code != 200)
+
+        if response.status_code != 200:
+            raise MarketDataError(f"HTTP {response.status_code}", response.status_code)
+
+        try:
+            return response.json()
+        except ValueError as e:
+            raise MarketDataError(f"Invalid JSON - {e}") from e
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Serve recorded chart JSON from a directory
+
+    Args:
+        directory: Folder of <symbol>.json recordings (see recordings.py)
+        synthesize: Generate a deterministic chart for symbols with no recording
+        seed: Seed for synthesized charts
+    """
+
+    name = "replay"
+
+    def __init__(self, directory: str, synthesize: bool = False, seed: int = 42):
+        self.directory = directory
+        self.synthesize = synthesize
+        self.seed = seed
+        self._loaded: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, symbol: str) -> Dict:
+        with self._lock:
+            if symbol in self._loaded:
+                return self._loaded[symbol]
+
+        path = recording_path(self.directory, symbol)
+        if os.path.exists(path):
+            with open(path) as f:
+                payload = json.load(f)
+        elif self.synthesize:
+            payload = synthetic_chart(symbol, seed=self.seed)
+        else:
+            raise MarketDataError(f"No recording for {symbol} in {self.directory}", 404)
+
+        with self._lock:
+            self._loaded[symbol] = payload
+        return payload
+
+    def fetch_chart(self, symbol: str, params: Optional[Dict] = None) -> Dict:
+        start = time.perf_counter()
+        try:
+            payload = slice_chart(self._load(symbol), params)
+        except MarketDataError:
+            _notify_fetch(symbol, start, True)
+            raise
+        _notify_fetch(symbol, start, False)
+        return payload
+
+
+class RecordingProvider(MarketDataProvider):
+    """
+    Pass requests to another provider and save each response for replay
+
+    Only the longest response per symbol is kept, so recording a session
+    that asks for range=1d and range=1y leaves the 1y history on disk.
+    """
+
+    name = "recording"
+
+    def __init__(self, inner: MarketDataProvider, directory: str):
+        self.inner = inner
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def rate_limited(self):
+        return self.inner.rate_limited
+
+    def fetch_chart(self, symbol: str, params: Optional[Dict] = None) -> Dict:
+        payload = self.inner.fetch_chart(symbol, params)
+        path = recording_path(self.directory, symbol)
+
+        with self._lock:
+            existing = 0
+            if os.path.exists(path):
+                try:
+                    with open(path) as f:
+                        existing = bar_count(json.load(f))
+                except (OSError, ValueError):
+                    existing = 0
+            if bar_count(payload) >= existing:
+                with open(path, "w") as f:
+                    json.dump(payload, f)
+        return payload
+
+
+class FaultInjectingProvider(MarketDataProvider):
+    """
+    Add seeded latency and failures in front of another provider
+
+    Args:
+        inner: Provider to wrap
+        latency_ms: Fixed delay per request
+        jitter_ms: Extra uniform random delay (0..jitter_ms)
+        error_rate: Probability (0-1) a request raises MarketDataError instead
+        seed: RNG seed — the same call sequence sees the same delays and failures
+    """
+
+    name = "fault"
+
+    def __init__(self, inner: MarketDataProvider, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0.0, seed: int = 42):
+        self.inner = inner
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.injected_errors = 0
+
+    @property
+    def rate_limited(self):
+        return self.inner.rate_limited
+
+    def fetch_chart(self, symbol: str, params: Optional[Dict] = None) -> Dict:
+        with self._lock:
+            self.calls += 1
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.injected_errors += 1
+
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if fail:
+            raise MarketDataError(f"Injected fault for {symbol}", 503)
+        return self.inner.fetch_chart(symbol, params)
@@ -0,0 +1,179 @@
+"""
+Chart Recordings
+
+On-disk format and helpers for recorded Yahoo chart responses.
+
+One file per symbol holds the longest history recorded for it
+(<dir>/<quoted symbol>.json, the raw chart JSON). Requests for a shorter
+range are answered by slicing that history, so a single 5y recording
+serves range=1d quotes, range=1mo ATR and range=1y MA200 alike.
+
+Functions:
+    - recording_path(): File path for a symbol
+    - slice_chart(): Trim a chart payload to the request's range / period1-period2
+    - synthetic_chart(): Deterministic generated chart for symbols with no recording
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from urllib.parse import quote
+
+from lazy_imports import lazy_module
+
+np = lazy_module("numpy")
+
+
+RANGE_DAYS = {
+    "1d": 1, "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183,
+    "1y": 366, "2y": 731, "5y": 1827, "10y": 3653,
+}
+
+
+def recording_path(directory: str, symbol: str) -> str:
+    """'^FTSE' → '<directory>/%5EFTSE.json'"""
+    return os.path.join(directory, f"{quote(symbol, safe='.-_')}.json")
+
+
+def bar_count(payload: Dict) -> int:
+    """Number of bars in a chart payload (0 if malformed)."""
+    try:
+        return len(payload["chart"]["result"][0].get("timestamp") or [])
+    except (KeyError, IndexError, TypeError):
+        return 0
+
+
+def _keep_mask(timestamps: np.ndarray, params: Dict) -> np.ndarray:
+    if "period1" in params or "period2" in params:
+        start = int(params.get("period1", 0))
+        end = int(params.get("period2", 2 ** 62))
+        return (timestamps >= start) & (timestamps <= end)
+
+    range_ = params.get("range", "max")
+    if range_ == "max" or not len(timestamps):
+        return np.ones(len(timestamps), dtype=bool)
+    if range_ == "ytd":
+        year = datetime.fromtimestamp(int(timestamps[-1]), tz=timezone.utc).year
+        return timestamps >= datetime(year, 1, 1, tzinfo=timezone.utc).timestamp()
+    if range_ == "1d":
+        mask = np.zeros(len(timestamps), dtype=bool)
+        mask[-1] = True
+        return mask
+    days = RANGE_DAYS.get(range_, 366)
+    return timestamps > timestamps[-1] - days * 86400
+
+
+def slice_chart(payload: Dict, params: Optional[Dict] = None) -> Dict:
+    """
+    Trim a recorded chart payload to the bars a live request would return
+
+    Args:
+        payload: Full recorded chart JSON
+        params: Yahoo query params (range, or period1/period2 as epoch seconds)
+
+    Returns:
+        New payload with timestamp, quote and adjclose arrays sliced;
+        meta is left as recorded (regularMarketPrice = latest recorded price)
+    """
+    params = params or {}
+    try:
+        result = payload["chart"]["result"][0]
+        timestamps = np.asarray(result.get("timestamp") or [], dtype=np.int64)
+    except (KeyError, IndexError, TypeError):
+        return payload
+
+    mask = _keep_mask(timestamps, params)
+    if mask.all():
+        return payload
+
+    keep = np.flatnonzero(mask).tolist()
+    sliced = copy.deepcopy(payload)
+    out = sliced["chart"]["result"][0]
+    out["timestamp"] = [result["timestamp"][i] for i in keep]
+
+    indicators = out.get("indicators", {})
+    for block_name in ("quote", "adjclose"):
+        for block in indicators.get(block_name, []):
+            for key, values in block.items():
+                if isinstance(values, list) and len(values) == len(timestamps):
+                    block[key] = [values[i] for i in keep]
+    return sliced
+
+
+def _start_price(symbol: str, rng: np.random.Generator) -> float:
+    if symbol.endswith("=X"):
+        return 1.27
+    if symbol.startswith("^"):
+        return 7500.0
+    if symbol.endswith(".L"):
+        return float(rng.uniform(200, 5000))  # pence
+    return float(rng.uniform(20, 800))
+
+
+def synthetic_chart(symbol: str, days: int = 1300, seed: int = 42, end: Optional[datetime] = None) -> Dict:
+    """
+    Generate a deterministic chart payload for a symbol
+
+    Args:
+        symbol: Ticker (.L tickers are priced in pence, =X pairs near 1.27, ^ indices near 7,500)
+        days: Number of business-day bars
+        seed: Base seed; combined with the symbol so each symbol gets its own path
+        end: Last bar date (default: today)
+
+    Returns:
+        Chart JSON in the Yahoo v8 shape (meta, timestamp, quote OHLCV, adjclose)
+    """
+    rng = np.random.default_rng(seed + zlib.crc32(symbol.encode()))
+    end = (end or datetime.now(timezone.utc)).replace(hour=21, minute=0, second=0, microsecond=0)
+
+    dates = []
+    current = end
+    while len(dates) < days:
+        if current.weekday() < 5:
+            dates.append(current)
+        current -= timedelta(days=1)
+    dates.reverse()
+
+    annual_vol = 0.06 if symbol.endswith("=X") else 0.18 if symbol.startswith("^") else rng.uniform(0.2, 0.5)
+    annual_drift = 0.0 if symbol.endswith("=X") else 0.08
+    daily = rng.normal(annual_drift / 252, annual_vol / np.sqrt(252), days)
+    daily[0] = 0.0
+    close = _start_price(symbol, rng) * np.cumprod(1.0 + daily)
+    spread = np.abs(rng.normal(0, annual_vol / np.sqrt(252), days)) * close
+    open_ = close * (1.0 + rng.normal(0, annual_vol / np.sqrt(252) / 2, days))
+    high = np.maximum(close, open_) + spread / 2
+    low = np.minimum(close, open_) - spread / 2
+    volume = rng.integers(100_000, 5_000_000, days)
+
+    decimals = 4 if symbol.endswith("=X") else 2
+    close_list = np.round(close, decimals).tolist()
+    return {
+        "chart": {
+            "result": [{
+                "meta": {
+                    "symbol": symbol,
+                    "currency": "GBp" if symbol.endswith(".L") else "USD",
+                    "regularMarketPrice": close_list[-1],
+                    "chartPreviousClose": close_list[-2] if days > 1 else close_list[-1],
+                    "dataGranularity": "1d",
+                    "synthetic": True,
+                },
+                "timestamp": [int(d.timestamp()) for d in dates],
+                "indicators": {
+                    "quote": [{
+                        "open": np.round(open_, decimals).tolist(),
+                        "high": np.round(high, decimals).tolist(),
+                        "low": np.round(low, decimals).tolist(),
+                        "close": close_list,
+                        "volume": volume.tolist(),
+                    }],
+                    "adjclose": [{"adjclose": close_list}],
+                },
+            }],
+            "error": None,
+        }
+    }
@@ -0,0 +1,142 @@
+"""
+Local Yahoo Chart API Stand-in
+
+Serves recorded chart JSON over HTTP at the same path and query parameters
+as query1.finance.yahoo.com, so the backend can run unchanged with
+MARKET_DATA_PROVIDER=http and MARKET_DATA_BASE_URL pointing here.
+
+Latency and error injection happen server-side, so they exercise the real
+HTTP client path (connection reuse, timeouts, status handling).
+
+Usage (from backend/):
+    python -m market_data.server --dir market_data_recordings --port 8765
+    python -m market_data.server --synthesize --latency-ms 80 --jitter-ms 40 --error-rate 0.02
+
+    MARKET_DATA_PROVIDER=http MARKET_DATA_BASE_URL=http://127.0.0.1:8765 uvicorn main:app
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import urlparse, parse_qs, unquote
+
+from .providers import ReplayProvider, MarketDataError
+
+
+CHART_PREFIX = "/v8/finance/chart/"
+
+
+class ChartServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer carrying the replay source and fault settings."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], source: ReplayProvider,
+                 latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0.0, seed: int = 42):
+        super().__init__(address, ChartRequestHandler)
+        self.source = source
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.requests_served = 0
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class ChartRequestHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def _send_json(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        server: ChartServer = self.server
+        parsed = urlparse(self.path)
+
+        if parsed.path == "/health":
+            self._send_json(200, {"status": "ok", "requests_served": server.requests_served})
+            return
+
+        if not parsed.path.startswith(CHART_PREFIX):
+            self._send_json(404, {"chart": {"result": None, "error": {"code": "Not Found"}}})
+            return
+
+        with server.rng_lock:
+            server.requests_served += 1
+            delay = server.latency_ms + server.rng.uniform(0, server.jitter_ms)
+            fail = server.rng.random() < server.error_rate
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if fail:
+            self._send_json(503, {"chart": {"result": None, "error": {"code": "Injected fault"}}})
+            return
+
+        symbol = unquote(parsed.path[len(CHART_PREFIX):])
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        try:
+            self._send_json(200, server.source.fetch_chart(symbol, params))
+        except MarketDataError as e:
+            self._send_json(e.status_code or 500, {
+                "chart": {"result": None, "error": {"code": "Not Found", "description": str(e)}}
+            })
+
+
+def start_server(directory: str, host: str = "127.0.0.1", port: int = 0, synthesize: bool = False,
+                 latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0.0,
+                 seed: int = 42) -> ChartServer:
+    """
+    Start the stand-in on a background thread
+
+    Args:
+        port: 0 picks a free port (read it back from server.url)
+
+    Returns:
+        Running ChartServer; call shutdown() when done
+    """
+    source = ReplayProvider(directory, synthesize=synthesize, seed=seed)
+    server = ChartServer((host, port), source, latency_ms, jitter_ms, error_rate, seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local Yahoo chart API stand-in")
+    parser.add_argument("--dir", default="market_data_recordings", help="Recorded chart JSON directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--synthesize", action="store_true", help="Generate charts for unrecorded symbols")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    source = ReplayProvider(args.dir, synthesize=args.synthesize, seed=args.seed)
+    server = ChartServer((args.host, args.port), source, args.latency_ms, args.jitter_ms,
+                         args.error_rate, args.seed)
+    print(f"✓ Chart stand-in serving {args.dir} on {server.url}"
+          f"{' (synthesizing missing symbols)' if args.synthesize else ''}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✓ Stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,9 @@ from .requests import (
     SettingsRequest,
     SizePositionRequest,
     CashTransactionRequest,
-    ExitPositionRequest
+    ExitPositionRequest,
+    BatchExitItem,
+    BatchTradeRequest
 )
 
 __all__ = [
@@ -20,5 +22,7 @@ __all__ = [
     'SettingsRequest',
     'SizePositionRequest',
     'CashTransactionRequest',
-    'ExitPositionRequest'
+    'ExitPositionRequest',
+    'BatchExitItem',
+    'BatchTradeRequest'
 ]
@@ -111,3 +111,20 @@ class ExitPositionRequest(BaseModel):
     exit_reason: Optional[str] = "Manual Exit"
     exit_fx_rate: Optional[float] = None  # REQUIRED for US stocks, ignored for UK
     exit_note: Optional[str] = None
+
+
+class BatchExitItem(ExitPositionRequest):
+    """One exit in a batch: an ExitPositionRequest plus the position it closes"""
+    position_id: str
+
+
+class BatchTradeRequest(BaseModel):
+    """
+    Request model for a batch of exits and entries (rebalance days)
+
+    Applied atomically, exits before entries. fx_rate (GBP/USD from the
+    broker) is used for every US exit or entry that has no rate of its own.
+    """
+    exits: List[BatchExitItem] = []
+    entries: List[AddPositionRequest] = []
+    fx_rate: Optional[float] = None
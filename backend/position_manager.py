@@ -11,11 +11,12 @@ Run this DAILY to get:
 
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timedelta
 import json
 import os
 
+from market_data import get_provider, parse_chart, MarketDataError
+
 pd.set_option("display.float_format", lambda x: f"{x:,.2f}")
 
 # =====================================================================
@@ -52,18 +53,32 @@ def save_portfolio(portfolio):
         json.dump(portfolio, f, indent=2, default=str)
     print(f"\n✓ Portfolio updated and saved")
 
+def download_closes(tickers, start):
+    """Adjusted daily closes (dates × tickers) from the market data provider"""
+    provider = get_provider()
+    params = {
+        "interval": "1d",
+        "period1": int(datetime.strptime(start, '%Y-%m-%d').timestamp()),
+        "period2": int(datetime.now().timestamp()),
+    }
+    
+    series = {}
+    for ticker in tickers:
+        try:
+            chart = parse_chart(provider.fetch_chart(ticker, params), ticker)
+            index = pd.to_datetime(chart.timestamps, unit="s").normalize()
+            series[ticker] = pd.Series(chart.adjclose, index=index)
+        except MarketDataError as e:
+            print(f"⚠️  {ticker}: could not download prices ({e})")
+    
+    return pd.DataFrame(series).sort_index().dropna(how="all")
+
 def get_current_prices_and_atr(tickers):
     """Download current prices and ATR for all positions"""
     
     start = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
     
-    data = yf.download(tickers, start=start, auto_adjust=True, progress=False)
-    
-    if isinstance(data, pd.Series):
-        data = data.to_frame()
-        data.columns = [tickers[0]]
-    
-    prices = data["Close"] if "Close" in data else data
+    prices = download_closes(tickers, start).ffill()
     
     # Calculate ATR
     high = prices.copy()
@@ -93,19 +108,11 @@ def get_current_prices_and_atr(tickers):
 def check_market_regime():
     """Check if market is risk-on or risk-off"""
 
-    def _close_series(download_df):
+    def _close_series(closes, ticker):
         """Extract Close prices as a clean Series"""
-        close = download_df["Close"]
-
-        if isinstance(close, pd.DataFrame):
-            close = close.squeeze("columns")
-
-        close = pd.to_numeric(close, errors="coerce").dropna()
-
-        if not isinstance(close, pd.Series):
-            close = pd.Series(close).dropna()
-
-        return close
+        if ticker not in closes:
+            return pd.Series(dtype=float)
+        return pd.to_numeric(closes[ticker], errors="coerce").dropna()
 
     def _last_float(x):
         """Convert to Python float"""
@@ -115,11 +122,10 @@ def check_market_regime():
 
     start = (datetime.now() - timedelta(days=250)).strftime('%Y-%m-%d')
 
-    spy_df = yf.download("SPY", start=start, auto_adjust=True, progress=False)
-    ftse_df = yf.download("^FTSE", start=start, auto_adjust=True, progress=False)
+    closes = download_closes(["SPY", "^FTSE"], start)
 
-    spy = _close_series(spy_df)
-    ftse = _close_series(ftse_df)
+    spy = _close_series(closes, "SPY")
+    ftse = _close_series(closes, "^FTSE")
 
     spy_ma200_series = spy.rolling(200, min_periods=200).mean()
     ftse_ma200_series = ftse.rolling(200, min_periods=200).mean()
@@ -4,6 +4,7 @@ Analytics Router - Uses database connection directly
 
 from fastapi import APIRouter, Query, HTTPException
 from services.analytics_service import AnalyticsService
+from database import get_settings
 import os
 import psycopg2
 from psycopg2.extras import RealDictCursor
@@ -29,22 +30,16 @@ async def get_analytics_metrics(
         if not database_url:
             raise Exception("DATABASE_URL not configured")
         
+        # min_trades_for_analytics from the cached settings
+        settings_list = get_settings()
+        min_trades = settings_list[0].get('min_trades_for_analytics') if settings_list else None
+        min_trades = int(min_trades) if min_trades is not None else 10
+        
         # Connect to database
         conn = psycopg2.connect(database_url)
         cursor = conn.cursor(cursor_factory=RealDictCursor)
         
         try:
-            # Query settings to get min_trades_for_analytics
-            cursor.execute("""
-                SELECT min_trades_for_analytics
-                FROM settings
-                ORDER BY created_at DESC
-                LIMIT 1
-            """)
-            
-            settings_row = cursor.fetchone()
-            min_trades = int(settings_row['min_trades_for_analytics']) if settings_row else 10
-            
             # Query closed trades from trade_history table
             cursor.execute("""
                 SELECT 
@@ -0,0 +1,141 @@
+"""
+Profiles Router
+
+Opt-in, per-request profiling. A request carrying
+
+    X-Profile: 1                 (or ?profile=1)
+    X-Profile-Token: <token>     (or ?profile_token=<token>)
+
+with a token matching PROFILE_TOKEN is run under the sampling profiler in
+utils/profiling.py. Its response gains X-Profile-Id, X-Profile-Samples,
+X-Profile-Db-Queries and X-Profile-Http-Calls headers, and the full
+profile is kept in memory for download:
+
+    GET /debug/profiles                          - recent profiles (summaries)
+    GET /debug/profiles/{id}?format=speedscope   - open in https://www.speedscope.app
+    GET /debug/profiles/{id}?format=collapsed    - flamegraph.pl / inferno input
+    GET /debug/profiles/{id}?format=summary
+
+Requests without the flag (or with a wrong token) pass straight through,
+and only the threads serving the profiled request are sampled. Profiling
+is disabled entirely while PROFILE_TOKEN is unset: main.py does not even
+install ProfileMiddleware.
+"""
+
+import hmac
+from typing import Optional
+from urllib.parse import parse_qs
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from config import PROFILE_TOKEN
+from utils.profiling import RequestProfile, store_profile, get_profile, list_profiles
+from utils.timing import collect_spans
+from utils.query_budget import track_queries
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+def _token_ok(token: Optional[str]) -> bool:
+    return bool(PROFILE_TOKEN) and token is not None and hmac.compare_digest(token, PROFILE_TOKEN)
+
+
+def require_profile_token(
+    x_profile_token: Optional[str] = Header(None),
+    profile_token: Optional[str] = Query(None)
+):
+    if not PROFILE_TOKEN:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if not _token_ok(x_profile_token or profile_token):
+        raise HTTPException(status_code=403, detail="Invalid profile token")
+
+
+router = APIRouter(prefix="/debug/profiles", tags=["Debug"], dependencies=[Depends(require_profile_token)])
+
+
+class ProfileMiddleware:
+    """
+    Profile a request that asks to be (flag + valid token); pass the rest through
+
+    Plain ASGI middleware, registered by main.py only while PROFILE_TOKEN is
+    set. The flag and token are read straight from the scope, so a request
+    that doesn't ask for a profile goes to the app without any wrapping.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _wants_profile(scope):
+            return await self.app(scope, receive, send)
+
+        profile = RequestProfile(f"{scope['method']} {scope['path']}")
+
+        async def send_with_profile(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile.id.encode()),
+                    (b"x-profile-samples", str(sum(profile.samples.values())).encode()),
+                    (b"x-profile-db-queries", str(profile.db_queries).encode()),
+                    (b"x-profile-http-calls", str(profile.http_calls).encode()),
+                ]
+            await send(message)
+
+        profile.start()
+        try:
+            with collect_spans(profile), track_queries(profile.label) as queries:
+                profile.queries = queries
+                await self.app(scope, receive, send_with_profile)
+        finally:
+            profile.stop()
+            store_profile(profile)
+
+        logger.info("Request profiled", extra={
+            "profile_id": profile.id,
+            "label": profile.label,
+            "duration_ms": round(profile.duration * 1000, 1),
+            "db_queries": profile.db_queries,
+            "http_calls": profile.http_calls,
+        })
+
+
+def _wants_profile(scope) -> bool:
+    """X-Profile: 1 (or ?profile=1) with a valid X-Profile-Token (or ?profile_token=)"""
+    headers = dict(scope["headers"])
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    flag = headers.get(b"x-profile", b"").decode("latin-1") or query.get("profile", [None])[0]
+    if flag != "1":
+        return False
+    token = headers.get(b"x-profile-token", b"").decode("latin-1") or query.get("profile_token", [None])[0]
+    return _token_ok(token)
+
+
+@router.get("")
+def profiles_list():
+    """Summaries of the most recent profiles, newest first"""
+    return {"status": "ok", "data": list_profiles()}
+
+
+@router.get("/{profile_id}")
+def profile_get(profile_id: str, format: str = "speedscope"):
+    """
+    One stored profile
+
+    Args:
+        format: speedscope (JSON), collapsed (text) or summary
+    """
+    if format not in ("speedscope", "collapsed", "summary"):
+        raise HTTPException(status_code=400, detail="format must be speedscope, collapsed or summary")
+
+    try:
+        profile = get_profile(profile_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    if format == "summary":
+        return {"status": "ok", "data": profile.summary()}
+    return profile.speedscope()
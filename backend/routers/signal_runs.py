@@ -0,0 +1,145 @@
+"""
+Signal Runs Router
+
+Streaming variant of POST /signals/generate. Progress is sent as
+server-sent events (text/event-stream), one SSE event per progress dict
+from signal_run_service:
+
+    event: ticker
+    data: {"event": "ticker", "ticker": "NVDA", "ok": true, "done": 12, "total": 480, "failed": 1}
+
+The stream ends after a result, cancelled or error event. Dropping the
+connection cancels the run unless cancel_on_disconnect=false; a run can
+also be cancelled explicitly, or re-attached to, by run id.
+
+This router is thin. All business logic lives in signal_run_service.py.
+"""
+
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from services.signal_run_service import (
+    start_signal_run,
+    get_signal_run,
+    cancel_signal_run,
+)
+
+router = APIRouter(prefix="/signals", tags=["Signals"])
+
+HEARTBEAT_SECONDS = 15.0
+POLL_SECONDS = 1.0
+
+
+def _json_default(value):
+    # numpy scalars (e.g. risk-on flags) and dates in the result payload
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _format_sse(event: dict) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=_json_default)}\n\n"
+
+
+def _event_stream(run, request: Request, cancel_on_disconnect: bool):
+    async def stream():
+        position = 0
+        idle = 0.0
+        try:
+            while True:
+                if await request.is_disconnected():
+                    if cancel_on_disconnect and not run.finished:
+                        cancel_signal_run(run.id)
+                    return
+
+                batch = await asyncio.to_thread(run.events, position, POLL_SECONDS)
+                if not batch:
+                    if run.finished:
+                        return
+                    idle += POLL_SECONDS
+                    if idle >= HEARTBEAT_SECONDS:
+                        idle = 0.0
+                        yield ": keep-alive\n\n"
+                    continue
+
+                idle = 0.0
+                position += len(batch)
+                for event in batch:
+                    yield _format_sse(event)
+        except asyncio.CancelledError:
+            if cancel_on_disconnect and not run.finished:
+                cancel_signal_run(run.id)
+            raise
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Signal-Run-Id": run.id},
+    )
+
+
+@router.get("/generate/stream")
+async def generate_signals_stream(
+    request: Request,
+    lookback_days: int = 252,
+    top_n: int = 5,
+    cancel_on_disconnect: bool = True
+):
+    """
+    Generate momentum signals, streaming progress as server-sent events
+
+    Same parameters and result as POST /signals/generate. GET so that the
+    browser EventSource API can consume it directly.
+
+    Returns HTTP 409 if a signal run is already in progress.
+    """
+    try:
+        run = start_signal_run(
+            lookback_days=lookback_days,
+            top_n=top_n,
+            ma_period=200,
+            atr_period=14,
+            volatility_window=60,
+            min_position_pct=0.05,
+            max_position_pct=0.20
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return _event_stream(run, request, cancel_on_disconnect)
+
+
+@router.get("/runs/{run_id}")
+def get_signal_run_endpoint(run_id: str):
+    """Status of a streaming signal run."""
+    try:
+        return {"status": "ok", "data": get_signal_run(run_id).summary()}
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/runs/{run_id}/events")
+async def signal_run_events(request: Request, run_id: str):
+    """Re-attach to a run: replays its events from the start, then follows it live."""
+    try:
+        run = get_signal_run(run_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return _event_stream(run, request, cancel_on_disconnect=False)
+
+
+@router.post("/runs/{run_id}/cancel")
+def cancel_signal_run_endpoint(run_id: str):
+    """
+    Cancel a signal run
+
+    The download loop stops before its next ticker, so the remaining
+    rate-limit budget is not spent. No signals are saved for a cancelled run.
+    """
+    try:
+        return {"status": "ok", "data": cancel_signal_run(run_id)}
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
@@ -1,18 +1,67 @@
 """
 Endpoint Testing Router - Comprehensive test suite
 Tests all API endpoints to verify system health
+
+Requests run concurrently (services/smoke_test_service.py); pass
+iterations > 1 to get p50 / p95 per endpoint as a light load probe.
 """
 
-from fastapi import APIRouter, HTTPException, Request
-import httpx
+from fastapi import APIRouter, HTTPException, Query, Request
 import time
 import os
 
+from config import SMOKE_TEST_CONCURRENCY, SMOKE_TEST_LIVE_PRICE_BUDGET_MS
+from lazy_imports import lazy_module
+from services.smoke_test_service import smoke_case, run_smoke_tests
+
+httpx = lazy_module("httpx")
+
 router = APIRouter(prefix="/test", tags=["Testing"])
 
+LIVE = SMOKE_TEST_LIVE_PRICE_BUDGET_MS
+
+TEST_CASES = [
+    # Core Endpoints
+    smoke_case("/", critical=True),
+    smoke_case("/health", critical=True),
+    smoke_case("/health/detailed", critical=True, budget_ms=LIVE),
+    
+    # Settings & Configuration
+    smoke_case("/settings", critical=True),
+    
+    # Position & Portfolio Management
+    smoke_case("/positions", critical=True, budget_ms=LIVE),
+    smoke_case("/positions/tags", critical=False),
+    smoke_case("/portfolio", critical=True, budget_ms=LIVE),
+    smoke_case("/portfolio/history?days=30", name="GET /portfolio/history", critical=True),
+    
+    # Trade History
+    smoke_case("/trades", critical=True),
+    
+    # Cash Management
+    smoke_case("/cash/transactions", critical=True),
+    smoke_case("/cash/summary", critical=True),
+    
+    # Signals & Market
+    smoke_case("/signals", critical=False),
+    smoke_case("/market/status", critical=True, budget_ms=LIVE),
+    
+    # Analytics
+    smoke_case("/analytics/metrics?period=all_time", name="GET /analytics/metrics (all_time)", critical=True),
+    smoke_case("/analytics/metrics?period=last_7_days", name="GET /analytics/metrics (last_7_days)", critical=False),
+    smoke_case("/analytics/metrics?period=ytd", name="GET /analytics/metrics (ytd)", critical=False),
+    
+    # Validation
+    smoke_case("/validate/calculations", method="POST", critical=True),
+]
+
 
 @router.post("/endpoints")
-async def test_all_endpoints(request: Request):
+async def test_all_endpoints(
+    request: Request,
+    concurrency: int = Query(SMOKE_TEST_CONCURRENCY, ge=1, le=32),
+    iterations: int = Query(1, ge=1, le=20)
+):
     """
     Test all API endpoints and return results.
     
@@ -21,11 +70,15 @@ async def test_all_endpoints(request: Request):
     - Data endpoints (settings, positions, portfolio, trades, cash, signals)
     - Market data (market status, portfolio history)
     - Feature endpoints (tags)
-    - Analytics endpoints (NEW)
-    - Validation endpoints (NEW)
+    - Analytics endpoints
+    - Validation endpoints
+    
+    Args:
+        concurrency: Requests in flight at once (1 = serial)
+        iterations: Attempts per endpoint; response_time_ms is the p50, p95_ms the p95
     
     Returns:
-        dict: Test results with pass/fail status for each endpoint
+        dict: Test results with pass/fail status and latency vs budget for each endpoint
     """
     
     # Auto-detect the base URL from the incoming request
@@ -36,116 +89,12 @@ async def test_all_endpoints(request: Request):
     if os.getenv("API_BASE_URL"):
         base_url = os.getenv("API_BASE_URL").rstrip('/')
     
-    # Define all test cases
-    test_cases = [
-        # Core Endpoints
-        {"name": "GET /", "method": "GET", "url": f"{base_url}/", "critical": True},
-        {"name": "GET /health", "method": "GET", "url": f"{base_url}/health", "critical": True},
-        {"name": "GET /health/detailed", "method": "GET", "url": f"{base_url}/health/detailed", "critical": True},
-        
-        # Settings & Configuration
-        {"name": "GET /settings", "method": "GET", "url": f"{base_url}/settings", "critical": True},
-        
-        # Position & Portfolio Management
-        {"name": "GET /positions", "method": "GET", "url": f"{base_url}/positions", "critical": True},
-        {"name": "GET /positions/tags", "method": "GET", "url": f"{base_url}/positions/tags", "critical": False},
-        {"name": "GET /portfolio", "method": "GET", "url": f"{base_url}/portfolio", "critical": True},
-        {"name": "GET /portfolio/history", "method": "GET", "url": f"{base_url}/portfolio/history?days=30", "critical": True},
-        
-        # Trade History
-        {"name": "GET /trades", "method": "GET", "url": f"{base_url}/trades", "critical": True},
-        
-        # Cash Management
-        {"name": "GET /cash/transactions", "method": "GET", "url": f"{base_url}/cash/transactions", "critical": True},
-        {"name": "GET /cash/summary", "method": "GET", "url": f"{base_url}/cash/summary", "critical": True},
-        
-        # Signals & Market
-        {"name": "GET /signals", "method": "GET", "url": f"{base_url}/signals", "critical": False},
-        {"name": "GET /market/status", "method": "GET", "url": f"{base_url}/market/status", "critical": True},
-        
-        # Analytics (NEW)
-        {"name": "GET /analytics/metrics (all_time)", "method": "GET", "url": f"{base_url}/analytics/metrics?period=all_time", "critical": True},
-        {"name": "GET /analytics/metrics (last_7_days)", "method": "GET", "url": f"{base_url}/analytics/metrics?period=last_7_days", "critical": False},
-        {"name": "GET /analytics/metrics (ytd)", "method": "GET", "url": f"{base_url}/analytics/metrics?period=ytd", "critical": False},
-        
-        # Validation (NEW)
-        {"name": "POST /validate/calculations", "method": "POST", "url": f"{base_url}/validate/calculations", "critical": True},
-    ]
+    try:
+        report = await run_smoke_tests(base_url, TEST_CASES, concurrency=concurrency, iterations=iterations)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    results = []
-    passed = 0
-    failed = 0
-    errors = 0
-    
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for test in test_cases:
-            result = {
-                "endpoint": test["name"],
-                "critical": test["critical"],
-                "status": "unknown",
-                "status_code": None,
-                "response_time_ms": None,
-                "error": None
-            }
-            
-            try:
-                start_time = time.time()
-                
-                if test["method"] == "GET":
-                    response = await client.get(test["url"])
-                elif test["method"] == "POST":
-                    response = await client.post(test["url"], json={})
-                else:
-                    raise ValueError(f"Unsupported method: {test['method']}")
-                
-                end_time = time.time()
-                response_time_ms = (end_time - start_time) * 1000
-                
-                result["status_code"] = response.status_code
-                result["response_time_ms"] = round(response_time_ms, 2)
-                
-                # Check if response is successful
-                if 200 <= response.status_code < 300:
-                    result["status"] = "pass"
-                    passed += 1
-                else:
-                    result["status"] = "fail"
-                    result["error"] = f"HTTP {response.status_code}: {response.text[:100]}"
-                    failed += 1
-                    
-            except httpx.TimeoutException:
-                result["status"] = "error"
-                result["error"] = "Request timeout (>30s)"
-                errors += 1
-                
-            except httpx.ConnectError as e:
-                result["status"] = "error"
-                result["error"] = f"Connection failed: {str(e)[:100]}"
-                errors += 1
-                
-            except Exception as e:
-                result["status"] = "error"
-                result["error"] = f"Unexpected error: {str(e)[:100]}"
-                errors += 1
-            
-            results.append(result)
-    
-    # Calculate success rate
-    total = len(results)
-    success_rate = (passed / total * 100) if total > 0 else 0
-    
-    return {
-        "status": "ok",
-        "summary": {
-            "total": total,
-            "passed": passed,
-            "failed": failed,
-            "errors": errors,
-            "success_rate": round(success_rate, 1)
-        },
-        "results": results,
-        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-    }
+    return {"status": "ok", **report}
 
 
 @router.get("/quick-health")
@@ -8,11 +8,13 @@ separation between HTTP handling (FastAPI) and domain logic.
 
 Modules:
     - position_service: Position management (get, add, exit, analyze)
+    - execution_service: Atomic trade pipeline (single and batch entries / exits)
     - portfolio_service: Portfolio summary, snapshots, history
     - sizing_service: Position sizing calculator (POST /portfolio/size)
     - trade_service: Trade history and statistics
     - cash_service: Cash transactions and flow tracking
     - signal_service: Momentum signal generation and management
+    - signal_run_service: Background signal runs with progress events and cancel
     - health_service: System health monitoring and endpoint testing
     - analytics_service: Comprehensive trading analytics and metrics
     - validation_service: Analytics calculation validation
@@ -36,6 +38,12 @@ from .position_service import (
     filter_by_tags
 )
 
+# Execution service
+from .execution_service import (
+    execute_trades,
+    execute_batch
+)
+
 # Portfolio service
 from .portfolio_service import (
     get_portfolio_summary,
@@ -60,16 +68,29 @@ from .cash_service import (
 
 # Signal service
 from .signal_service import (
+    SignalGenerationCancelled,
     generate_momentum_signals,
     get_signals,
     update_signal_status,
     delete_signal
 )
 
+# Signal run service
+from .signal_run_service import (
+    SignalRunInProgress,
+    start_signal_run,
+    run_signal_generation,
+    get_signal_run,
+    cancel_signal_run
+)
+
 # Health service
 from .health_service import (
     get_basic_health,
+    get_liveness,
+    get_readiness,
     get_detailed_health,
+    start_health_monitor,
     test_all_endpoints
 )
 
@@ -89,6 +110,9 @@ __all__ = [
     'update_tags',
     'get_available_tags',
     'filter_by_tags',
+    # Execution service
+    'execute_trades',
+    'execute_batch',
     # Portfolio service
     'get_portfolio_summary',
     'create_daily_snapshot',
@@ -102,13 +126,23 @@ __all__ = [
     'get_transaction_history',
     'get_cash_summary',
     # Signal service
+    'SignalGenerationCancelled',
     'generate_momentum_signals',
     'get_signals',
     'update_signal_status',
     'delete_signal',
+    # Signal run service
+    'SignalRunInProgress',
+    'start_signal_run',
+    'run_signal_generation',
+    'get_signal_run',
+    'cancel_signal_run',
     # Health service
     'get_basic_health',
+    'get_liveness',
+    'get_readiness',
     'get_detailed_health',
+    'start_health_monitor',
     'test_all_endpoints',
     # Analytics service
     'AnalyticsService',
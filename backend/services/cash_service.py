@@ -21,8 +21,13 @@ from database import (
 )
 
 from utils.formatting import decimal_to_float
+from unit_of_work import with_unit_of_work
+from utils.logging_setup import get_logger
 
+logger = get_logger(__name__)
 
+
+@with_unit_of_work(lock_portfolio=True)
 def create_transaction(
     transaction_type: str,
     amount: float,
@@ -81,22 +86,22 @@ def create_transaction(
     # Update portfolio cash balance
     if transaction_type == 'deposit':
         new_cash = current_cash + amount
-        print(f"💰 Deposit: £{amount:,.2f}")
+        logger.info(f"💰 Deposit: £{amount:,.2f}")
     else:  # withdrawal
         new_cash = current_cash - amount
-        print(f"💸 Withdrawal: £{amount:,.2f}")
+        logger.info(f"💸 Withdrawal: £{amount:,.2f}")
     
     update_portfolio_cash(portfolio_id, new_cash)
     
-    print(f"✓ Cash transaction created:")
-    print(f"   Type: {transaction_type.upper()}")
-    print(f"   Amount: £{amount:,.2f}")
-    print(f"   Date: {transaction_data['date']}")
-    print(f"   Old balance: £{current_cash:,.2f}")
-    print(f"   New balance: £{new_cash:,.2f}")
+    logger.info("✓ Cash transaction created", extra={
+        "type": transaction_type.upper(),
+        "amount": round(amount, 2),
+        "date": transaction_data['date'],
+        "old_balance": round(current_cash, 2),
+        "new_balance": round(new_cash, 2)
+    })
     if note:
-        print(f"   Note: {note}")
-    print()
+        logger.debug("Note: %s", note)
     
     return {
         "transaction": decimal_to_float(transaction),
@@ -151,7 +156,7 @@ def get_transaction_history(order: str = "DESC") -> List[Dict]:
             'created_at': str(tx['created_at'])
         })
     
-    print(f"✓ Retrieved {len(formatted)} cash transactions")
+    logger.info(f"✓ Retrieved {len(formatted)} cash transactions")
     
     return formatted
 
@@ -184,12 +189,12 @@ def get_summary() -> Dict:
     
     current_cash = float(portfolio['cash'])
     
-    print(f"💰 Cash Summary:")
-    print(f"   Total deposits: £{summary['total_deposits']:,.2f}")
-    print(f"   Total withdrawals: £{summary['total_withdrawals']:,.2f}")
-    print(f"   Net cash flow: £{summary['net_cash_flow']:,.2f}")
-    print(f"   Current cash: £{current_cash:,.2f}")
-    print()
+    logger.info("💰 Cash summary", extra={
+        "total_deposits": summary['total_deposits'],
+        "total_withdrawals": summary['total_withdrawals'],
+        "net_cash_flow": summary['net_cash_flow'],
+        "current_cash": current_cash
+    })
     
     return {
         "total_deposits": round(summary['total_deposits'], 2),
@@ -0,0 +1,526 @@
+"""
+Execution Service
+
+Trade execution pipeline used for every entry and exit. One call, any
+number of trades, one transaction:
+
+    1. prepare - inputs that need the network (live FX rate, ATR); no
+                 database connection is held while waiting on Yahoo.
+                 Entries the current cash clearly cannot cover are
+                 rejected before their ATR is fetched
+    2. lock    - portfolio and affected position rows, read FOR UPDATE in
+                 one round trip (lock_trade_context)
+    3. plan    - validation, fees, proceeds and P&L with utils.calculations;
+                 exits first, so cash they free funds the entries
+    4. apply   - every INSERT / UPDATE in one round trip (apply_trade_writes)
+
+Steps 2-4 run in one unit of work: nothing is written unless every trade
+validates, and concurrent trades on the same portfolio queue on the row
+lock instead of overwriting each other's cash. Settings come from the
+in-process settings cache.
+
+All functions are independent of FastAPI for maximum testability.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from database import get_portfolio, get_settings, lock_trade_context, apply_trade_writes
+from unit_of_work import unit_of_work
+from utils.pricing import get_live_fx_rate, calculate_atr
+from utils.calculations import (
+    calculate_uk_entry_fees,
+    calculate_us_entry_fees,
+    calculate_exit_proceeds,
+    calculate_realized_pnl,
+    calculate_holding_days,
+    calculate_initial_stop
+)
+from utils.timing import timed
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+DEFAULT_EXIT_REASON = 'Manual Exit'
+MAX_BATCH_ITEMS = 50
+
+
+# ============================================================================
+# PREPARE (network, no DB)
+# ============================================================================
+
+def _normalize_ticker(ticker: str, market: str):
+    if market not in ['US', 'UK']:
+        raise ValueError("Market must be 'US' or 'UK'")
+
+    # Auto-detect market from ticker if needed
+    if ticker.endswith('.L') and market == 'US':
+        market = 'UK'
+
+    # Add .L suffix for UK stocks if missing
+    if market == 'UK' and not ticker.endswith('.L'):
+        ticker = f"{ticker}.L"
+
+    return ticker, market
+
+
+def prepare_entries(entries: List[Dict]) -> List[Dict]:
+    """
+    Normalise entry requests and resolve the FX rate once per batch
+
+    US entries without an fx_rate share one live FX rate. ATR is left to
+    fill_atr(), after the affordability check.
+
+    Args:
+        entries: Dicts with add_position() arguments
+
+    Returns:
+        Copies with ticker, market and fx_rate filled in
+
+    Raises:
+        ValueError: On an invalid market
+    """
+    prepared = []
+    live_fx_rate = None
+
+    for entry in entries:
+        entry = dict(entry)
+        entry['ticker'], entry['market'] = _normalize_ticker(entry['ticker'], entry['market'])
+
+        if entry['market'] == 'US':
+            if not entry.get('fx_rate') or entry['fx_rate'] <= 0:
+                if live_fx_rate is None:
+                    live_fx_rate = get_live_fx_rate()
+                    logger.debug("Using live FX rate: %.4f", live_fx_rate)
+                entry['fx_rate'] = live_fx_rate
+        else:
+            entry['fx_rate'] = 1.0
+
+        prepared.append(entry)
+
+    return prepared
+
+
+def fill_atr(entries: List[Dict]) -> List[Dict]:
+    """
+    Calculate ATR for prepared entries that don't carry one
+
+    Falls back to 2% of the entry price when the calculation fails.
+
+    Returns:
+        The same entries, each with atr_value set
+    """
+    for entry in entries:
+        if not entry.get('atr_value'):
+            logger.debug("Calculating ATR for %s...", entry['ticker'])
+            entry['atr_value'] = calculate_atr(entry['ticker'])
+            if not entry['atr_value']:
+                entry['atr_value'] = entry['entry_price'] * 0.02
+                logger.warning(f"⚠️  Using default ATR (2% of entry): {entry['atr_value']:.2f}")
+
+    return entries
+
+
+# ============================================================================
+# PLAN (pure)
+# ============================================================================
+
+def entry_cost(entry: Dict, settings: Dict) -> Dict:
+    """
+    GBP cost and fees of one prepared entry (needs fx_rate, not ATR)
+
+    Returns:
+        {"total_cost_gbp", "fees_paid_gbp", "fee_type"}
+    """
+    gross_cost_native = entry['entry_price'] * entry['shares']
+
+    if entry['market'] == 'UK':
+        fee_breakdown = calculate_uk_entry_fees(gross_cost_native, settings)
+        fee_type = 'stamp_duty'
+    else:
+        fee_breakdown = calculate_us_entry_fees(gross_cost_native, settings)
+        fee_type = 'fx_fee'
+
+    total_fees_native = fee_breakdown['total']
+
+    # Convert to GBP for portfolio tracking
+    return {
+        "total_cost_gbp": (gross_cost_native + total_fees_native) / entry['fx_rate'],
+        "fees_paid_gbp": total_fees_native / entry['fx_rate'],
+        "fee_type": fee_type
+    }
+
+
+def plan_entry(entry: Dict, settings: Dict) -> Dict:
+    """
+    Fees, GBP cost and initial stop for one prepared entry
+
+    Returns:
+        {"position": row to insert, "total_cost_gbp", "fees_paid_gbp", "result": response fields}
+    """
+    market = entry['market']
+    shares = entry['shares']
+    entry_price_native = entry['entry_price']
+    fx_rate = entry['fx_rate']
+
+    cost = entry_cost(entry, settings)
+    entry_price_gbp = entry_price_native / fx_rate
+    total_cost_gbp = cost['total_cost_gbp']
+    fees_paid_gbp = cost['fees_paid_gbp']
+    fee_type = cost['fee_type']
+
+    initial_stop_native = calculate_initial_stop(entry_price_native, entry['atr_value'], multiplier=5.0)
+
+    position_id = str(uuid.uuid4())
+    position = {
+        'id': position_id,
+        'ticker': entry['ticker'],
+        'market': market,
+        'entry_date': entry['entry_date'],
+        'entry_price': entry_price_gbp,
+        'fill_price': entry_price_native,
+        'fill_currency': 'USD' if market == 'US' else 'GBP',
+        'fx_rate': fx_rate,
+        'shares': shares,
+        'total_cost': total_cost_gbp,
+        'fees_paid': fees_paid_gbp,
+        'fee_type': fee_type,
+        'initial_stop': initial_stop_native,
+        'current_stop': initial_stop_native,
+        'current_price': entry_price_native,
+        'atr': entry['atr_value'],
+        'holding_days': 0,
+        'pnl': 0,
+        'pnl_pct': 0,
+        'status': 'open',
+        'entry_note': entry.get('entry_note'),
+        'tags': entry.get('tags')
+    }
+
+    display_ticker = entry['ticker'].replace('.L', '') if market == 'UK' else entry['ticker']
+
+    return {
+        "position": position,
+        "total_cost_gbp": total_cost_gbp,
+        "fees_paid_gbp": fees_paid_gbp,
+        "result": {
+            "ticker": display_ticker,
+            "total_cost": round(total_cost_gbp, 2),
+            "fees_paid": round(fees_paid_gbp, 2),
+            "entry_price": round(entry_price_native, 2),
+            "initial_stop": round(initial_stop_native, 2),
+            "position_id": position_id
+        }
+    }
+
+
+def plan_exit(position: Dict, exit_request: Dict, settings: Dict) -> Dict:
+    """
+    Proceeds, fees and realized P&L for one exit of a locked position
+
+    Args:
+        position: Position row (from lock_trade_context)
+        exit_request: exit_position() arguments
+        settings: Fee settings
+
+    Returns:
+        {"trade": trade_history row, "position_update": partial update,
+         "net_proceeds_gbp", "result": response fields}
+
+    Raises:
+        ValueError: If the position is closed, the price or shares are invalid,
+                   or a US exit has no FX rate
+    """
+    if position['status'] == 'closed':
+        raise ValueError("Position already closed")
+
+    exit_price = exit_request['exit_price']
+    if exit_price <= 0:
+        raise ValueError("Exit price must be greater than 0")
+
+    total_shares = float(position['shares'])
+    shares = exit_request.get('shares')
+    exit_shares = float(shares) if shares else total_shares
+
+    if exit_shares <= 0:
+        raise ValueError("Shares to exit must be greater than 0")
+
+    if exit_shares > total_shares:
+        raise ValueError(
+            f"Insufficient shares. Position has {total_shares} shares, exit requested {exit_shares}"
+        )
+
+    market = position['market']
+    if market == 'US':
+        exit_fx_rate = exit_request.get('exit_fx_rate')
+        if not exit_fx_rate or exit_fx_rate <= 0:
+            raise ValueError(
+                "FX rate is required for US stock exits. Please provide the GBP/USD rate from your broker statement."
+            )
+        fx_rate_to_use = exit_fx_rate
+    else:
+        fx_rate_to_use = 1.0
+
+    entry_price = position.get('fill_price', position['entry_price']) if market == 'US' else position['entry_price']
+
+    proceeds = calculate_exit_proceeds(
+        exit_price=exit_price,
+        shares=exit_shares,
+        market=market,
+        exit_fx_rate=fx_rate_to_use,
+        settings=settings
+    )
+    net_proceeds_gbp = proceeds['net_proceeds_gbp']
+
+    total_cost = float(position['total_cost'])
+    realized_pnl_gbp, realized_pnl_pct = calculate_realized_pnl(
+        net_proceeds_gbp=net_proceeds_gbp,
+        total_cost=total_cost,
+        shares_exited=exit_shares,
+        total_shares=total_shares
+    )
+
+    # Proportional cost and entry fees of the exited shares
+    exit_total_cost = total_cost / total_shares * exit_shares
+    entry_fees = float(position.get('fees_paid') or 0)
+    exit_entry_fees = entry_fees / total_shares * exit_shares
+
+    exit_date_str = exit_request.get('exit_date') or datetime.now().strftime('%Y-%m-%d')
+    holding_days = calculate_holding_days(
+        entry_date=str(position['entry_date']),
+        exit_date=exit_date_str
+    )
+
+    reason = exit_request.get('exit_reason') or DEFAULT_EXIT_REASON
+    is_partial_exit = exit_shares < total_shares
+
+    trade = {
+        'ticker': position['ticker'],
+        'market': market,
+        'entry_date': position['entry_date'],
+        'exit_date': exit_date_str,
+        'shares': exit_shares,
+        'entry_price': entry_price,
+        'exit_price': exit_price,
+        'total_cost': exit_total_cost,
+        'gross_proceeds': proceeds['gross_proceeds_gbp'],
+        'net_proceeds': net_proceeds_gbp,
+        'entry_fees': exit_entry_fees,
+        'exit_fees': proceeds['exit_fees_gbp'],
+        'pnl': realized_pnl_gbp,
+        'pnl_pct': realized_pnl_pct,
+        'holding_days': holding_days,
+        'exit_reason': reason,
+        'entry_fx_rate': float(position.get('fx_rate') or 1.0),
+        'exit_fx_rate': fx_rate_to_use,
+        'entry_note': position.get('entry_note'),
+        'exit_note': exit_request.get('exit_note'),
+        'tags': position.get('tags')
+    }
+
+    if is_partial_exit:
+        position_update = {
+            'id': str(position['id']),
+            'shares': total_shares - exit_shares,
+            'total_cost': total_cost - exit_total_cost,
+            'fees_paid': entry_fees - exit_entry_fees
+        }
+    else:
+        position_update = {
+            'id': str(position['id']),
+            'status': 'closed',
+            'exit_date': exit_date_str,
+            'exit_price': exit_price,
+            'exit_reason': reason
+        }
+
+    return {
+        "trade": trade,
+        "position_update": position_update,
+        "net_proceeds_gbp": net_proceeds_gbp,
+        "result": {
+            "ticker": position['ticker'],
+            "market": market,
+            "exit_price": round(exit_price, 2),
+            "shares": exit_shares,
+            "gross_proceeds": round(proceeds['gross_proceeds_gbp'], 2),
+            "exit_fees": round(proceeds['exit_fees_gbp'], 2),
+            "fee_breakdown": proceeds['fee_breakdown'],
+            "net_proceeds": round(net_proceeds_gbp, 2),
+            "realized_pnl": round(realized_pnl_gbp, 2),
+            "realized_pnl_pct": round(realized_pnl_pct, 2),
+            "exit_fx_rate": fx_rate_to_use,
+            "exit_date": exit_date_str,
+            "is_partial_exit": is_partial_exit,
+            "remaining_shares": round(total_shares - exit_shares, 4) if is_partial_exit else 0
+        }
+    }
+
+
+# ============================================================================
+# EXECUTE
+# ============================================================================
+
+@timed("execution.execute_trades")
+def execute_trades(exits: Optional[List[Dict]] = None, entries: Optional[List[Dict]] = None) -> Dict:
+    """
+    Apply exits then entries atomically
+
+    Args:
+        exits: exit_position() argument dicts (position_id, exit_price, ...)
+        entries: add_position() argument dicts (ticker, market, entry_date, ...)
+
+    Returns:
+        Dictionary with:
+            - exits: Per-exit results (exit_position() shape)
+            - entries: Per-entry results (add_position() shape)
+            - starting_cash: Cash before the batch
+            - new_cash_balance: Cash after the batch
+
+    Raises:
+        ValueError: If the portfolio or a position is missing, any trade fails
+                   validation, or cash does not cover the entries. Prefixed
+                   with the failing item (e.g. "exits[1]: ...") for batches;
+                   nothing is written.
+    """
+    exits = exits or []
+    entries = entries or []
+    label = len(exits) + len(entries) > 1
+
+    def _fail(kind: str, index: int, error: Exception):
+        raise ValueError(f"{kind}[{index}]: {error}" if label else str(error)) from error
+
+    position_ids = [str(e['position_id']) for e in exits]
+    if len(set(position_ids)) != len(position_ids):
+        raise ValueError("Each position can only be exited once per batch")
+
+    for i, entry in enumerate(entries):
+        try:
+            _normalize_ticker(entry['ticker'], entry['market'])
+        except ValueError as e:
+            _fail("entries", i, e)
+
+    # 1. Network inputs before any lock is taken
+    prepared_entries = prepare_entries(entries)
+
+    settings_list = get_settings()
+    settings = settings_list[0] if settings_list else {}
+
+    # Cheap pre-check so an entry the cash can't cover doesn't spend Yahoo
+    # rate limit on its ATR. Exits would free cash we can't price without
+    # their positions, so batches with exits rely on the check under the lock.
+    if prepared_entries and not exits:
+        portfolio = get_portfolio()
+        if not portfolio:
+            raise ValueError("Portfolio not found")
+        cash = float(portfolio['cash'])
+        for i, entry in enumerate(prepared_entries):
+            total_cost_gbp = entry_cost(entry, settings)['total_cost_gbp']
+            if total_cost_gbp > cash:
+                _fail("entries", i, ValueError(
+                    f"Insufficient funds. Need £{total_cost_gbp:.2f}, have £{cash:.2f}"
+                ))
+            cash -= total_cost_gbp
+
+    fill_atr(prepared_entries)
+
+    with unit_of_work(lock_portfolio=True):
+        # 2. Lock portfolio + positions
+        context = lock_trade_context(position_ids)
+        if not context:
+            raise ValueError("Portfolio not found")
+
+        portfolio_id = str(context['portfolio']['id'])
+        starting_cash = float(context['portfolio']['cash'])
+        cash = starting_cash
+
+        # 3. Plan: exits first so their proceeds fund the entries
+        exit_plans = []
+        for i, exit_request in enumerate(exits):
+            position = context['positions'].get(str(exit_request['position_id']))
+            try:
+                if not position:
+                    raise ValueError("Position not found")
+                plan = plan_exit(position, exit_request, settings)
+            except ValueError as e:
+                _fail("exits", i, e)
+            cash += plan['net_proceeds_gbp']
+            plan['result']['new_cash_balance'] = round(cash, 2)
+            exit_plans.append(plan)
+
+        entry_plans = []
+        for i, entry in enumerate(prepared_entries):
+            plan = plan_entry(entry, settings)
+            if plan['total_cost_gbp'] > cash:
+                _fail("entries", i, ValueError(
+                    f"Insufficient funds. Need £{plan['total_cost_gbp']:.2f}, have £{cash:.2f}"
+                ))
+            cash -= plan['total_cost_gbp']
+            plan['result']['remaining_cash'] = round(cash, 2)
+            entry_plans.append(plan)
+
+        # 4. One round trip for all writes
+        written = apply_trade_writes(
+            portfolio_id,
+            new_cash=cash,
+            new_positions=[p['position'] for p in entry_plans],
+            trades=[p['trade'] for p in exit_plans],
+            position_updates=[p['position_update'] for p in exit_plans]
+        )
+
+    for plan in exit_plans:
+        logger.info(f"📤 Exited {plan['result']['ticker']}", extra={
+            "shares": plan['result']['shares'],
+            "net_proceeds": plan['result']['net_proceeds'],
+            "realized_pnl": plan['result']['realized_pnl'],
+            "partial": plan['result']['is_partial_exit']
+        })
+    for plan in entry_plans:
+        logger.info(f"📝 Entered {plan['result']['ticker']}", extra={
+            "total_cost": plan['result']['total_cost'],
+            "fees_paid": plan['result']['fees_paid']
+        })
+    logger.debug("Cash: £%.2f → £%.2f", starting_cash, written['cash'])
+
+    return {
+        "exits": [p['result'] for p in exit_plans],
+        "entries": [p['result'] for p in entry_plans],
+        "starting_cash": round(starting_cash, 2),
+        "new_cash_balance": round(written['cash'], 2)
+    }
+
+
+def execute_batch(exits: List[Dict], entries: List[Dict], fx_rate: Optional[float] = None) -> Dict:
+    """
+    Rebalance-day batch: all exits, then all entries, in one transaction
+
+    Args:
+        exits: exit_position() argument dicts, each with position_id
+        entries: add_position() argument dicts
+        fx_rate: GBP/USD rate for US items without their own rate
+                 (entries without either share one live rate)
+
+    Returns:
+        execute_trades() result with per-item results in request order
+
+    Raises:
+        ValueError: If the batch is empty or too large, or any item fails
+                   (nothing is written)
+    """
+    if not exits and not entries:
+        raise ValueError("Batch must contain at least one exit or entry")
+
+    if len(exits) + len(entries) > MAX_BATCH_ITEMS:
+        raise ValueError(f"Batch is limited to {MAX_BATCH_ITEMS} items")
+
+    if fx_rate is not None and fx_rate <= 0:
+        raise ValueError("fx_rate must be greater than 0")
+
+    if fx_rate:
+        exits = [{**e, 'exit_fx_rate': e.get('exit_fx_rate') or fx_rate} for e in exits]
+        entries = [{**e, 'fx_rate': e.get('fx_rate') or fx_rate} for e in entries]
+
+    logger.info(f"📦 Executing batch: {len(exits)} exits, {len(entries)} entries")
+    return execute_trades(exits=exits, entries=entries)
@@ -1,21 +1,70 @@
 """
 Health Service
 
-Business logic for system health monitoring including:
-- Basic health checks
-- Detailed component status
-- Endpoint testing
+Business logic for system health monitoring, in three tiers:
+- Liveness (GET /health/live, GET /health): process is up; no I/O
+- Readiness (GET /health/ready): cached results of background component
+  checks, refreshed every HEALTH_CHECK_INTERVAL_SECONDS by the health monitor
+- Deep check (GET /health/detailed): every component checked on demand;
+  the results also refresh the readiness cache
+
+Plus endpoint testing (smoke tests).
+
+Probes never touch the database or Yahoo, so the platform can poll them
+as often as it likes without generating external traffic.
 
 All functions are independent of FastAPI for maximum testability.
 """
 
-from typing import Dict, List
+from typing import Callable, Dict, List
 from datetime import datetime
+import asyncio
+import threading
 import time
-import requests
 
-from database import get_portfolio, get_settings
-from utils.pricing import get_live_fx_rate
+from database import get_portfolio, get_settings, ping
+from market_data import get_chart
+from config import (
+    SMOKE_TEST_CONCURRENCY,
+    SMOKE_TEST_LIVE_PRICE_BUDGET_MS,
+    HEALTH_CHECK_INTERVAL_SECONDS,
+    HEALTH_CHECK_STALE_SECONDS,
+)
+from services.smoke_test_service import smoke_case, run_smoke_tests
+from lazy_imports import import_report
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+VERSION = "1.4.0"
+
+# Components the app cannot serve requests without; the rest only degrade it
+CRITICAL_COMPONENTS = ("database", "config")
+
+
+# Endpoints covered by test_all_endpoints()
+SMOKE_ENDPOINTS = [
+    smoke_case("/"),
+    smoke_case("/health"),
+    smoke_case("/health/live"),
+    smoke_case("/settings"),
+    smoke_case("/positions", budget_ms=SMOKE_TEST_LIVE_PRICE_BUDGET_MS),
+    smoke_case("/portfolio", budget_ms=SMOKE_TEST_LIVE_PRICE_BUDGET_MS),
+    smoke_case("/trades"),
+    smoke_case("/cash/transactions"),
+    smoke_case("/cash/summary"),
+    smoke_case("/signals"),
+    smoke_case("/market/status", budget_ms=SMOKE_TEST_LIVE_PRICE_BUDGET_MS),
+    smoke_case("/portfolio/history?days=7"),
+    smoke_case("/positions/tags"),
+]
+
+_started_at = time.monotonic()
+
+# Latest component results (checks dict is replaced, never mutated, under the lock)
+_component_cache = {"checks": None, "checked_at": None, "refreshed_at": 0.0}
+_cache_lock = threading.Lock()
+_monitor_running = threading.Event()
 
 
 def get_basic_health() -> Dict:
@@ -29,23 +78,210 @@ def get_basic_health() -> Dict:
             - version: Application version
     
     Note:
-        - Fast response (<10ms)
+        - No I/O; same guarantee as get_liveness()
         - Use for load balancer health checks
         - Returns 200 OK if system is running
     """
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "version": "1.4.0"
+        "version": VERSION
+    }
+
+
+def get_liveness() -> Dict:
+    """
+    Liveness probe - the process is running and serving requests
+    
+    Returns:
+        Dictionary with:
+            - status: "alive"
+            - uptime_seconds: Seconds since the health service was loaded
+    
+    Note:
+        - Zero I/O; a failing liveness probe means restart the process
+        - Dependency outages belong to readiness, not liveness
+    """
+    return {
+        "status": "alive",
+        "uptime_seconds": round(time.monotonic() - _started_at, 1)
+    }
+
+
+def _run_check(check: Callable[[], Dict]) -> Dict:
+    start = time.perf_counter()
+    try:
+        result = {"status": "healthy", "details": check()}
+    except Exception as e:
+        result = {"status": "unhealthy", "details": {"error": str(e)}}
+    result["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def _check_database() -> Dict:
+    ping()
+    return {"connected": True}
+
+
+def _check_database_deep() -> Dict:
+    portfolio = get_portfolio()
+    return {"connected": True, "portfolio_exists": portfolio is not None}
+
+
+def _check_market_data() -> Dict:
+    # get_live_fx_rate() falls back to a default rate on failure; a health
+    # check needs the failure itself
+    fx_rate = get_chart("GBPUSD=X", {"interval": "1d", "range": "1d"}).last_price()
+    if fx_rate is None:
+        raise ValueError("GBPUSD=X returned no price")
+    return {"gbp_usd_rate": fx_rate, "accessible": True}
+
+
+def _check_services() -> Dict:
+    from services import (
+        get_positions_with_prices,
+        get_portfolio_summary,
+        get_cash_summary
+    )
+    return {
+        "position_service": "available",
+        "portfolio_service": "available",
+        "cash_service": "available",
+        "trade_service": "available",
+        "signal_service": "available"
+    }
+
+
+def _check_config() -> Dict:
+    settings = get_settings()
+    return {"settings_loaded": len(settings) > 0 if settings else False}
+
+
+# Background checks: one cheap call per component
+MONITORED_CHECKS = {
+    "database": _check_database,
+    "yahooFinance": _check_market_data,
+    "config": _check_config,
+}
+
+
+def _store_checks(checks: Dict) -> None:
+    with _cache_lock:
+        merged = dict(_component_cache["checks"] or {})
+        merged.update(checks)
+        _component_cache.update({
+            "checks": merged,
+            "checked_at": datetime.now().isoformat(),
+            "refreshed_at": time.monotonic(),
+        })
+
+
+def _cached_checks() -> Dict:
+    with _cache_lock:
+        return dict(_component_cache)
+
+
+def refresh_component_checks() -> Dict:
+    """
+    Run the background component checks once and update the readiness cache
+    
+    Returns:
+        {component: {"status", "details", "duration_ms"}}
+    """
+    checks = {name: _run_check(check) for name, check in MONITORED_CHECKS.items()}
+    _store_checks(checks)
+    return checks
+
+
+def get_readiness() -> Dict:
+    """
+    Readiness probe - can this instance serve traffic?
+    
+    Returns:
+        Dictionary with:
+            - status: "ready", "degraded" (ready, non-critical component down)
+                      or "not_ready"
+            - ready: bool
+            - checked_at: When the cached checks ran
+            - age_seconds: Age of the cached checks
+            - reason: Why the instance is not ready (not_ready only)
+            - checks: Cached component results
+    
+    Note:
+        - Reads the cache only; never runs a check itself (no I/O)
+        - Not ready when a critical component is unhealthy or the cache is
+          older than HEALTH_CHECK_STALE_SECONDS (monitor stuck or dead)
+        - Without a monitor (scripts, tests) the cache is only filled by
+          get_detailed_health() / refresh_component_checks(); once that is
+          missing or stale the reason is "Health monitor is not running"
+    """
+    cache = _cached_checks()
+    age = time.monotonic() - cache["refreshed_at"] if cache["checks"] is not None else None
+
+    checks = cache["checks"] or {}
+    reason = None
+    if (age is None or age > HEALTH_CHECK_STALE_SECONDS) and not _monitor_running.is_set():
+        reason = "Health monitor is not running"
+    elif age is None:
+        reason = "Component checks have not run yet"
+    elif age > HEALTH_CHECK_STALE_SECONDS:
+        reason = f"Component checks are stale ({age:.0f}s old)"
+    else:
+        failed = [name for name in CRITICAL_COMPONENTS if checks.get(name, {}).get("status") != "healthy"]
+        if failed:
+            reason = f"Unhealthy: {', '.join(failed)}"
+
+    if reason:
+        status = "not_ready"
+    elif all(c["status"] == "healthy" for c in checks.values()):
+        status = "ready"
+    else:
+        status = "degraded"
+
+    result = {
+        "status": status,
+        "ready": reason is None,
+        "checked_at": cache["checked_at"],
+        "age_seconds": round(age, 1) if age is not None else None,
+        "checks": checks
     }
+    if reason:
+        result["reason"] = reason
+    return result
+
+
+def start_health_monitor(interval_seconds: int = HEALTH_CHECK_INTERVAL_SECONDS) -> threading.Event:
+    """
+    Refresh the readiness cache every interval_seconds (background thread)
+    
+    Returns:
+        Event that stops the monitor when set
+    """
+    stop = threading.Event()
+    threading.Thread(target=_monitor_components, args=(stop, interval_seconds),
+                     name="health-monitor", daemon=True).start()
+    return stop
+
+
+def _monitor_components(stop: threading.Event, interval_seconds: int):
+    _monitor_running.set()
+    try:
+        while not stop.is_set():
+            checks = refresh_component_checks()
+            unhealthy = [name for name, c in checks.items() if c["status"] != "healthy"]
+            if unhealthy:
+                logger.warning(f"⚠️  Health check failed: {', '.join(unhealthy)}")
+            stop.wait(interval_seconds)
+    finally:
+        _monitor_running.clear()
 
 
 def get_detailed_health() -> Dict:
     """
-    Comprehensive system status check
+    Comprehensive system status check (on demand)
     
     Checks:
-        - Database connectivity
+        - Database connectivity (portfolio read)
         - External services (Yahoo Finance)
         - Service layer health
         - Configuration validity
@@ -55,76 +291,27 @@ def get_detailed_health() -> Dict:
             - status: Overall status ("healthy", "degraded", "unhealthy")
             - timestamp: Check timestamp
             - version: Application version
-            - responseTime: Response time in milliseconds
-            - components: Component-level health checks
+            - response_time_ms: Response time in milliseconds
+            - checks: Component-level health checks
+            - startup: App import time and heavy modules loaded since
+              (lazy_imports.import_report())
     
     Note:
-        - Checks all critical system components
+        - Does real I/O on every call; not for frequent probing
+          (use /health/live and /health/ready)
         - Returns "degraded" if any component unhealthy
+        - Results also refresh the readiness cache
         - Use for post-deployment verification
     """
     start_time = time.time()
     
     checks = {
-        "database": {"status": "unknown", "details": None},
-        "yahooFinance": {"status": "unknown", "details": None},
-        "services": {"status": "unknown", "details": None},
-        "config": {"status": "unknown", "details": None}
+        "database": _run_check(_check_database_deep),
+        "yahooFinance": _run_check(_check_market_data),
+        "services": _run_check(_check_services),
+        "config": _run_check(_check_config)
     }
-    
-    # 1. Database check
-    try:
-        portfolio = get_portfolio()
-        checks["database"]["status"] = "healthy"
-        checks["database"]["details"] = {
-            "connected": True,
-            "portfolio_exists": portfolio is not None
-        }
-    except Exception as e:
-        checks["database"]["status"] = "unhealthy"
-        checks["database"]["details"] = {"error": str(e)}
-    
-    # 2. Yahoo Finance check
-    try:
-        fx_rate = get_live_fx_rate()
-        checks["yahooFinance"]["status"] = "healthy"
-        checks["yahooFinance"]["details"] = {
-            "gbp_usd_rate": fx_rate,
-            "accessible": True
-        }
-    except Exception as e:
-        checks["yahooFinance"]["status"] = "unhealthy"
-        checks["yahooFinance"]["details"] = {"error": str(e)}
-    
-    # 3. Service layer check (verify imports work)
-    try:
-        from services import (
-            get_positions_with_prices,
-            get_portfolio_summary,
-            get_cash_summary
-        )
-        checks["services"]["status"] = "healthy"
-        checks["services"]["details"] = {
-            "position_service": "available",
-            "portfolio_service": "available",
-            "cash_service": "available",
-            "trade_service": "available",
-            "signal_service": "available"
-        }
-    except Exception as e:
-        checks["services"]["status"] = "unhealthy"
-        checks["services"]["details"] = {"error": str(e)}
-    
-    # 4. Config check
-    try:
-        settings = get_settings()
-        checks["config"]["status"] = "healthy"
-        checks["config"]["details"] = {
-            "settings_loaded": len(settings) > 0 if settings else False
-        }
-    except Exception as e:
-        checks["config"]["status"] = "unhealthy"
-        checks["config"]["details"] = {"error": str(e)}
+    _store_checks({name: checks[name] for name in MONITORED_CHECKS})
     
     # Overall status
     all_healthy = all(c["status"] == "healthy" for c in checks.values())
@@ -135,103 +322,40 @@ def get_detailed_health() -> Dict:
     return {
         "status": overall_status,
         "timestamp": datetime.now().isoformat(),
-        "version": "1.4.0",
+        "version": VERSION,
         "response_time_ms": response_time,
-        "checks": checks
+        "checks": checks,
+        "startup": import_report()
     }
 
 
-def test_all_endpoints(base_url: str = None) -> Dict:
+def test_all_endpoints(base_url: str = None, concurrency: int = SMOKE_TEST_CONCURRENCY,
+                       iterations: int = 1) -> Dict:
     """
     Test all API endpoints
     
     Args:
         base_url: Base URL of the API (if None, uses localhost:8000)
+        concurrency: Requests in flight at once (1 = serial)
+        iterations: Attempts per endpoint (p50 / p95 are over these)
     
     Returns:
         Dictionary with:
             - timestamp: Test timestamp
-            - summary: Summary statistics (total, passed, failed, errors, success_rate)
+            - summary: Summary statistics (total, passed, failed, errors, success_rate,
+                       over_budget, concurrency, iterations, wall_time_ms)
             - results: List of test results for each endpoint
     
     Note:
         - Tests all GET endpoints that don't require parameters
         - Returns pass/fail status for each
-        - Includes response times
+        - Includes response times and p95 vs each endpoint's latency budget
         - Use for post-deployment smoke tests
-        - Can take 10-30 seconds to complete
+        - Requests overlap, so a run takes about as long as the slowest endpoint
+        - Must not be called from a running event loop (use run_smoke_tests there)
     """
     # If no base_url provided, use localhost (for local testing)
     if base_url is None:
         base_url = "http://localhost:8000"
     
-    # Remove trailing slash if present
-    base_url = base_url.rstrip('/')
-    
-    # Define endpoints to test
-    endpoints = [
-        {"method": "GET", "path": "/", "expected_status": 200},
-        {"method": "GET", "path": "/health", "expected_status": 200},
-        {"method": "GET", "path": "/settings", "expected_status": 200},
-        {"method": "GET", "path": "/positions", "expected_status": 200},
-        {"method": "GET", "path": "/portfolio", "expected_status": 200},
-        {"method": "GET", "path": "/trades", "expected_status": 200},
-        {"method": "GET", "path": "/cash/transactions", "expected_status": 200},
-        {"method": "GET", "path": "/cash/summary", "expected_status": 200},
-        {"method": "GET", "path": "/signals", "expected_status": 200},
-        {"method": "GET", "path": "/market/status", "expected_status": 200},
-        {"method": "GET", "path": "/portfolio/history?days=7", "expected_status": 200},
-        {"method": "GET", "path": "/positions/tags", "expected_status": 200},
-        ]
-    
-    test_results = []
-    
-    for endpoint in endpoints:
-        try:
-            start = time.time()
-            
-            if endpoint["method"] == "GET":
-                response = requests.get(
-                    f"{base_url}{endpoint['path']}",
-                    timeout=10
-                )
-            
-            response_time = round((time.time() - start) * 1000, 2)
-            
-            result = {
-                "endpoint": f"{endpoint['method']} {endpoint['path']}",
-                "status": "pass" if response.status_code == endpoint["expected_status"] else "fail",
-                "status_code": response.status_code,
-                "expected_status": endpoint["expected_status"],
-                "response_time_ms": response_time
-            }
-            
-            test_results.append(result)
-            
-        except Exception as e:
-            test_results.append({
-                "endpoint": f"{endpoint['method']} {endpoint['path']}",
-                "status": "error",
-                "error": str(e),
-                "status_code": None,
-                "response_time_ms": None
-             })
-    
-    # Calculate summary
-    total = len(test_results)
-    passed = len([r for r in test_results if r.get("status") == "pass"])
-    failed = len([r for r in test_results if r.get("status") == "fail"])
-    errors = len([r for r in test_results if r.get("status") == "error"])
-    success_rate = round((passed / total) * 100, 1) if total > 0 else 0
-    
-    return {
-    "timestamp": datetime.now().isoformat(),
-    "summary": {
-        "total": total,
-        "passed": passed,
-        "failed": failed,
-        "errors": errors,
-        "success_rate": success_rate
-    },
-    "results": test_results
-}
+    return asyncio.run(run_smoke_tests(base_url, SMOKE_ENDPOINTS, concurrency=concurrency, iterations=iterations))
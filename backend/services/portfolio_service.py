@@ -9,7 +9,7 @@ Business logic for portfolio management including:
 All functions are independent of FastAPI for maximum testability.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 from database import (
@@ -22,8 +22,51 @@ from database import (
 
 from utils.pricing import get_current_price, get_live_fx_rate
 from utils.formatting import decimal_to_float
+from utils.timing import timed
+from unit_of_work import unit_of_work
+from utils.logging_setup import get_logger
 
+logger = get_logger(__name__)
 
+
+def _read_portfolio_state() -> Tuple[Dict, List[Dict], Optional[Dict]]:
+    """
+    Portfolio row, open positions and net cash flow, read in one unit of work
+
+    Returns:
+        (portfolio, open positions, deposits/withdrawals summary or None
+        when there are no open positions)
+
+    Raises:
+        ValueError: If portfolio not found
+
+    Note:
+        The unit ends before any live price is fetched, so no connection
+        or transaction is held while waiting on Yahoo.
+    """
+    with unit_of_work():
+        portfolio = get_portfolio()
+        if not portfolio:
+            raise ValueError("Portfolio not found")
+
+        portfolio_id = str(portfolio['id'])
+        positions = get_positions(portfolio_id, status='open')
+        cash_summary = get_total_deposits_withdrawals(portfolio_id) if positions else None
+
+    return portfolio, positions, cash_summary
+
+
+def _fetch_live_prices(positions: List[Dict]) -> Tuple[float, Dict[str, Optional[float]]]:
+    """Live GBP/USD rate plus {position id: live price} (None where the fetch failed)."""
+    live_fx_rate = get_live_fx_rate()
+    live_prices = {}
+    for pos in positions:
+        logger.debug("Fetching live price for %s...", pos['ticker'])
+        live_prices[str(pos['id'])] = get_current_price(pos['ticker'])
+    return live_fx_rate, live_prices
+
+
+@timed("portfolio.get_portfolio_summary")
 def get_portfolio_summary() -> Dict:
     """
     Get comprehensive portfolio summary with live prices
@@ -48,14 +91,14 @@ def get_portfolio_summary() -> Dict:
         - Always fetches live prices for positions
         - Calculates true P&L using net cash flow
         - Converts all values to GBP for consistency
+        - Database reads finish before the live prices are fetched
     """
-    portfolio = get_portfolio()
-    if not portfolio:
-        raise ValueError("Portfolio not found")
-    
-    portfolio_id = str(portfolio['id'])
-    positions = get_positions(portfolio_id, status='open')
-    
+    portfolio, positions, cash_summary = _read_portfolio_state()
+    return _summarise_portfolio(portfolio, positions, cash_summary)
+
+
+def _summarise_portfolio(portfolio: Dict, positions: List[Dict], cash_summary: Optional[Dict]) -> Dict:
+    """get_portfolio_summary() for already-read rows (fetches live prices, no DB access)."""
     cash = float(portfolio['cash'])
     
     if not positions:
@@ -70,9 +113,8 @@ def get_portfolio_summary() -> Dict:
             "positions": []
         }
     
-    # Get live FX rate
-    live_fx_rate = get_live_fx_rate()
-    print(f"\n📊 /portfolio endpoint - fetching live prices for Dashboard")
+    logger.info("📊 /portfolio endpoint - fetching live prices for Dashboard")
+    live_fx_rate, live_prices = _fetch_live_prices(positions)
     
     positions_list = []
     total_positions_value_gbp = 0
@@ -80,25 +122,23 @@ def get_portfolio_summary() -> Dict:
     for pos in positions:
         pos = decimal_to_float(pos)
         
-        # FETCH LIVE PRICE
-        print(f"   Fetching live price for {pos['ticker']}...")
-        live_price = get_current_price(pos['ticker'])
+        live_price = live_prices.get(str(pos['id']))
         
         if live_price:
             # Fix UK stocks: Yahoo returns pence
             if pos['market'] == 'UK' and live_price > 1000:
                 live_price = live_price / 100
-                print(f"   ✓ Converted {pos['ticker']} from pence to pounds: {live_price}")
+                logger.debug("✓ Converted %s from pence to pounds: %s", pos['ticker'], live_price)
             current_price_native = live_price
-            print(f"   ✓ Live price: {current_price_native:.2f}")
+            logger.debug("✓ Live price: %.2f", current_price_native)
         else:
             # Fallback to stored price
-            print(f"   ⚠️  Using stored price for {pos['ticker']}")
+            logger.warning(f"⚠️  Using stored price for {pos['ticker']}")
             stored_price = pos.get('current_price', pos['entry_price'])
             if pos['market'] == 'US' and stored_price < 500:
                 # Appears to be GBP, convert back to USD estimate
                 current_price_native = stored_price * 1.38
-                print(f"   ⚠️  Stored price appears to be GBP, estimated USD: {current_price_native:.2f}")
+                logger.warning(f"⚠️  Stored price appears to be GBP, estimated USD: {current_price_native:.2f}")
             else:
                 current_price_native = stored_price
         
@@ -109,7 +149,7 @@ def get_portfolio_summary() -> Dict:
         # Convert to GBP for Dashboard
         if market == 'US':
             current_price_gbp = current_price_native / live_fx_rate
-            print(f"   💱 ${current_price_native:.2f} → £{current_price_gbp:.2f}")
+            logger.debug("💱 $%.2f → £%.2f", current_price_native, current_price_gbp)
         else:
             current_price_gbp = current_price_native
         
@@ -156,7 +196,6 @@ def get_portfolio_summary() -> Dict:
     total_value = cash + total_positions_value_gbp
     
     # Calculate TRUE portfolio P&L accounting for deposits/withdrawals
-    cash_summary = get_total_deposits_withdrawals(portfolio_id)
     net_cash_flow = cash_summary['net_cash_flow']
     
     # Total cost of all positions
@@ -165,13 +204,14 @@ def get_portfolio_summary() -> Dict:
     # True P&L = Current Value - Net Cash Flow
     true_total_pnl = total_value - net_cash_flow
     
-    print(f"\n✓ Portfolio calculated:")
-    print(f"   Total positions value: £{total_positions_value_gbp:.2f}")
-    print(f"   Total cost of positions: £{total_cost_of_positions:.2f}")
-    print(f"   Cash: £{cash:.2f}")
-    print(f"   Total value: £{total_value:.2f}")
-    print(f"   Net cash flow (deposits-withdrawals): £{net_cash_flow:.2f}")
-    print(f"   True total P&L: £{true_total_pnl:+.2f}\n")
+    logger.info("✓ Portfolio calculated", extra={
+        "positions_value_gbp": round(total_positions_value_gbp, 2),
+        "positions_cost_gbp": round(total_cost_of_positions, 2),
+        "cash": round(cash, 2),
+        "total_value": round(total_value, 2),
+        "net_cash_flow": round(net_cash_flow, 2),
+        "total_pnl": round(true_total_pnl, 2)
+    })
     
     return {
         "cash": cash,
@@ -187,6 +227,7 @@ def get_portfolio_summary() -> Dict:
     }
 
 
+@timed("portfolio.create_daily_snapshot")
 def create_daily_snapshot() -> Dict:
     """
     Create a daily snapshot of portfolio performance
@@ -208,19 +249,18 @@ def create_daily_snapshot() -> Dict:
         - Uses UPSERT logic (updates if snapshot exists for today)
         - Should be run daily (automated via cron)
         - Recommended time: 4 PM UTC on weekdays
+        - Reads (one unit of work) and the UPSERT each hold a connection
+          only briefly; live prices are fetched between them
     """
-    print("\n📸 Creating portfolio snapshot...")
+    logger.info("📸 Creating portfolio snapshot...")
     
-    portfolio = get_portfolio()
-    if not portfolio:
-        raise ValueError("Portfolio not found")
+    portfolio, positions, cash_summary = _read_portfolio_state()
     
     # Get current portfolio data
-    portfolio_data = get_portfolio_summary()
+    portfolio_data = _summarise_portfolio(portfolio, positions, cash_summary)
     
     # Count open positions
     portfolio_id = str(portfolio['id'])
-    positions = get_positions(portfolio_id, status='open')
     position_count = len(positions) if positions else 0
     
     # Create snapshot
@@ -236,15 +276,17 @@ def create_daily_snapshot() -> Dict:
     
     snapshot = create_portfolio_snapshot(snapshot_data)
     
-    print(f"✓ Snapshot created:")
-    print(f"   Date: {snapshot_data['snapshot_date']}")
-    print(f"   Total Value: £{snapshot_data['total_value']:,.2f}")
-    print(f"   P&L: £{snapshot_data['total_pnl']:+,.2f}")
-    print(f"   Positions: {position_count}\n")
+    logger.info("✓ Snapshot created", extra={
+        "date": snapshot_data['snapshot_date'],
+        "total_value": snapshot_data['total_value'],
+        "total_pnl": snapshot_data['total_pnl'],
+        "positions": position_count
+    })
     
     return decimal_to_float(snapshot)
 
 
+@timed("portfolio.get_performance_history")
 def get_performance_history(days: int = 30) -> List[Dict]:
     """
     Get portfolio performance history for charts
@@ -277,7 +319,7 @@ def get_performance_history(days: int = 30) -> List[Dict]:
     snapshots = get_portfolio_snapshots(portfolio_id, days)
     
     if not snapshots:
-        print(f"⚠️  No portfolio history found (create snapshots with POST /portfolio/snapshot)")
+        logger.warning("⚠️  No portfolio history found (create snapshots with POST /portfolio/snapshot)")
         return []
     
     # Format for frontend
@@ -292,6 +334,6 @@ def get_performance_history(days: int = 30) -> List[Dict]:
             'position_count': snap.get('position_count', 0)
         })
     
-    print(f"✓ Retrieved {len(history)} snapshots from last {days} days")
+    logger.info(f"✓ Retrieved {len(history)} snapshots from last {days} days")
     
     return history
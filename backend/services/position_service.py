@@ -10,6 +10,7 @@ Business logic for position management including:
 All functions are independent of FastAPI for maximum testability.
 """
 import re
+import time
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from decimal import Decimal
@@ -18,11 +19,9 @@ from decimal import Decimal
 from database import (
     get_portfolio,
     get_positions,
+    get_position as db_get_position,
     update_position,
-    create_position,
-    update_portfolio_cash,
     get_settings,
-    create_trade_history,
     update_position_note,
     update_position_tags,
     get_all_tags,
@@ -33,28 +32,32 @@ from utils.pricing import (
     get_current_price,
     get_live_fx_rate,
     check_market_regime,
-    calculate_atr
+    get_ticker_snapshot
 )
 
+from config import ATR_CACHE_MAX_AGE_HOURS
+
 from utils.calculations import (
     calculate_position_pnl,
     calculate_holding_days,
     calculate_trailing_stop,
-    should_exit_position,
-    calculate_uk_entry_fees,
-    calculate_us_entry_fees,
-    calculate_exit_proceeds,
-    calculate_realized_pnl,
-    calculate_initial_stop
+    should_exit_position
 )
 
+from services.execution_service import execute_trades
+
 from utils.formatting import decimal_to_float
+from utils.timing import record_span, timed
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
 
 
 # ============================================================================
 # GET POSITIONS
 # ============================================================================
 
+@timed("positions.get_positions_with_prices")
 def get_positions_with_prices() -> List[Dict]:
     """
     Get all open positions with live prices and P&L calculations
@@ -88,7 +91,7 @@ def get_positions_with_prices() -> List[Dict]:
     # Get live FX rate for USD/GBP conversions
     live_fx_rate = get_live_fx_rate()
     
-    print(f"\n📊 Fetching live prices for {len(positions)} position(s)")
+    logger.info(f"📊 Fetching live prices for {len(positions)} position(s)")
     
     positions_list = []
     
@@ -96,7 +99,7 @@ def get_positions_with_prices() -> List[Dict]:
         pos = decimal_to_float(pos)
         
         # ALWAYS fetch live price
-        print(f"   Fetching {pos['ticker']}...")
+        logger.debug("Fetching %s...", pos['ticker'])
         live_price = get_current_price(pos['ticker'])
         
         if live_price:
@@ -104,10 +107,10 @@ def get_positions_with_prices() -> List[Dict]:
             if pos['market'] == 'UK' and live_price > 1000:
                 live_price = live_price / 100
             current_price_native = live_price
-            print(f"   ✓ Live: {current_price_native:.2f}")
+            logger.debug("✓ Live: %.2f", current_price_native)
         else:
             # Fallback to stored price
-            print(f"   ⚠️  Using stored price")
+            logger.warning("⚠️  Using stored price")
             current_price_native = pos.get('current_price', pos['entry_price'])
         
         # Calculate P&L
@@ -127,7 +130,7 @@ def get_positions_with_prices() -> List[Dict]:
         # Convert to GBP for Dashboard calculations
         if pos['market'] == 'US':
             current_price_gbp = current_price_native / live_fx_rate
-            print(f"   💱 ${current_price_native:.2f} → £{current_price_gbp:.2f}")
+            logger.debug("💱 $%.2f → £%.2f", current_price_native, current_price_gbp)
         else:
             current_price_gbp = current_price_native
         
@@ -139,7 +142,7 @@ def get_positions_with_prices() -> List[Dict]:
         if grace_period:
             # During grace period: No stop shown
             stop_price_native = 0
-            print(f"   🆕 Grace period: {holding_days}/10 days - No stop active")
+            logger.debug("🆕 Grace period: %s/10 days - No stop active", holding_days)
         else:
             # After grace period: Show stop from database (already in native currency)
             stop_price_native = pos.get('current_stop', pos.get('initial_stop', 0))
@@ -189,7 +192,7 @@ def get_positions_with_prices() -> List[Dict]:
             "tags": pos.get('tags', [])
         })
     
-    print(f"✓ Returned {len(positions_list)} positions with live prices\n")
+    logger.info(f"✓ Returned {len(positions_list)} positions with live prices")
     
     return positions_list
 
@@ -198,12 +201,30 @@ def get_positions_with_prices() -> List[Dict]:
 # ANALYZE POSITIONS (Daily Analysis)
 # ============================================================================
 
+def _atr_cache_is_stale(pos: Dict, now: datetime) -> bool:
+    """
+    True if positions.atr should be recalculated
+
+    Missing ATRs, and ATRs never refreshed by analysis (atr_updated_at is
+    NULL, e.g. the entry-time value), are stale; otherwise the cached value
+    is reused until it is ATR_CACHE_MAX_AGE_HOURS old.
+    """
+    if not pos.get('atr'):
+        return True
+    updated_at = pos.get('atr_updated_at')
+    if not updated_at:
+        return True
+    return (now - updated_at).total_seconds() >= ATR_CACHE_MAX_AGE_HOURS * 3600
+
+
+@timed("positions.analyze_positions")
 def analyze_positions() -> Dict:
     """
     Run daily position analysis with live prices and market regime
     
     Performs:
-        - Fetches live prices for all open positions
+        - Fetches live price and ATR for each open position (one request per ticker)
+        - Refreshes the cached ATR in positions.atr at most daily
         - Calculates P&L using current FX rates
         - Updates trailing stops based on profitability
         - Checks market regime (SPY/FTSE vs 200-day MA)
@@ -221,9 +242,7 @@ def analyze_positions() -> Dict:
     Raises:
         ValueError: If portfolio not found
     """
-    print("\n" + "="*70)
-    print("🔍 STARTING POSITION ANALYSIS")
-    print("="*70)
+    logger.info("🔍 STARTING POSITION ANALYSIS")
     
     portfolio = get_portfolio()
     if not portfolio:
@@ -233,7 +252,7 @@ def analyze_positions() -> Dict:
     positions = get_positions(portfolio_id, status='open')
     
     if not positions:
-        print("✓ No open positions to analyze")
+        logger.info("✓ No open positions to analyze")
         return {
             "analysis_date": datetime.now().strftime('%Y-%m-%d'),
             "summary": {
@@ -248,10 +267,10 @@ def analyze_positions() -> Dict:
     live_fx_rate = get_live_fx_rate()
     
     # Get market regime
-    print("\n📊 Checking market regime...")
+    logger.info("📊 Checking market regime...")
     market_regime = check_market_regime()
-    print(f"   SPY: {'🟢 Risk On' if market_regime['spy_risk_on'] else '🔴 Risk Off'}")
-    print(f"   FTSE: {'🟢 Risk On' if market_regime['ftse_risk_on'] else '🔴 Risk Off'}")
+    logger.debug("SPY: %s", '🟢 Risk On' if market_regime['spy_risk_on'] else '🔴 Risk Off')
+    logger.debug("FTSE: %s", '🟢 Risk On' if market_regime['ftse_risk_on'] else '🔴 Risk Off')
     
     # Get settings for stop calculations
     settings_list = get_settings()
@@ -261,18 +280,25 @@ def analyze_positions() -> Dict:
     total_value_gbp = 0
     total_pnl_gbp = 0
     
-    print(f"\n💼 Analyzing {len(positions)} position(s)...")
+    logger.info(f"💼 Analyzing {len(positions)} position(s)...")
     
     for pos in positions:
+        position_start = time.perf_counter()
         pos = decimal_to_float(pos)
         
-        print(f"\n{'='*70}")
-        print(f"📈 Analyzing: {pos['ticker']} ({pos['market']})")
-        print(f"{'='*70}")
+        logger.debug("📈 Analyzing: %s (%s)", pos['ticker'], pos['market'])
         
-        # Get live price
-        print(f"   🔍 Fetching live price from Yahoo Finance...")
-        live_price = get_current_price(pos['ticker'])
+        # Get live price and ATR from one history request
+        logger.debug("🔍 Fetching live price and ATR from Yahoo Finance...")
+        snapshot = get_ticker_snapshot(pos['ticker'])
+        live_price = snapshot['price'] if snapshot else None
+        
+        # Refresh the cached ATR (written with the price update below)
+        atr_updates = {}
+        if _atr_cache_is_stale(pos, datetime.now()) and snapshot and snapshot['atr']:
+            atr_updates = {'atr': round(snapshot['atr'], 4), 'atr_updated_at': datetime.now()}
+            pos['atr'] = atr_updates['atr']
+            logger.debug("💾 ATR refreshed: %.2f", atr_updates['atr'])
         
         # Determine entry price
         entry_price = pos.get('fill_price', pos['entry_price']) if pos['market'] == 'US' else pos['entry_price']
@@ -281,15 +307,15 @@ def analyze_positions() -> Dict:
             # Fix UK stocks: Yahoo returns pence
             if pos['market'] == 'UK' and live_price > 1000:
                 live_price = live_price / 100
-                print(f"   ✓ Converted from pence to pounds")
+                logger.debug("✓ Converted from pence to pounds")
             
-            print(f"   ✓ Live price: {live_price:.2f}")
-            print(f"   Entry price: {entry_price:.2f}")
-            print(f"   Change: {((live_price - entry_price) / entry_price * 100):+.2f}%")
+            logger.debug("✓ Live price: %.2f", live_price)
+            logger.debug("Entry price: %.2f", entry_price)
+            logger.debug("Change: %+.2f%%", (live_price - entry_price) / entry_price * 100)
             current_price = live_price
         else:
-            print(f"   ⚠️  Failed to fetch live price")
-            print(f"   Using stored price: {pos.get('current_price', entry_price):.2f}")
+            logger.warning("⚠️  Failed to fetch live price")
+            logger.debug("Using stored price: %.2f", pos.get('current_price', entry_price))
             current_price = pos.get('current_price', entry_price)
         
         # Calculate metrics
@@ -299,7 +325,8 @@ def analyze_positions() -> Dict:
         current_value_native = current_price * shares
         if pos['market'] == 'US':
             current_value_gbp = current_value_native / live_fx_rate
-            print(f"   💱 Converting USD to GBP (LIVE rate): ${current_value_native:.2f} / {live_fx_rate:.4f} = £{current_value_gbp:.2f}")
+            logger.debug("💱 Converting USD to GBP (LIVE rate): $%.2f / %.4f = £%.2f",
+                         current_value_native, live_fx_rate, current_value_gbp)
         else:
             current_value_gbp = current_value_native
         
@@ -312,7 +339,8 @@ def analyze_positions() -> Dict:
         )
         
         if pos['market'] == 'US':
-            print(f"   💰 P&L in GBP (LIVE rate): ${pnl_native:.2f} / {live_fx_rate:.4f} = £{pnl_gbp:.2f}")
+            logger.debug("💰 P&L in GBP (LIVE rate): $%.2f / %.4f = £%.2f",
+                         pnl_native, live_fx_rate, pnl_gbp)
         
         total_value_gbp += current_value_gbp
         total_pnl_gbp += pnl_gbp
@@ -320,9 +348,9 @@ def analyze_positions() -> Dict:
         # Calculate holding days
         holding_days = calculate_holding_days(str(pos['entry_date']))
         
-        print(f"   Holdings: {shares} shares = £{current_value_gbp:.2f} (GBP)")
-        print(f"   P&L: £{pnl_gbp:+.2f} ({pnl_pct:+.2f}%)")
-        print(f"   Days held: {holding_days}")
+        logger.debug("Holdings: %s shares = £%.2f (GBP)", shares, current_value_gbp)
+        logger.debug("P&L: £%+.2f (%+.2f%%)", pnl_gbp, pnl_pct)
+        logger.debug("Days held: %s", holding_days)
         
         # Get current stop from database (stored in NATIVE currency)
         current_stop_native = pos.get('current_stop', pos.get('initial_stop', 0))
@@ -336,17 +364,10 @@ def analyze_positions() -> Dict:
             display_stop_native = 0
             stop_reason = f"Grace period ({holding_days}/10 days)"
             atr_mult = 0
-            print(f"   🆕 Grace period active - no stop loss")
+            logger.debug("🆕 Grace period active - no stop loss")
         else:
-            # Get ATR value
+            # Get ATR value (cached, refreshed above from the snapshot)
             atr_value = pos.get('atr')
-            if not atr_value or atr_value == 0:
-                print(f"   ⚠️  No ATR in database, calculating...")
-                atr_value = calculate_atr(pos['ticker'])
-                
-                if atr_value and atr_value > 0:
-                    update_position(str(pos['id']), {'atr': round(atr_value, 4)})
-                    print(f"   💾 Stored calculated ATR: {atr_value:.2f}")
             
             if atr_value and atr_value > 0:
                 # Get entry price in native currency
@@ -366,9 +387,10 @@ def analyze_positions() -> Dict:
                 
                 currency_symbol = "$" if pos['market'] == 'US' else "£"
                 if trailing_stop_native > current_stop_native:
-                    print(f"   📈 Stop moved up: {currency_symbol}{current_stop_native:.2f} → {currency_symbol}{trailing_stop_native:.2f}")
+                    logger.debug("📈 Stop moved up: %s%.2f → %s%.2f",
+                                 currency_symbol, current_stop_native, currency_symbol, trailing_stop_native)
                 else:
-                    print(f"   📊 Stop unchanged: {currency_symbol}{trailing_stop_native:.2f}")
+                    logger.debug("📊 Stop unchanged: %s%.2f", currency_symbol, trailing_stop_native)
             else:
                 # No ATR available, use entry price as stop
                 entry_price_native = pos.get('fill_price', entry_price) if pos['market'] == 'US' else entry_price
@@ -376,7 +398,7 @@ def analyze_positions() -> Dict:
                 display_stop_native = trailing_stop_native
                 stop_reason = "No ATR - stop at entry"
                 atr_mult = 0
-                print(f"   ⚠️  No ATR value available, stop at entry level")
+                logger.warning("⚠️  No ATR value available, stop at entry level")
         
         # Determine action
         is_uk = pos['market'] == 'UK'
@@ -394,24 +416,25 @@ def analyze_positions() -> Dict:
             action = "EXIT"
             if exit_reason == "Risk-Off Signal":
                 stop_reason = "Market risk-off"
-                print(f"   🔴 EXIT: Market risk-off")
+                logger.debug("🔴 EXIT: Market risk-off")
             else:
                 stop_reason = "Stop triggered"
                 currency_symbol = "$" if pos['market'] == 'US' else "£"
-                print(f"   🔴 EXIT: Stop loss hit ({currency_symbol}{trailing_stop_native:.2f})")
+                logger.debug("🔴 EXIT: Stop loss hit (%s%.2f)", currency_symbol, trailing_stop_native)
         else:
             action = "HOLD"
-            print(f"   ✅ HOLD: {stop_reason}")
+            logger.debug("✅ HOLD: %s", stop_reason)
         
         # Update position in database
         if live_price:
-            print(f"   💾 Updating position in database...")
+            logger.debug("💾 Updating position in database...")
             update_position(str(pos['id']), {
                 'current_price': round(current_price, 4),
                 'current_stop': round(trailing_stop_native, 2),
                 'holding_days': holding_days,
                 'pnl': round(pnl_gbp, 2),
-                'pnl_pct': round(pnl_pct, 2)
+                'pnl_pct': round(pnl_pct, 2),
+                **atr_updates
             })
         
         # Add to actions
@@ -430,17 +453,25 @@ def analyze_positions() -> Dict:
             "stop_reason": stop_reason,
             "grace_period": grace_period
         })
+        
+        logger.info(f"📈 {pos['ticker']}: {action}", extra={
+            "ticker": pos['ticker'],
+            "price": round(current_price, 4),
+            "pnl_gbp": round(pnl_gbp, 2),
+            "stop": round(display_stop_native, 2),
+            "reason": stop_reason
+        })
+        record_span("positions.analyze_position", time.perf_counter() - position_start)
     
     exit_count = len([a for a in actions if a['action'] == 'EXIT'])
     
-    print(f"\n{'='*70}")
-    print(f"📊 ANALYSIS COMPLETE")
-    print(f"{'='*70}")
-    print(f"Total Value: £{total_value_gbp:.2f} (GBP)")
-    print(f"Total P&L: £{total_pnl_gbp:+.2f} (GBP)")
-    print(f"Live FX Rate: {live_fx_rate:.4f}")
-    print(f"Exit Signals: {exit_count}")
-    print("="*70 + "\n")
+    logger.info("📊 Analysis complete", extra={
+        "positions": len(positions),
+        "total_value_gbp": round(total_value_gbp, 2),
+        "total_pnl_gbp": round(total_pnl_gbp, 2),
+        "live_fx_rate": round(live_fx_rate, 4),
+        "exit_count": exit_count
+    })
     
     return {
         "analysis_date": datetime.now().strftime('%Y-%m-%d'),
@@ -459,6 +490,7 @@ def analyze_positions() -> Dict:
 # ADD POSITION
 # ============================================================================
 
+@timed("positions.add_position")
 def add_position(
     ticker: str,
     market: str,
@@ -497,151 +529,29 @@ def add_position(
     Raises:
         ValueError: If portfolio not found, invalid market, or insufficient funds
     """
-    portfolio = get_portfolio()
-    if not portfolio:
-        raise ValueError("Portfolio not found")
-    
-    portfolio_id = str(portfolio['id'])
-    
-    print(f"\n📝 Adding new position: {ticker}")
-    
-    # Validate market
-    if market not in ['US', 'UK']:
-        raise ValueError("Market must be 'US' or 'UK'")
-    
-    # Auto-detect market from ticker if needed
-    if ticker.endswith('.L') and market == 'US':
-        market = 'UK'
-        print(f"   Auto-detected UK market from .L suffix")
+    logger.info(f"📝 Adding new position: {ticker}")
     
-    # Add .L suffix for UK stocks if missing
-    if market == 'UK' and not ticker.endswith('.L'):
-        ticker = f"{ticker}.L"
-        print(f"   Added .L suffix: {ticker}")
-    
-    # Get settings for fees
-    settings_list = get_settings()
-    settings = settings_list[0] if settings_list else None
-    
-    # Calculate entry details
-    entry_price_native = entry_price
-    
-    # Get or validate FX rate for US stocks
-    if market == 'US':
-        if fx_rate and fx_rate > 0:
-            fx_rate_to_use = fx_rate
-            print(f"   Using provided FX rate: {fx_rate_to_use:.4f}")
-        else:
-            fx_rate_to_use = get_live_fx_rate()
-            print(f"   Using live FX rate: {fx_rate_to_use:.4f}")
-    else:
-        fx_rate_to_use = 1.0
-    
-    # Calculate gross cost in native currency
-    gross_cost_native = entry_price_native * shares
-    
-    # Calculate fees
-    if market == 'UK':
-        fee_breakdown = calculate_uk_entry_fees(gross_cost_native, settings or {})
-        fee_type = 'stamp_duty'
-        print(f"   UK fees: £{fee_breakdown['commission']:.2f} commission + £{fee_breakdown['stamp_duty']:.2f} stamp duty = £{fee_breakdown['total']:.2f}")
-    else:
-        fee_breakdown = calculate_us_entry_fees(gross_cost_native, settings or {})
-        fee_type = 'fx_fee'
-        print(f"   US fees: ${fee_breakdown['fx_fee']:.2f} FX fee")
-    
-    total_fees_native = fee_breakdown['total']
-    
-    # Total cost in native currency
-    total_cost_native = gross_cost_native + total_fees_native
-    
-    # Convert to GBP for portfolio tracking
-    if market == 'US':
-        entry_price_gbp = entry_price_native / fx_rate_to_use
-        total_cost_gbp = total_cost_native / fx_rate_to_use
-        fees_paid_gbp = total_fees_native / fx_rate_to_use
-        print(f"   💱 Total cost: ${total_cost_native:.2f} / {fx_rate_to_use:.4f} = £{total_cost_gbp:.2f}")
-    else:
-        entry_price_gbp = entry_price_native
-        total_cost_gbp = total_cost_native
-        fees_paid_gbp = total_fees_native
-    
-    # Check if enough cash
-    current_cash = float(portfolio['cash'])
-    if total_cost_gbp > current_cash:
-        raise ValueError(
-            f"Insufficient funds. Need £{total_cost_gbp:.2f}, have £{current_cash:.2f}"
-        )
-    
-    # Get or calculate ATR
-    if not atr_value or atr_value == 0:
-        print(f"   Calculating ATR for {ticker}...")
-        atr_value = calculate_atr(ticker)
-        if not atr_value:
-            # Use default 2% of entry price if can't calculate
-            atr_value = entry_price_native * 0.02
-            print(f"   ⚠️  Using default ATR (2% of entry): {atr_value:.2f}")
-    
-    # Calculate initial stop
-    initial_stop_native = calculate_initial_stop(entry_price_native, atr_value, multiplier=5.0)
-    
-    print(f"   Entry price: {entry_price_native:.2f}")
-    print(f"   ATR: {atr_value:.2f}")
-    print(f"   Initial stop: {initial_stop_native:.2f}")
-    
-    # Create position record
-    position_data = {
+    result = execute_trades(entries=[{
         'ticker': ticker,
         'market': market,
         'entry_date': entry_date,
-        'entry_price': entry_price_gbp,
-        'fill_price': entry_price_native,
-        'fill_currency': 'USD' if market == 'US' else 'GBP',
-        'fx_rate': fx_rate_to_use,
         'shares': shares,
-        'total_cost': total_cost_gbp,
-        'fees_paid': fees_paid_gbp,
-        'fee_type': fee_type,
-        'initial_stop': initial_stop_native,
-        'current_stop': initial_stop_native,
-        'current_price': entry_price_native,
-        'atr': atr_value,
-        'holding_days': 0,
-        'pnl': 0,
-        'pnl_pct': 0,
-        'status': 'open',
+        'entry_price': entry_price,
+        'fx_rate': fx_rate,
+        'atr_value': atr_value,
+        'stop_price': stop_price,
         'entry_note': entry_note,
         'tags': tags
-    }
-    
-    # Create position in database
-    new_position = create_position(portfolio_id, position_data)
-    
-    # Update portfolio cash
-    new_cash = current_cash - total_cost_gbp
-    update_portfolio_cash(portfolio_id, new_cash)
-    
-    print(f"   ✓ Position created")
-    print(f"   Cash: £{current_cash:.2f} → £{new_cash:.2f}\n")
-    
-    # Return response
-    display_ticker = ticker.replace('.L', '') if market == 'UK' else ticker
+    }])
     
-    return {
-        "ticker": display_ticker,
-        "total_cost": round(total_cost_gbp, 2),
-        "fees_paid": round(fees_paid_gbp, 2),
-        "entry_price": round(entry_price_native, 2),
-        "initial_stop": round(initial_stop_native, 2),
-        "remaining_cash": round(new_cash, 2),
-        "position_id": str(new_position['id'])
-    }
+    return result['entries'][0]
 
 
 # ============================================================================
 # EXIT POSITION
 # ============================================================================
 
+@timed("positions.exit_position")
 def exit_position(
     position_id: str,
     exit_price: float,
@@ -684,215 +594,20 @@ def exit_position(
         ValueError: If position not found, already closed, invalid shares,
                    or missing FX rate for US stocks
     """
-    portfolio = get_portfolio()
-    if not portfolio:
-        raise ValueError("Portfolio not found")
+    logger.info(f"📤 Exiting position: {position_id}")
     
-    portfolio_id = str(portfolio['id'])
-    
-    # Get the position
-    positions = get_positions(portfolio_id)
-    position = None
-    for pos in positions:
-        if str(pos['id']) == position_id:
-            position = pos
-            break
-    
-    if not position:
-        raise ValueError("Position not found")
-    
-    if position['status'] == 'closed':
-        raise ValueError("Position already closed")
-    
-    # Validate exit price
-    if exit_price <= 0:
-        raise ValueError("Exit price must be greater than 0")
-    
-    # Validate shares
-    total_shares = float(position['shares'])
-    exit_shares = float(shares) if shares else total_shares
-    
-    if exit_shares <= 0:
-        raise ValueError("Shares to exit must be greater than 0")
-    
-    if exit_shares > total_shares:
-        raise ValueError(
-            f"Insufficient shares. Position has {total_shares} shares, exit requested {exit_shares}"
-        )
-    
-    # Validate FX rate for US stocks
-    if position['market'] == 'US':
-        if exit_fx_rate and exit_fx_rate > 0:
-            fx_rate_to_use = exit_fx_rate
-            print(f"✓ Exit FX rate: {fx_rate_to_use:.4f} (user-provided from broker)")
-        else:
-            raise ValueError(
-                "FX rate is required for US stock exits. Please provide the GBP/USD rate from your broker statement."
-            )
-    else:
-        fx_rate_to_use = 1.0
-    
-    print(f"\n📤 Exiting position: {position['ticker']}")
-    print(f"   Shares to exit: {exit_shares} of {total_shares}")
-    print(f"   Exit price: {exit_price:.2f} (user-provided)")
-    
-    # Get settings
-    settings_list = get_settings()
-    settings = settings_list[0] if settings_list else None
-    
-    market = position['market']
-    entry_price = position.get('fill_price', position['entry_price']) if market == 'US' else position['entry_price']
-    
-    # Calculate exit proceeds
-    proceeds = calculate_exit_proceeds(
-        exit_price=exit_price,
-        shares=exit_shares,
-        market=market,
-        exit_fx_rate=fx_rate_to_use,
-        settings=settings or {}
-    )
-    
-    gross_proceeds_gbp = proceeds['gross_proceeds_gbp']
-    exit_fees_gbp = proceeds['exit_fees_gbp']
-    net_proceeds_gbp = proceeds['net_proceeds_gbp']
-    fee_breakdown = proceeds['fee_breakdown']
-    
-    if market == 'UK':
-        print(f"   UK exit fees: £{fee_breakdown['commission']:.2f} commission")
-    else:
-        print(f"   US exit fees: ${fee_breakdown['fx_fee']:.2f} FX fee")
-        print(f"   💱 FX conversion: ${proceeds['net_proceeds_native']:.2f} / {fx_rate_to_use:.4f} = £{net_proceeds_gbp:.2f}")
-    
-    # Calculate realized P&L
-    total_cost = float(position['total_cost'])
-    realized_pnl_gbp, realized_pnl_pct = calculate_realized_pnl(
-        net_proceeds_gbp=net_proceeds_gbp,
-        total_cost=total_cost,
-        shares_exited=exit_shares,
-        total_shares=total_shares
-    )
-    
-    # Calculate proportional costs
-    cost_per_share = total_cost / total_shares
-    exit_total_cost = cost_per_share * exit_shares
-    
-    entry_fees = float(position.get('fees_paid', 0))
-    entry_fees_per_share = entry_fees / total_shares
-    exit_entry_fees = entry_fees_per_share * exit_shares
-    
-    # Calculate holding period
-    exit_date_str = exit_date or datetime.now().strftime('%Y-%m-%d')
-    holding_days = calculate_holding_days(
-        entry_date=str(position['entry_date']),
-        exit_date=exit_date_str
-    )
-    
-    if exit_date:
-        print(f"   📅 Exit date: {exit_date_str} (user-provided)")
-    else:
-        print(f"   📅 Exit date: {exit_date_str} (today)")
-    
-    print(f"   Gross proceeds: £{gross_proceeds_gbp:.2f}")
-    print(f"   Exit fees: £{exit_fees_gbp:.2f}")
-    print(f"   Net proceeds: £{net_proceeds_gbp:.2f}")
-    print(f"   Cost of exited shares: £{exit_total_cost:.2f}")
-    print(f"   Realized P&L: £{realized_pnl_gbp:+.2f} ({realized_pnl_pct:+.2f}%)")
-    
-    # Get exit reason
-    reason = exit_reason if exit_reason else 'Manual Exit'
-    
-    # Create trade history record
-    trade_data = {
-        'ticker': position['ticker'],
-        'market': market,
-        'entry_date': position['entry_date'],
-        'exit_date': exit_date_str,
-        'shares': exit_shares,
-        'entry_price': entry_price,
+    result = execute_trades(exits=[{
+        'position_id': position_id,
         'exit_price': exit_price,
-        'total_cost': exit_total_cost,
-        'gross_proceeds': gross_proceeds_gbp,
-        'net_proceeds': net_proceeds_gbp,
-        'entry_fees': exit_entry_fees,
-        'exit_fees': exit_fees_gbp,
-        'pnl': realized_pnl_gbp,
-        'pnl_pct': realized_pnl_pct,
-        'holding_days': holding_days,
-        'exit_reason': reason,
-        'entry_fx_rate': float(position.get('fx_rate', 1.0)),
-        'exit_fx_rate': fx_rate_to_use,
-        'entry_note': position.get('entry_note'),
-        'exit_note': exit_note,
-        'tags': position.get('tags')
-    }
-    
-    print(f"   💾 Creating trade history record...")
-    create_trade_history(portfolio_id, trade_data)
-    print(f"   ✓ Trade history created")
-    
-    # Determine if partial or full exit
-    is_partial_exit = exit_shares < total_shares
-    
-    if is_partial_exit:
-        # Partial exit - update position to reduce shares
-        remaining_shares = total_shares - exit_shares
-        remaining_cost = total_cost - exit_total_cost
-        
-        print(f"   📝 Partial exit: {remaining_shares} shares remaining")
-        
-        update_position(position_id, {
-            'shares': remaining_shares,
-            'total_cost': remaining_cost,
-            'fees_paid': entry_fees - exit_entry_fees
-        })
-        
-        print(f"   ✓ Position updated: {remaining_shares} shares remaining")
-    else:
-        # Full exit - close the position
-        print(f"   💾 Full exit: closing position...")
-        
-        try:
-            update_position(position_id, {
-                'status': 'closed',
-                'exit_date': exit_date_str,
-                'exit_price': exit_price,
-                'exit_reason': reason
-            })
-        except Exception as e:
-            if 'exit_date' in str(e) or 'UndefinedColumn' in str(e):
-                print(f"   ⚠️  Exit columns don't exist, updating status only")
-                update_position(position_id, {
-                    'status': 'closed'
-                })
-            else:
-                raise
-        
-        print(f"   ✓ Position closed")
-    
-    # Update portfolio cash
-    current_cash = float(portfolio['cash'])
-    new_cash = current_cash + net_proceeds_gbp
-    update_portfolio_cash(portfolio_id, new_cash)
-    
-    print(f"   ✓ Cash updated: £{current_cash:.2f} → £{new_cash:.2f}\n")
+        'shares': shares,
+        'exit_date': exit_date,
+        'exit_reason': exit_reason,
+        'exit_fx_rate': exit_fx_rate,
+        'exit_note': exit_note
+    }])
     
-    return {
-        "ticker": position['ticker'],
-        "market": market,
-        "exit_price": round(exit_price, 2),
-        "shares": exit_shares,
-        "gross_proceeds": round(gross_proceeds_gbp, 2),
-        "exit_fees": round(exit_fees_gbp, 2),
-        "fee_breakdown": fee_breakdown,
-        "net_proceeds": round(net_proceeds_gbp, 2),
-        "realized_pnl": round(realized_pnl_gbp, 2),
-        "realized_pnl_pct": round(realized_pnl_pct, 2),
-        "new_cash_balance": round(new_cash, 2),
-        "exit_fx_rate": fx_rate_to_use,
-        "exit_date": exit_date_str,
-        "is_partial_exit": is_partial_exit,
-        "remaining_shares": round(total_shares - exit_shares, 4) if is_partial_exit else 0
-    }
+    return result['exits'][0]
+
 
 def update_note(position_id: str, entry_note: str) -> Dict:
     """
@@ -965,15 +680,5 @@ def filter_by_tags(portfolio_id: str, tags: List[str]) -> List[Dict]:
 
 def get_position(position_id: str) -> Optional[Dict]:
     """Get a single position by ID"""
-    portfolio = get_portfolio()
-    if not portfolio:
-        return None
-    
-    portfolio_id = str(portfolio['id'])
-    positions = get_positions(portfolio_id)
-    
-    for pos in positions:
-        if str(pos['id']) == position_id:
-            return decimal_to_float(pos)
-    
-    return None
+    position = db_get_position(position_id)
+    return decimal_to_float(position) if position else None
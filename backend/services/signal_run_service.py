@@ -0,0 +1,200 @@
+"""
+Signal Run Service
+
+Runs momentum signal generation on a background thread and exposes its
+progress as a stream of events, so a client can follow a multi-minute
+run (tickers downloaded / failed, stage timings, final signals) and
+cancel it part-way through.
+
+Events (dicts with an "event" key, in order):
+    - started: run_id, params
+    - universe: total tickers
+    - ticker: ticker, ok, done, total, failed (one per download)
+    - stage: stage name and seconds taken
+    - result: the generate_momentum_signals() result
+    - cancelled / error: terminal alternatives to result
+
+Only one run may be active at a time — every run spends the same Yahoo
+rate-limit budget. That includes POST /signals/generate, which goes
+through run_signal_generation() and simply waits for its run. Finished
+runs are kept briefly so a late subscriber still receives the full event
+history.
+
+All functions are independent of FastAPI for maximum testability.
+"""
+
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from services.signal_service import generate_momentum_signals, SignalGenerationCancelled
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+
+MAX_FINISHED_RUNS = 10
+
+_runs: Dict[str, "SignalRun"] = {}
+_runs_lock = threading.Lock()
+
+
+class SignalRunInProgress(ValueError):
+    """Raised when a run is requested while another one is still active."""
+
+
+class SignalRun:
+    """One background signal generation run and its event history."""
+
+    def __init__(self, params: Dict):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = "running"
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self.result: Optional[Dict] = None
+        self.error: Optional[Exception] = None
+        self._events: List[Dict] = []
+        self._cond = threading.Condition()
+
+    def emit(self, event: Dict) -> None:
+        with self._cond:
+            self._events.append(event)
+            self._cond.notify_all()
+
+    def finish(self, status: str, event: Dict) -> None:
+        with self._cond:
+            self.status = status
+            self.finished_at = time.time()
+            self._events.append(event)
+            self._cond.notify_all()
+
+    @property
+    def finished(self) -> bool:
+        return self.status != "running"
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the run finishes; False if timeout passed first."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.finished, timeout)
+
+    def events(self, start: int = 0, timeout: Optional[float] = None) -> List[Dict]:
+        """
+        Events from index `start` onward, waiting up to `timeout` seconds for new ones
+
+        Returns:
+            List of events (empty if none arrived in time or the run has finished)
+        """
+        with self._cond:
+            if len(self._events) <= start and not self.finished:
+                self._cond.wait(timeout)
+            return self._events[start:]
+
+    def summary(self) -> Dict:
+        return {
+            "run_id": self.id,
+            "status": self.status,
+            "params": self.params,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "events": len(self._events),
+        }
+
+
+def _run(run: SignalRun) -> None:
+    try:
+        result = generate_momentum_signals(
+            **run.params,
+            progress=run.emit,
+            cancel=run.cancel_event
+        )
+        run.result = result
+        run.finish("completed", {"event": "result", "data": result})
+    except SignalGenerationCancelled as e:
+        run.error = e
+        run.finish("cancelled", {"event": "cancelled", "message": str(e)})
+    except Exception as e:
+        run.error = e
+        run.finish("failed", {"event": "error", "message": str(e)})
+
+
+def _prune_finished() -> None:
+    finished = sorted((r for r in _runs.values() if r.finished), key=lambda r: r.finished_at)
+    for run in finished[:-MAX_FINISHED_RUNS]:
+        del _runs[run.id]
+
+
+def start_signal_run(**params) -> SignalRun:
+    """
+    Start generate_momentum_signals(**params) on a background thread
+
+    Returns:
+        The new SignalRun (events begin with "started")
+
+    Raises:
+        SignalRunInProgress: If another run is still active
+    """
+    with _runs_lock:
+        active = [r for r in _runs.values() if not r.finished]
+        if active:
+            raise SignalRunInProgress(f"Signal generation already running (run {active[0].id})")
+
+        _prune_finished()
+        run = SignalRun(params)
+        _runs[run.id] = run
+
+    run.emit({"event": "started", "run_id": run.id, "params": params})
+    threading.Thread(target=_run, args=(run,), name=f"signal-run-{run.id[:8]}", daemon=True).start()
+    logger.info(f"✓ Signal run {run.id} started")
+    return run
+
+
+def run_signal_generation(**params) -> Dict:
+    """
+    Start a run and wait for it - the blocking form of start_signal_run()
+
+    Returns:
+        The generate_momentum_signals() result
+
+    Raises:
+        SignalRunInProgress: If another run is still active
+        SignalGenerationCancelled: If the run was cancelled (by run id)
+        Exception: Whatever generate_momentum_signals() raised
+    """
+    run = start_signal_run(**params)
+    run.wait()
+    if run.error is not None:
+        raise run.error
+    return run.result
+
+
+def get_signal_run(run_id: str) -> SignalRun:
+    """
+    Raises:
+        ValueError: If no run has this id
+    """
+    with _runs_lock:
+        run = _runs.get(run_id)
+    if run is None:
+        raise ValueError(f"Signal run {run_id} not found")
+    return run
+
+
+def cancel_signal_run(run_id: str) -> Dict:
+    """
+    Ask a run to stop; it aborts before its next ticker download
+
+    Returns:
+        Run summary (status stays "running" until the worker notices)
+
+    Raises:
+        ValueError: If no run has this id
+    """
+    run = get_signal_run(run_id)
+    if not run.finished:
+        run.cancel_event.set()
+        logger.warning(f"⚠️  Signal run {run_id} cancel requested")
+    return run.summary()
+
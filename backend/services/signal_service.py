@@ -7,12 +7,17 @@ Business logic for momentum signal generation including:
 - Signal status updates
 - Signal deletion
 
+generate_momentum_signals() can report structured progress events and be
+cancelled between tickers (see signal_run_service for the streaming runner).
+
 All functions are independent of FastAPI for maximum testability.
 """
 
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timedelta
-import pandas as pd
+import threading
+import time
+from lazy_imports import lazy_module
 
 from database import (
     get_portfolio,
@@ -29,8 +34,20 @@ from database import (
 
 from utils.pricing import get_live_fx_rate
 from utils.formatting import decimal_to_float
+from utils.fee_model import fee_model_for
+from utils.timing import record_span, timed
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
+pd = lazy_module("pandas")
+
 
+class SignalGenerationCancelled(Exception):
+    """Raised when a cancel was requested during signal generation."""
 
+
+@timed("signals.generate_momentum_signals")
 def generate_momentum_signals(
     lookback_days: int = 252,
     top_n: int = 5,
@@ -38,7 +55,9 @@ def generate_momentum_signals(
     atr_period: int = 14,
     volatility_window: int = 60,
     min_position_pct: float = 0.05,
-    max_position_pct: float = 0.20
+    max_position_pct: float = 0.20,
+    progress: Optional[Callable[[Dict], None]] = None,
+    cancel: Optional[threading.Event] = None
 ) -> Dict:
     """
     Generate momentum signals based on current portfolio state
@@ -51,6 +70,11 @@ def generate_momentum_signals(
         volatility_window: Volatility calculation window (default 60)
         min_position_pct: Minimum position size as % of cash (default 5%)
         max_position_pct: Maximum position size as % of cash (default 20%)
+        progress: Optional callback receiving progress event dicts:
+            {"event": "universe", "total"},
+            {"event": "ticker", "ticker", "ok", "done", "total", "failed"},
+            {"event": "stage", "stage", "seconds"}
+        cancel: Optional event; when set, generation stops at the next ticker
     
     Returns:
         Dictionary with:
@@ -65,6 +89,7 @@ def generate_momentum_signals(
     
     Raises:
         ValueError: If portfolio not found or price data unavailable
+        SignalGenerationCancelled: If cancel was set before signals were saved
     
     Note:
         - Only generates signals in risk-on market conditions
@@ -72,9 +97,25 @@ def generate_momentum_signals(
         - Calculates position sizing based on available cash
         - Saves signals to database for later review
     """
-    print("\n" + "="*70)
-    print("🎯 GENERATING MOMENTUM SIGNALS")
-    print("="*70)
+    logger.info("🎯 GENERATING MOMENTUM SIGNALS")
+    
+    def emit(event: str, **data):
+        if progress:
+            progress({"event": event, **data})
+    
+    def check_cancelled():
+        if cancel is not None and cancel.is_set():
+            logger.warning("⚠️  Signal generation cancelled")
+            raise SignalGenerationCancelled("Signal generation cancelled")
+    
+    stage_start = time.perf_counter()
+    
+    def end_stage(stage: str):
+        nonlocal stage_start
+        now = time.perf_counter()
+        record_span(f"signals.stage.{stage}", now - stage_start)
+        emit("stage", stage=stage, seconds=round(now - stage_start, 3))
+        stage_start = now
     
     portfolio = get_portfolio()
     if not portfolio:
@@ -87,18 +128,21 @@ def generate_momentum_signals(
     open_positions = get_positions(portfolio_id, status='open')
     held_tickers = set([pos['ticker'] for pos in open_positions])
     
-    print(f"Portfolio cash: £{available_cash:,.2f}")
-    print(f"Open positions: {len(open_positions)}")
-    print(f"Held tickers: {held_tickers}\n")
+    logger.info(f"Portfolio cash: £{available_cash:,.2f}")
+    logger.info(f"Open positions: {len(open_positions)}")
+    logger.info(f"Held tickers: {held_tickers}")
     
     # Get settings
     settings_list = get_settings()
     settings = settings_list[0] if settings_list else None
+    fee_model = fee_model_for(settings)
     
     # Load universe
     tickers = get_all_tickers()
     
-    print(f"Universe: {len(tickers)} tickers")
+    logger.info(f"Universe: {len(tickers)} tickers")
+    emit("universe", total=len(tickers))
+    end_stage("setup")
     
     # Calculate dates
     end_date = datetime.now()
@@ -107,21 +151,26 @@ def generate_momentum_signals(
     signal_date_str = end_date.strftime('%Y-%m-%d')
     
     # Download prices for all tickers
-    print("Downloading price data...\n")
+    logger.info("Downloading price data...")
     
     prices_dict = {}
     failed = []
     
-    for ticker in tickers:
+    for i, ticker in enumerate(tickers, start=1):
+        check_cancelled()
         df_price = download_ticker_data(
             ticker, 
             start_date.strftime('%Y-%m-%d'), 
             end_date.strftime('%Y-%m-%d')
         )
-        if df_price is not None and len(df_price) >= lookback_days:
+        ok = df_price is not None and len(df_price) >= lookback_days
+        if ok:
             prices_dict[ticker] = df_price['close']
         else:
             failed.append(ticker)
+        emit("ticker", ticker=ticker, ok=ok, done=i, total=len(tickers), failed=len(failed))
+    
+    end_stage("download")
     
     if not prices_dict:
         raise ValueError("Failed to download price data")
@@ -129,15 +178,16 @@ def generate_momentum_signals(
     prices = pd.DataFrame(prices_dict)
     prices = prices.ffill(limit=5)
     
-    print(f"✓ Downloaded {len(prices.columns)} tickers")
+    logger.info(f"✓ Downloaded {len(prices.columns)} tickers")
     if failed:
-        print(f"⚠️  Failed: {len(failed)} tickers\n")
+        logger.warning(f"⚠️  Failed: {len(failed)} tickers")
     
     # Get live FX rate
+    check_cancelled()
     live_fx_rate = get_live_fx_rate()
     
     # Download market indices
-    print("Checking market regime...")
+    logger.info("Checking market regime...")
     spy_data = download_ticker_data(
         "SPY", 
         start_date.strftime('%Y-%m-%d'), 
@@ -150,7 +200,7 @@ def generate_momentum_signals(
     )
     
     if spy_data is None or ftse_data is None:
-        print("⚠️  Market data unavailable, assuming risk-on\n")
+        logger.warning("⚠️  Market data unavailable, assuming risk-on")
         spy_risk_on = True
         ftse_risk_on = True
     else:
@@ -163,11 +213,12 @@ def generate_momentum_signals(
         spy_risk_on = spy_close.iloc[-1] > spy_ma200.iloc[-1]
         ftse_risk_on = ftse_close.iloc[-1] > ftse_ma200.iloc[-1]
     
-    print(f"SPY: {'🟢 Risk On' if spy_risk_on else '🔴 Risk Off'}")
-    print(f"FTSE: {'🟢 Risk On' if ftse_risk_on else '🔴 Risk Off'}\n")
+    logger.info(f"SPY: {'🟢 Risk On' if spy_risk_on else '🔴 Risk Off'}")
+    logger.info(f"FTSE: {'🟢 Risk On' if ftse_risk_on else '🔴 Risk Off'}")
+    end_stage("market_regime")
     
     # Calculate momentum
-    print("Calculating momentum...")
+    logger.info("Calculating momentum...")
     momentum = prices.pct_change(lookback_days, fill_method=None)
     
     # Calculate MA200 trend
@@ -180,7 +231,7 @@ def generate_momentum_signals(
     latest_prices = prices.iloc[-1]
     
     # Calculate ATR for all tickers
-    print("Calculating ATR...")
+    logger.info("Calculating ATR...")
     atr_dict = {}
     for ticker in prices.columns:
         atr = compute_atr_simple(prices[ticker], atr_period)
@@ -188,7 +239,7 @@ def generate_momentum_signals(
             atr_dict[ticker] = atr.iloc[-1]
     
     # Calculate volatility
-    print("Calculating volatility...")
+    logger.info("Calculating volatility...")
     volatility_dict = {}
     for ticker in prices.columns:
         returns = prices[ticker].pct_change()
@@ -196,11 +247,13 @@ def generate_momentum_signals(
         if len(vol) > 0 and not pd.isna(vol.iloc[-1]):
             volatility_dict[ticker] = vol.iloc[-1]
     
+    end_stage("indicators")
+    
     # Rank stocks by momentum
     ranks = latest_momentum.rank(ascending=False, method='first')
     
     # Generate signals
-    print("\nGenerating signals...\n")
+    logger.info("Generating signals...")
     signals = []
     
     for ticker in prices.columns:
@@ -265,8 +318,10 @@ def generate_momentum_signals(
             'status': status
         })
     
+    end_stage("ranking")
+    
     if not signals:
-        print("⚠️  No qualifying signals found\n")
+        logger.warning("⚠️  No qualifying signals found")
         return {
             "signals_generated": 0,
             "new_signals": 0,
@@ -302,11 +357,8 @@ def generate_momentum_signals(
             signal['allocation_gbp'] = round(allocation_per_stock, 2)
             signal['suggested_shares'] = int(allocation_per_stock / signal['price_gbp'])
             
-            # Calculate fees
-            if signal['market'] == 'UK':
-                fee_rate = 0.005  # 0.5% stamp duty
-            else:
-                fee_rate = 0.0015  # 0.15% FX fee
+            # Calculate fees (UK: stamp duty, US: FX fee)
+            fee_rate = fee_model.rate(signal['market'], 'buy')
             
             gross_cost = signal['suggested_shares'] * signal['price_gbp']
             fees = gross_cost * fee_rate
@@ -317,16 +369,19 @@ def generate_momentum_signals(
             signal['suggested_shares'] = 0
             signal['total_cost'] = 0
     
+    # Last point to cancel before anything is written
+    check_cancelled()
+    
     # Save to database
-    print(f"Saving {len(signals_sorted)} signals to database...")
+    logger.info(f"Saving {len(signals_sorted)} signals to database...")
     
     for signal_data in signals_sorted:
         signal_data['portfolio_id'] = portfolio_id
         signal_data['signal_date'] = signal_date_str
         create_signal(portfolio_id, signal_data)
     
-    print(f"✓ Saved {len(signals_sorted)} signals\n")
-    print("="*70 + "\n")
+    logger.info(f"✓ Saved {len(signals_sorted)} signals")
+    end_stage("save")
     
     return {
         "signals_generated": len(signals_sorted),
@@ -379,10 +434,9 @@ def get_signals(status: Optional[str] = None) -> List[Dict]:
     
     formatted = [decimal_to_float(s) for s in signals]
     
-    print(f"✓ Retrieved {len(formatted)} signal(s)")
+    logger.info(f"✓ Retrieved {len(formatted)} signal(s)")
     if status:
-        print(f"   Filtered by status: {status}")
-    print()
+        logger.debug("Filtered by status: %s", status)
     
     return formatted
 
@@ -409,10 +463,9 @@ def update_signal_status(signal_id: str, updates: Dict) -> Dict:
     """
     updated = db_update_signal(signal_id, updates)
     
-    print(f"✓ Signal {signal_id} updated:")
+    logger.info(f"✓ Signal {signal_id} updated:")
     for key, value in updates.items():
-        print(f"   {key}: {value}")
-    print()
+        logger.debug("%s: %s", key, value)
     
     return decimal_to_float(updated)
 
@@ -434,4 +487,4 @@ def delete_signal(signal_id: str) -> None:
     """
     db_delete_signal(signal_id)
     
-    print(f"✓ Signal {signal_id} deleted\n")
+    logger.info(f"✓ Signal {signal_id} deleted")
@@ -25,6 +25,8 @@ from typing import Dict, Optional
 from database import get_portfolio, get_latest_snapshot, get_settings
 from utils.pricing import get_live_fx_rate
 from utils.calculations import calculate_uk_entry_fees, calculate_us_entry_fees
+from utils.fee_model import fee_model_for
+from unit_of_work import unit_of_work
 
 
 # ---------------------------------------------------------------------------
@@ -98,19 +100,24 @@ def size_position(
         return _invalid_response(INVALID_STOP_DISTANCE)
 
     # ------------------------------------------------------------------
-    # Fetch portfolio data
+    # Fetch portfolio data (one unit of work, closed before the FX fetch)
     # ------------------------------------------------------------------
-    portfolio = get_portfolio()
-    if not portfolio:
-        return _invalid_response(NO_PORTFOLIO_VALUE_SNAPSHOT)
+    with unit_of_work():
+        portfolio = get_portfolio()
+        if not portfolio:
+            return _invalid_response(NO_PORTFOLIO_VALUE_SNAPSHOT)
 
-    portfolio_id = str(portfolio["id"])
-    available_cash = float(portfolio["cash"])
+        portfolio_id = str(portfolio["id"])
+        available_cash = float(portfolio["cash"])
 
-    # §4.1.1 PortfolioValue = latest portfolio_history.total_value
-    snapshot = get_latest_snapshot(portfolio_id)
-    if not snapshot:
-        return _invalid_response(NO_PORTFOLIO_VALUE_SNAPSHOT)
+        # §4.1.1 PortfolioValue = latest portfolio_history.total_value
+        snapshot = get_latest_snapshot(portfolio_id)
+        if not snapshot:
+            return _invalid_response(NO_PORTFOLIO_VALUE_SNAPSHOT)
+
+        # Commission / rate values for the fee estimate
+        settings_list = get_settings()
+        settings = settings_list[0] if settings_list else {}
 
     portfolio_value = float(snapshot["total_value"])
 
@@ -147,9 +154,6 @@ def size_position(
     # ------------------------------------------------------------------
     # Fee estimation — uses settings for commission/rate values
     # ------------------------------------------------------------------
-    settings_list = get_settings()
-    settings = settings_list[0] if settings_list else {}
-
     gross_cost_native = suggested_shares * entry_price
 
     if market == "US":
@@ -192,15 +196,14 @@ def size_position(
     if not cash_sufficient:
         # §4.1.6 — include max_affordable_shares when insufficient cash
         # Conservative: deduct estimated fee rate from available cash before dividing
+        fees = fee_model_for(settings)
         if market == "US":
-            fx_fee_rate = float(settings.get("fx_fee_rate", 0.0015))
-            effective_price_gbp = entry_price * (1 + fx_fee_rate) / fx_rate_used
+            effective_price_gbp = entry_price * (1 + fees.rate("US", "buy")) / fx_rate_used
         else:
-            stamp_duty_rate = float(settings.get("stamp_duty_rate", 0.005))
-            commission = float(settings.get("uk_commission", 9.95))
+            commission = fees.commission("UK")
             # Back out commission from available cash first, then apply stamp duty
             spendable = max(0.0, available_cash - commission)
-            effective_price_gbp = entry_price * (1 + stamp_duty_rate)
+            effective_price_gbp = entry_price * (1 + fees.rate("UK", "buy"))
 
         if market == "US":
             max_raw = available_cash / effective_price_gbp
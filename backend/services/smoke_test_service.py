@@ -0,0 +1,158 @@
+"""
+Smoke Test Service
+
+Concurrent runner behind POST /test/endpoints and
+health_service.test_all_endpoints. Each case is requested `iterations`
+times with at most `concurrency` requests in flight, so endpoints that
+wait on live prices overlap instead of queueing, and repeated iterations
+turn the smoke test into a lightweight load probe (p50 / p95 per endpoint).
+
+A case passes when every attempt returns the expected status. Its p95 is
+compared with its latency budget; an endpoint over budget still passes
+but is flagged (over_budget) and counted in the summary.
+
+All functions are independent of FastAPI for maximum testability.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from lazy_imports import lazy_module
+
+from config import SMOKE_TEST_CONCURRENCY, SMOKE_TEST_BUDGET_MS, SMOKE_TEST_TIMEOUT_SECONDS
+
+httpx = lazy_module("httpx")
+np = lazy_module("numpy")
+
+
+MAX_CONCURRENCY = 32
+MAX_ITERATIONS = 20
+
+
+def smoke_case(path: str, method: str = "GET", name: str = None, critical: bool = True,
+               budget_ms: float = SMOKE_TEST_BUDGET_MS, expected_status: int = 200) -> Dict:
+    """One endpoint under test (name defaults to "METHOD path")."""
+    return {
+        "name": name or f"{method} {path}",
+        "method": method,
+        "path": path,
+        "critical": critical,
+        "budget_ms": budget_ms,
+        "expected_status": expected_status,
+    }
+
+
+async def _attempt(client: httpx.AsyncClient, case: Dict, semaphore: asyncio.Semaphore) -> Dict:
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            if case["method"] == "GET":
+                response = await client.get(case["path"])
+            elif case["method"] == "POST":
+                response = await client.post(case["path"], json={})
+            else:
+                raise ValueError(f"Unsupported method: {case['method']}")
+        except httpx.TimeoutException:
+            return {"error": f"Request timeout (>{client.timeout.read:.0f}s)"}
+        except httpx.ConnectError as e:
+            return {"error": f"Connection failed: {str(e)[:100]}"}
+        except Exception as e:
+            return {"error": f"Unexpected error: {str(e)[:100]}"}
+
+        return {
+            "status_code": response.status_code,
+            "ms": (time.perf_counter() - start) * 1000,
+            "body": response.text[:100] if response.status_code != case["expected_status"] else None,
+        }
+
+
+def _case_result(case: Dict, attempts: List[Dict]) -> Dict:
+    errors = [a for a in attempts if "error" in a]
+    responses = [a for a in attempts if "error" not in a]
+    wrong_status = [a for a in responses if a["status_code"] != case["expected_status"]]
+    durations = np.array([a["ms"] for a in responses])
+
+    result = {
+        "endpoint": case["name"],
+        "critical": case["critical"],
+        "status": "error" if errors else "fail" if wrong_status else "pass",
+        "status_code": responses[-1]["status_code"] if responses else None,
+        "response_time_ms": round(float(np.median(durations)), 2) if len(durations) else None,
+        "p95_ms": round(float(np.percentile(durations, 95)), 2) if len(durations) else None,
+        "max_ms": round(float(durations.max()), 2) if len(durations) else None,
+        "attempts": len(attempts),
+        "budget_ms": case["budget_ms"],
+        "over_budget": bool(len(durations)) and float(np.percentile(durations, 95)) > case["budget_ms"],
+        "error": None,
+    }
+    if errors:
+        result["error"] = errors[0]["error"]
+    elif wrong_status:
+        result["error"] = f"HTTP {wrong_status[0]['status_code']}: {wrong_status[0]['body']}"
+    return result
+
+
+async def run_smoke_tests(base_url: str, cases: List[Dict], concurrency: int = SMOKE_TEST_CONCURRENCY,
+                          iterations: int = 1, timeout: float = SMOKE_TEST_TIMEOUT_SECONDS) -> Dict:
+    """
+    Request every case `iterations` times, `concurrency` at a time
+
+    Args:
+        base_url: API root, e.g. "http://localhost:8000"
+        cases: smoke_case() dicts
+        concurrency: Max requests in flight (1 = the old serial behaviour)
+        iterations: Attempts per case; p50 / p95 are over these
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Dictionary with:
+            - timestamp: Run start
+            - summary: total, passed, failed, errors, success_rate, over_budget,
+                       concurrency, iterations, wall_time_ms
+            - results: One entry per case (response_time_ms is the p50)
+
+    Raises:
+        ValueError: If concurrency or iterations are out of range
+    """
+    if not 1 <= concurrency <= MAX_CONCURRENCY:
+        raise ValueError(f"concurrency must be between 1 and {MAX_CONCURRENCY}")
+    if not 1 <= iterations <= MAX_ITERATIONS:
+        raise ValueError(f"iterations must be between 1 and {MAX_ITERATIONS}")
+
+    timestamp = datetime.now().isoformat()
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+
+    async with httpx.AsyncClient(base_url=base_url.rstrip('/'), timeout=timeout) as client:
+        # Iteration-major order so the first pass over every endpoint finishes first
+        jobs = [(case, _attempt(client, case, semaphore)) for _ in range(iterations) for case in cases]
+        outcomes = await asyncio.gather(*(job for _, job in jobs))
+
+    attempts = {case["name"]: [] for case in cases}
+    for (case, _), outcome in zip(jobs, outcomes):
+        attempts[case["name"]].append(outcome)
+
+    results = [_case_result(case, attempts[case["name"]]) for case in cases]
+
+    total = len(results)
+    passed = sum(1 for r in results if r["status"] == "pass")
+
+    return {
+        "timestamp": timestamp,
+        "summary": {
+            "total": total,
+            "passed": passed,
+            "failed": sum(1 for r in results if r["status"] == "fail"),
+            "errors": sum(1 for r in results if r["status"] == "error"),
+            "success_rate": round(passed / total * 100, 1) if total else 0,
+            "over_budget": sum(1 for r in results if r["over_budget"]),
+            "concurrency": concurrency,
+            "iterations": iterations,
+            "wall_time_ms": round((time.perf_counter() - started) * 1000, 2),
+        },
+        "results": results,
+    }
@@ -20,12 +20,6 @@ Date:   2026-02-21T20:55:00Z
 """
 
 from datetime import datetime
-from test_data.validation_data import (
-    VALIDATION_TRADES,
-    VALIDATION_PORTFOLIO_HISTORY,
-    EXPECTED_METRICS,
-    TOLERANCE,
-)
 from services.analytics_service import AnalyticsService
 
 
@@ -126,6 +120,14 @@ class ValidationService:
           Pass 2 — trade data only         → exercises trade Sharpe fallback
                                              (BLG-TECH-01 Addendum 1)
         """
+        # Test portfolio loaded on first validation run, not at app startup
+        from test_data.validation_data import (
+            VALIDATION_TRADES,
+            VALIDATION_PORTFOLIO_HISTORY,
+            EXPECTED_METRICS,
+            TOLERANCE,
+        )
+
         # ------------------------------------------------------------------
         # Pass 1 — full dataset
         # ------------------------------------------------------------------
@@ -0,0 +1,141 @@
+"""
+Unit of Work
+
+Request-scoped database context. Inside a unit of work:
+
+- Every database.py call shares one connection and one transaction,
+  committed when the outermost unit ends (rolled back if it raises)
+- get_portfolio(), get_settings() and get_positions(portfolio_id, 'open')
+  hit the database once; later calls get copies of the cached rows, and
+  database.py writes keep the cache current (cash patched in place,
+  positions / settings reloaded after a write)
+- With lock_portfolio=True the portfolio row is read with SELECT ... FOR
+  UPDATE, so concurrent cash read-modify-write operations (entry, exit,
+  deposit) queue behind each other instead of overwriting each other
+
+Units nest: an inner unit joins the outer one, so service functions can
+call each other freely.
+
+A unit holds its connection, and an open transaction, from the first
+database.py call until it ends. Scope units to database work: fetch live
+prices and FX rates before or after the unit, never inside it.
+
+This module holds state only; all SQL stays in database.py.
+
+Usage:
+    from unit_of_work import unit_of_work, with_unit_of_work
+
+    @with_unit_of_work(lock_portfolio=True)
+    def create_transaction(...): ...
+
+    with unit_of_work():
+        portfolio = get_portfolio()
+        positions = get_positions(str(portfolio['id']), status='open')
+        settings = get_settings()
+    fx_rate = get_live_fx_rate()                   # after the unit, no connection held
+"""
+
+import copy
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+_current: ContextVar = ContextVar("unit_of_work", default=None)
+
+
+class UnitOfWork:
+    """Shared connection plus cached reads for one logical operation."""
+
+    def __init__(self, lock_portfolio: bool = False):
+        self.lock_portfolio = lock_portfolio
+        self.conn = None  # Opened lazily by database.get_db()
+        self._cache: Dict[Tuple, Any] = {}
+        self._after_commit: List[Callable[[], None]] = []
+
+    def cached(self, key: Tuple[Hashable, ...], loader: Callable[[], Any]) -> Any:
+        """Return a copy of the cached value for key, loading it on first use."""
+        if key not in self._cache:
+            self._cache[key] = loader()
+        return copy.deepcopy(self._cache[key])
+
+    def patch(self, key: Tuple[Hashable, ...], values: Dict) -> None:
+        """Update fields of a cached row (no-op if the row is not cached)."""
+        row = self._cache.get(key)
+        if row is not None:
+            row.update(values)
+
+    def invalidate(self, name: str) -> None:
+        """Drop every cached entry whose key starts with name."""
+        for key in [k for k in self._cache if k[0] == name]:
+            del self._cache[key]
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback once the unit has committed (dropped on rollback)."""
+        self._after_commit.append(callback)
+
+    def _finish(self, failed: bool) -> None:
+        if self.conn is None:
+            return
+        try:
+            if failed:
+                self.conn.rollback()
+            else:
+                self.conn.commit()
+        finally:
+            self.conn.close()
+            self.conn = None
+        if not failed:
+            for callback in self._after_commit:
+                callback()
+
+
+def current_unit_of_work() -> Optional[UnitOfWork]:
+    return _current.get()
+
+
+@contextmanager
+def unit_of_work(lock_portfolio: bool = False):
+    """
+    Run the enclosed block as one unit of work (joins an active unit)
+
+    Args:
+        lock_portfolio: Read the portfolio row FOR UPDATE (use for cash changes)
+
+    Yields:
+        The active UnitOfWork
+    """
+    active = _current.get()
+    if active is not None:
+        if lock_portfolio and not active.lock_portfolio:
+            # Re-read the portfolio with the lock on next access
+            active.lock_portfolio = True
+            active.invalidate("portfolio")
+        yield active
+        return
+
+    uow = UnitOfWork(lock_portfolio)
+    token = _current.set(uow)
+    failed = False
+    try:
+        yield uow
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        _current.reset(token)
+        uow._finish(failed)
+
+
+def with_unit_of_work(lock_portfolio: bool = False) -> Callable:
+    """Decorator form of unit_of_work()."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with unit_of_work(lock_portfolio):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
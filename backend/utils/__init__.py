@@ -7,19 +7,39 @@ Modules:
     - pricing: Stock prices, FX rates, market regime, ATR calculations
     - formatting: Data formatting and type conversion helpers
     - calculations: Fee, P&L, and stop loss calculations
+    - bulk_calculations: Array versions of the fee, P&L and stop calculations
+    - fee_model: Compiled fee rates shared by live calculations and the backtester
+    - timing: Span timing with per-name percentiles and Prometheus output
+    - query_budget: Per-request DB statement accounting, budgets and N+1 detection
 """
 
 from .pricing import (
     get_current_price,
     get_live_fx_rate,
     check_market_regime,
-    calculate_atr
+    calculate_atr,
+    get_ticker_snapshot
 )
 
 from .formatting import (
     decimal_to_float
 )
 
+from .timing import (
+    span,
+    timed,
+    record_span,
+    get_span_stats,
+    render_prometheus,
+    reset_spans
+)
+
+from .query_budget import (
+    track_queries,
+    query_budget,
+    QueryBudgetExceeded
+)
+
 from .calculations import (
     # Fee calculations
     calculate_uk_entry_fees,
@@ -40,14 +60,41 @@ from .calculations import (
     calculate_position_size
 )
 
+from .fee_model import (
+    FeeModel,
+    fee_model_for,
+    market_for_ticker
+)
+
+from .bulk_calculations import (
+    bulk_entry_fees,
+    bulk_exit_fees,
+    bulk_exit_proceeds,
+    bulk_position_pnl,
+    bulk_trailing_stop,
+    bulk_should_exit
+)
+
 __all__ = [
     # Pricing
     'get_current_price',
     'get_live_fx_rate',
     'check_market_regime',
     'calculate_atr',
+    'get_ticker_snapshot',
     # Formatting
     'decimal_to_float',
+    # Timing
+    'span',
+    'timed',
+    'record_span',
+    'get_span_stats',
+    'render_prometheus',
+    'reset_spans',
+    # Query budgets
+    'track_queries',
+    'query_budget',
+    'QueryBudgetExceeded',
     # Fee calculations
     'calculate_uk_entry_fees',
     'calculate_us_entry_fees',
@@ -64,5 +111,16 @@ __all__ = [
     'should_exit_position',
     'calculate_holding_days',
     # Position sizing
-    'calculate_position_size'
+    'calculate_position_size',
+    # Fee model
+    'FeeModel',
+    'fee_model_for',
+    'market_for_ticker',
+    # Bulk calculations
+    'bulk_entry_fees',
+    'bulk_exit_fees',
+    'bulk_exit_proceeds',
+    'bulk_position_pnl',
+    'bulk_trailing_stop',
+    'bulk_should_exit'
 ]
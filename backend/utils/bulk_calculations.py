@@ -0,0 +1,277 @@
+"""
+Bulk Calculation Utilities
+
+Array counterparts of utils/calculations.py for evaluating many positions
+in one call (portfolio valuation, daily analysis, backtests).
+
+Each function takes NumPy arrays (or anything np.asarray accepts) of equal
+length, one element per position, reads the settings dict once (fees via
+the compiled FeeModel, utils/fee_model.py), and returns
+arrays. Results match the scalar functions element for element: the same
+float operations run in the same order, and market handling follows the
+scalar function each one mirrors.
+
+Functions:
+    - bulk_entry_fees(): calculate_uk_entry_fees / calculate_us_entry_fees
+    - bulk_exit_fees(): calculate_uk_exit_fees / calculate_us_exit_fees
+    - bulk_exit_proceeds(): calculate_exit_proceeds
+    - bulk_position_pnl(): calculate_position_pnl
+    - bulk_trailing_stop(): calculate_trailing_stop
+    - bulk_should_exit(): should_exit_position
+
+Usage:
+    from utils.bulk_calculations import bulk_position_pnl
+
+    pnl_native, pnl_gbp, pnl_pct = bulk_position_pnl(
+        entry_prices, current_prices, shares, markets, live_fx_rate
+    )
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+from lazy_imports import lazy_module
+
+from .fee_model import fee_model_for
+
+np = lazy_module("numpy")
+
+
+def _floats(values) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+
+def _is_uk(markets) -> np.ndarray:
+    return np.asarray(markets) == 'UK'
+
+
+# ============================================================================
+# FEE CALCULATIONS
+# ============================================================================
+
+def bulk_entry_fees(gross_costs_native, markets, settings: Dict) -> Dict[str, np.ndarray]:
+    """
+    Entry fees for many positions (native currency)
+
+    Args:
+        gross_costs_native: Shares × price per position, in native currency
+        markets: "UK" or "US" per position (anything other than "UK" is US)
+        settings: Settings dict with commissions and fee rates
+
+    Returns:
+        Dictionary of arrays: commission, stamp_duty, fx_fee, total
+
+    Example:
+        >>> bulk_entry_fees([1000, 1000], ['UK', 'US'], {'uk_commission': 9.95, 'stamp_duty_rate': 0.005})['total']
+        array([14.95,  1.5 ])
+    """
+    gross = _floats(gross_costs_native)
+    is_uk = _is_uk(markets)
+    fees = fee_model_for(settings)
+
+    commission = fees.commissions_for(markets)
+    stamp_duty = np.where(is_uk, gross * fees.stamp_duty_rate, 0.0)
+    fx_fee = np.where(is_uk, 0.0, gross * fees.fx_fee_rate)
+
+    return {
+        'commission': commission,
+        'stamp_duty': stamp_duty,
+        'fx_fee': fx_fee,
+        'total': commission + np.where(is_uk, stamp_duty, fx_fee)
+    }
+
+
+def bulk_exit_fees(gross_proceeds_native, markets, settings: Dict) -> Dict[str, np.ndarray]:
+    """
+    Exit fees for many positions (native currency)
+
+    Args:
+        gross_proceeds_native: Shares × exit price per position, in native currency
+        markets: "UK" or "US" per position (anything other than "UK" is US)
+        settings: Settings dict with commissions and fee rates
+
+    Returns:
+        Dictionary of arrays: commission, stamp_duty (always 0), fx_fee, total
+    """
+    gross = _floats(gross_proceeds_native)
+    is_uk = _is_uk(markets)
+    fees = fee_model_for(settings)
+
+    commission = fees.commissions_for(markets)
+    fx_fee = np.where(is_uk, 0.0, gross * fees.fx_fee_rate)
+
+    return {
+        'commission': commission,
+        'stamp_duty': np.zeros_like(gross),
+        'fx_fee': fx_fee,
+        # UK total is the commission alone (no 0.0 added, same as the scalar path)
+        'total': np.where(is_uk, commission, commission + fx_fee)
+    }
+
+
+# ============================================================================
+# P&L CALCULATIONS
+# ============================================================================
+
+def bulk_position_pnl(
+    entry_prices,
+    current_prices,
+    shares,
+    markets,
+    live_fx_rate: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Unrealized P&L for many positions in native currency and GBP
+
+    Args:
+        entry_prices: Entry prices in native currency
+        current_prices: Current prices in native currency
+        shares: Share counts (can be fractional)
+        markets: "US" or "UK" per position (anything other than "US" is GBP)
+        live_fx_rate: Current GBP/USD rate (scalar or one per position)
+
+    Returns:
+        Tuple of arrays (pnl_native, pnl_gbp, pnl_pct); pnl_pct is 0 where
+        the entry price is not positive
+    """
+    entry = _floats(entry_prices)
+    current = _floats(current_prices)
+    pnl_native = (current - entry) * _floats(shares)
+
+    is_us = np.asarray(markets) == 'US'
+    pnl_gbp = np.where(is_us, pnl_native / _floats(live_fx_rate), pnl_native)
+
+    positive = entry > 0
+    pnl_pct = np.zeros_like(entry)
+    np.divide(current - entry, entry, out=pnl_pct, where=positive)
+    pnl_pct = np.where(positive, pnl_pct * 100, 0.0)
+
+    return pnl_native, pnl_gbp, pnl_pct
+
+
+def bulk_exit_proceeds(
+    exit_prices,
+    shares,
+    markets,
+    exit_fx_rates,
+    settings: Dict
+) -> Dict[str, np.ndarray]:
+    """
+    Exit proceeds and fees for many positions
+
+    Args:
+        exit_prices: Exit prices in native currency
+        shares: Shares exited per position
+        markets: "UK" or "US" per position (anything other than "UK" is US)
+        exit_fx_rates: GBP/USD rate at exit (scalar or per position; ignored for UK)
+        settings: Settings dict with fee rates
+
+    Returns:
+        Dictionary of arrays with the calculate_exit_proceeds keys
+        (gross_proceeds_native, gross_proceeds_gbp, exit_fees_native,
+        exit_fees_gbp, net_proceeds_native, net_proceeds_gbp) plus the fee
+        breakdown as commission, stamp_duty and fx_fee
+    """
+    gross_native = _floats(exit_prices) * _floats(shares)
+    is_uk = _is_uk(markets)
+    fees = bulk_exit_fees(gross_native, markets, settings)
+    fees_native = fees['total']
+
+    # Only divide where the position is US, so UK rows may carry a None / 0 rate
+    fx = np.where(is_uk, 1.0, np.asarray(exit_fx_rates, dtype=float))
+    gross_gbp = np.where(is_uk, gross_native, gross_native / fx)
+    fees_gbp = np.where(is_uk, fees_native, fees_native / fx)
+
+    return {
+        'gross_proceeds_native': gross_native,
+        'gross_proceeds_gbp': gross_gbp,
+        'exit_fees_native': fees_native,
+        'exit_fees_gbp': fees_gbp,
+        'net_proceeds_native': gross_native - fees_native,
+        'net_proceeds_gbp': gross_gbp - fees_gbp,
+        'commission': fees['commission'],
+        'stamp_duty': fees['stamp_duty'],
+        'fx_fee': fees['fx_fee']
+    }
+
+
+# ============================================================================
+# STOP LOSS CALCULATIONS
+# ============================================================================
+
+def bulk_trailing_stop(
+    current_prices,
+    atrs,
+    is_profitable,
+    current_stops,
+    entry_prices,
+    settings: Dict
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trailing stops for many positions
+
+    Args:
+        current_prices: Current prices in native currency
+        atrs: Average True Range per position in native currency
+        is_profitable: Bool per position (unrealized profit)
+        current_stops: Current stop levels in native currency
+        entry_prices: Entry prices in native currency
+        settings: Settings dict with atr_multiplier_trailing and atr_multiplier_initial
+
+    Returns:
+        Tuple of arrays (new_stops, atr_multipliers); stops only move up,
+        and profitable positions never go below entry
+
+    Note:
+        The scalar function's reason string is derived from the multiplier;
+        build it per row only where it is displayed.
+    """
+    current = _floats(current_prices)
+    profitable = np.asarray(is_profitable, dtype=bool)
+    atr_mult = np.where(
+        profitable,
+        float(settings.get('atr_multiplier_trailing', 2.0)),
+        float(settings.get('atr_multiplier_initial', 5.0))
+    )
+
+    candidate = current - (atr_mult * _floats(atrs))
+    trailed = np.maximum(_floats(current_stops), candidate)
+    new_stops = np.where(profitable, np.maximum(trailed, _floats(entry_prices)), trailed)
+
+    return new_stops, atr_mult
+
+
+def bulk_should_exit(
+    current_prices,
+    stop_prices,
+    holding_days,
+    market_risk_on: bool,
+    grace_period_days: int = 10
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Exit decisions for many positions
+
+    Args:
+        current_prices: Current prices in native currency
+        stop_prices: Stop prices in native currency
+        holding_days: Days held per position
+        market_risk_on: True if market regime is risk-on (applies to all rows)
+        grace_period_days: Grace period before stops are active (default 10)
+
+    Returns:
+        Tuple of arrays (should_exit, exit_reasons); exit_reasons is an
+        object array holding "Risk-Off Signal", "Stop Loss Hit" or None
+    """
+    current = _floats(current_prices)
+    reasons = np.full(current.shape, None, dtype=object)
+
+    if not market_risk_on:
+        reasons[:] = "Risk-Off Signal"
+        return np.ones(current.shape, dtype=bool), reasons
+
+    past_grace = np.asarray(holding_days) >= grace_period_days
+    stop_hit = past_grace & (current <= _floats(stop_prices))
+    reasons[stop_hit] = "Stop Loss Hit"
+
+    return stop_hit, reasons
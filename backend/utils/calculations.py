@@ -3,11 +3,16 @@ Calculation Utilities
 
 Business logic for fees, P&L, and stop loss calculations.
 All calculations isolated for testability and reusability.
+
+Fee functions take a settings dict for compatibility; the rates come from
+the compiled FeeModel for those settings (utils/fee_model.py).
 """
 
 from typing import Dict, Tuple, Optional
 from datetime import datetime
 
+from .fee_model import fee_model_for
+
 
 # ============================================================================
 # FEE CALCULATIONS
@@ -31,16 +36,7 @@ def calculate_uk_entry_fees(gross_cost: float, settings: Dict) -> Dict[str, floa
         >>> calculate_uk_entry_fees(1000, {'uk_commission': 9.95, 'stamp_duty_rate': 0.005})
         {'commission': 9.95, 'stamp_duty': 5.0, 'total': 14.95}
     """
-    commission = float(settings.get('uk_commission', 9.95))
-    stamp_duty_rate = float(settings.get('stamp_duty_rate', 0.005))
-    stamp_duty = gross_cost * stamp_duty_rate
-    
-    return {
-        'commission': commission,
-        'stamp_duty': stamp_duty,
-        'fx_fee': 0,
-        'total': commission + stamp_duty
-    }
+    return fee_model_for(settings).entry_fees(gross_cost, 'UK')
 
 
 def calculate_us_entry_fees(gross_cost_usd: float, settings: Dict) -> Dict[str, float]:
@@ -62,16 +58,7 @@ def calculate_us_entry_fees(gross_cost_usd: float, settings: Dict) -> Dict[str,
         >>> calculate_us_entry_fees(1000, {'us_commission': 0, 'fx_fee_rate': 0.0015})
         {'commission': 0, 'stamp_duty': 0, 'fx_fee': 1.5, 'total': 1.5}
     """
-    commission = float(settings.get('us_commission', 0.00))
-    fx_fee_rate = float(settings.get('fx_fee_rate', 0.0015))
-    fx_fee = gross_cost_usd * fx_fee_rate
-    
-    return {
-        'commission': commission,
-        'stamp_duty': 0,
-        'fx_fee': fx_fee,
-        'total': commission + fx_fee
-    }
+    return fee_model_for(settings).entry_fees(gross_cost_usd, 'US')
 
 
 def calculate_uk_exit_fees(gross_proceeds: float, settings: Dict) -> Dict[str, float]:
@@ -91,14 +78,7 @@ def calculate_uk_exit_fees(gross_proceeds: float, settings: Dict) -> Dict[str, f
     Note:
         No stamp duty on sales, only on purchases
     """
-    commission = float(settings.get('uk_commission', 9.95))
-    
-    return {
-        'commission': commission,
-        'stamp_duty': 0,
-        'fx_fee': 0,
-        'total': commission
-    }
+    return fee_model_for(settings).exit_fees(gross_proceeds, 'UK')
 
 
 def calculate_us_exit_fees(gross_proceeds_usd: float, settings: Dict) -> Dict[str, float]:
@@ -116,16 +96,7 @@ def calculate_us_exit_fees(gross_proceeds_usd: float, settings: Dict) -> Dict[st
             - fx_fee: 0.15% of gross proceeds
             - total: Total fees in USD
     """
-    commission = float(settings.get('us_commission', 0.00))
-    fx_fee_rate = float(settings.get('fx_fee_rate', 0.0015))
-    fx_fee = gross_proceeds_usd * fx_fee_rate
-    
-    return {
-        'commission': commission,
-        'stamp_duty': 0,
-        'fx_fee': fx_fee,
-        'total': commission + fx_fee
-    }
+    return fee_model_for(settings).exit_fees(gross_proceeds_usd, 'US')
 
 
 # ============================================================================
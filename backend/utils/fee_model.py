@@ -0,0 +1,187 @@
+"""
+Fee Model
+
+One place for trading costs, shared by the live services and the backtester.
+
+A FeeModel is compiled once from a settings row: per-market commissions and
+per-market, per-side percentage rates are resolved up front, so evaluating
+fees is a dict lookup (one trade) or an array multiply (many trades).
+
+Rates (percentage of gross value, commission excluded):
+    - UK buy: stamp duty          UK sell: none
+    - US buy: FX fee              US sell: FX fee
+
+Used by:
+    - utils/calculations.py, utils/bulk_calculations.py: live fee breakdowns
+    - sizing_service / signal_service: cost estimates
+    - backtest/engine.py: buy and sell cost per ticker (commission-free,
+      as the backtest has always been)
+
+Usage:
+    from utils.fee_model import fee_model_for
+
+    fees = fee_model_for(settings)
+    fees.entry_fees(gross_cost, 'UK')['total']
+    prices * (1 + fees.rates_for(markets, 'buy'))
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+from lazy_imports import lazy_module
+
+from config import (
+    DEFAULT_UK_COMMISSION,
+    DEFAULT_US_COMMISSION,
+    DEFAULT_STAMP_DUTY_RATE,
+    DEFAULT_FX_FEE_RATE,
+)
+
+np = lazy_module("numpy")
+
+
+def market_for_ticker(ticker: str) -> str:
+    """'VOD.L' → 'UK', anything else → 'US'"""
+    return "UK" if ticker.endswith(".L") else "US"
+
+
+class FeeModel:
+    """Commissions and percentage rates for both markets."""
+
+    def __init__(self, uk_commission: float = DEFAULT_UK_COMMISSION,
+                 us_commission: float = DEFAULT_US_COMMISSION,
+                 stamp_duty_rate: float = DEFAULT_STAMP_DUTY_RATE,
+                 fx_fee_rate: float = DEFAULT_FX_FEE_RATE):
+        self.uk_commission = float(uk_commission)
+        self.us_commission = float(us_commission)
+        self.stamp_duty_rate = float(stamp_duty_rate)
+        self.fx_fee_rate = float(fx_fee_rate)
+
+        self._commission = {"UK": self.uk_commission, "US": self.us_commission}
+        self._rate = {
+            ("UK", "buy"): self.stamp_duty_rate,
+            ("UK", "sell"): 0.0,
+            ("US", "buy"): self.fx_fee_rate,
+            ("US", "sell"): self.fx_fee_rate,
+        }
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "uk_commission": self.uk_commission,
+            "us_commission": self.us_commission,
+            "stamp_duty_rate": self.stamp_duty_rate,
+            "fx_fee_rate": self.fx_fee_rate,
+        }
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FeeModel) and self.as_dict() == other.as_dict()
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.as_dict().values()))
+
+    def __repr__(self) -> str:
+        return f"FeeModel({', '.join(f'{k}={v}' for k, v in self.as_dict().items())})"
+
+    # ------------------------------------------------------------------
+    # Single trade
+    # ------------------------------------------------------------------
+
+    def commission(self, market: str) -> float:
+        """Fixed commission per trade ("UK" or anything else = US)."""
+        return self._commission["UK" if market == "UK" else "US"]
+
+    def rate(self, market: str, side: str) -> float:
+        """Percentage cost for one side of a trade ("UK" or anything else = US)."""
+        return self._rate[("UK" if market == "UK" else "US", side)]
+
+    def entry_fees(self, gross_cost_native: float, market: str) -> Dict[str, float]:
+        """
+        Entry fee breakdown in native currency
+
+        Returns:
+            {"commission", "stamp_duty", "fx_fee", "total"} (UK: stamp duty, US: FX fee)
+        """
+        if market == 'UK':
+            stamp_duty = gross_cost_native * self.stamp_duty_rate
+            return {
+                'commission': self.uk_commission,
+                'stamp_duty': stamp_duty,
+                'fx_fee': 0,
+                'total': self.uk_commission + stamp_duty
+            }
+        fx_fee = gross_cost_native * self.fx_fee_rate
+        return {
+            'commission': self.us_commission,
+            'stamp_duty': 0,
+            'fx_fee': fx_fee,
+            'total': self.us_commission + fx_fee
+        }
+
+    def exit_fees(self, gross_proceeds_native: float, market: str) -> Dict[str, float]:
+        """
+        Exit fee breakdown in native currency (no stamp duty on sales)
+
+        Returns:
+            {"commission", "stamp_duty", "fx_fee", "total"}
+        """
+        if market == 'UK':
+            return {
+                'commission': self.uk_commission,
+                'stamp_duty': 0,
+                'fx_fee': 0,
+                'total': self.uk_commission
+            }
+        fx_fee = gross_proceeds_native * self.fx_fee_rate
+        return {
+            'commission': self.us_commission,
+            'stamp_duty': 0,
+            'fx_fee': fx_fee,
+            'total': self.us_commission + fx_fee
+        }
+
+    # ------------------------------------------------------------------
+    # Many trades
+    # ------------------------------------------------------------------
+
+    def rates_for(self, markets: Iterable[str], side: str) -> np.ndarray:
+        """Percentage cost per element of markets, for one side."""
+        is_uk = np.asarray(markets) == 'UK'
+        return np.where(is_uk, self._rate[("UK", side)], self._rate[("US", side)])
+
+    def commissions_for(self, markets: Iterable[str]) -> np.ndarray:
+        """Fixed commission per element of markets."""
+        is_uk = np.asarray(markets) == 'UK'
+        return np.where(is_uk, self.uk_commission, self.us_commission)
+
+    def ticker_rates(self, tickers: Iterable[str], side: str) -> Dict[str, float]:
+        """{ticker: rate} for one side, e.g. for every column of a price panel."""
+        return {t: self._rate[(market_for_ticker(t), side)] for t in tickers}
+
+
+DEFAULT_FEE_MODEL = FeeModel()
+
+
+@lru_cache(maxsize=32)
+def _compiled(uk_commission, us_commission, stamp_duty_rate, fx_fee_rate) -> FeeModel:
+    return FeeModel(uk_commission, us_commission, stamp_duty_rate, fx_fee_rate)
+
+
+def fee_model_for(settings: Optional[Dict]) -> FeeModel:
+    """
+    FeeModel for a settings row, compiled once per distinct set of fee values
+
+    Args:
+        settings: Settings row (or None / {} for the defaults)
+
+    Returns:
+        Shared FeeModel (treat as read-only)
+    """
+    settings = settings or {}
+    return _compiled(
+        float(settings.get('uk_commission', DEFAULT_UK_COMMISSION)),
+        float(settings.get('us_commission', DEFAULT_US_COMMISSION)),
+        float(settings.get('stamp_duty_rate', DEFAULT_STAMP_DUTY_RATE)),
+        float(settings.get('fx_fee_rate', DEFAULT_FX_FEE_RATE)),
+    )
@@ -0,0 +1,172 @@
+"""
+Logging Setup
+
+Structured, non-blocking logging for the API process.
+
+- Per-module loggers: get_logger(__name__)
+- Level from LOG_LEVEL (DEBUG / INFO / WARNING / ERROR)
+- Output from LOG_FORMAT: "text" (human-readable) or "json" (one object per line)
+- Request threads only put records on an in-memory queue (QueueHandler);
+  a single QueueListener thread formats and writes them, so stdout I/O
+  never sits on the request path
+- DEBUG records are sampled per call site at LOG_DEBUG_SAMPLE_RATE, so
+  per-position / per-query detail can stay enabled under load
+
+Functions:
+    - configure_logging(): Install the queue handler on the root logger (idempotent)
+    - get_logger(): Module logger
+    - shutdown_logging(): Flush and stop the listener thread
+
+Usage:
+    from utils.logging_setup import get_logger
+
+    logger = get_logger(__name__)
+    logger.info("Position analysis complete", extra={"positions": 12, "exits": 1})
+    logger.debug("Updating position %s", position_id)   # formatted only if emitted
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from config import LOG_LEVEL, LOG_FORMAT, LOG_DEBUG_SAMPLE_RATE
+
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, message, extra fields, exc_info."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """'HH:MM:SS LEVEL logger: message key=value ...'"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s", "%H:%M:%S")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extras = [
+            f"{key}={value}" for key, value in record.__dict__.items()
+            if key not in _RESERVED_ATTRS and not key.startswith("_")
+        ]
+        return f"{line} {' '.join(extras)}" if extras else line
+
+
+class DebugSampler(logging.Filter):
+    """
+    Keep 1 in every N DEBUG records per call site (N = round(1 / rate))
+
+    Counting per call site (file, line) keeps the first record from every
+    debug statement and thins out the repetitive ones, whatever arguments
+    each record was formatted with. Records at INFO and above always pass.
+    At most MAX_CALL_SITES counters are kept; past that they are reset.
+    """
+
+    MAX_CALL_SITES = 4096
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counts: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+        if self.every == 0:
+            return False
+        key = (record.pathname, record.lineno)
+        with self._lock:
+            count = self._counts.get(key)
+            if count is None:
+                if len(self._counts) >= self.MAX_CALL_SITES:
+                    self._counts.clear()
+                count = 0
+            self._counts[key] = count + 1
+        return count % self.every == 0
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT,
+                      debug_sample_rate: float = LOG_DEBUG_SAMPLE_RATE, stream=None) -> None:
+    """
+    Route all logging through a queue to one background writer
+
+    Safe to call more than once; later calls replace the previous setup.
+
+    Args:
+        level: Root log level name
+        fmt: "text" or "json"
+        debug_sample_rate: Fraction (0-1) of DEBUG records kept per call site
+        stream: Output stream (default sys.stdout)
+
+    Raises:
+        ValueError: On an unknown format
+    """
+    global _listener
+
+    if fmt not in ("text", "json"):
+        raise ValueError(f"Unknown LOG_FORMAT '{fmt}' (expected text or json)")
+
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(DebugSampler(debug_sample_rate))
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level.upper())
+
+        _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+        _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Module logger (use get_logger(__name__))."""
+    return logging.getLogger(name)
+
+
+atexit.register(shutdown_logging)
@@ -9,13 +9,31 @@ Functions:
     - get_live_fx_rate(): Fetch GBP/USD exchange rate
     - check_market_regime(): Check SPY/FTSE vs 200-day MA for risk on/off
     - calculate_atr(): Calculate Average True Range for a ticker
+    - get_ticker_snapshot(): Price, ATR and recent closes from one request
+
+All requests go through the configured market data provider
+(live Yahoo, local stand-in or replay — see market_data/) and are parsed
+by market_data.chart, so one response can feed price, MA and ATR.
 """
 
-import time
-import requests
+from datetime import datetime
 from typing import Optional, Dict
 
+from config import (
+    DEFAULT_FX_RATE,
+    PRICE_FETCH_DELAY_SECONDS,
+    FX_RATE_FETCH_DELAY_SECONDS,
+    MARKET_REGIME_FETCH_DELAY_SECONDS,
+    SNAPSHOT_RANGE,
+)
+from market_data import Chart, get_chart, get_provider, MarketDataError
+from utils.timing import timed
+from utils.logging_setup import get_logger
+
+logger = get_logger(__name__)
+
 
+@timed("pricing.get_current_price")
 def get_current_price(ticker: str) -> Optional[float]:
     """
     Fetch current price directly from Yahoo Finance API
@@ -32,62 +50,28 @@ def get_current_price(ticker: str) -> Optional[float]:
         - UK stocks need pence->pounds conversion by caller if needed
     """
     try:
-        # Add delay to avoid rate limiting
-        time.sleep(0.3)
-        
-        # Direct Yahoo Finance API call
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-        params = {
+        chart = get_chart(ticker, {
             "interval": "1d",
             "range": "1d"
-        }
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'application/json',
-            'Accept-Language': 'en-US,en;q=0.9',
-        }
+        }, throttle_seconds=PRICE_FETCH_DELAY_SECONDS)
         
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        
-        if response.status_code != 200:
-            print(f"⚠️  {ticker}: HTTP {response.status_code}")
-            return None
-        
-        data = response.json()
-        
-        # Extract price from response
-        if "chart" in data and "result" in data["chart"] and len(data["chart"]["result"]) > 0:
-            result = data["chart"]["result"][0]
-            
-            # Try meta.regularMarketPrice first
-            if "meta" in result and "regularMarketPrice" in result["meta"]:
-                price = float(result["meta"]["regularMarketPrice"])
-                if price > 0:
-                    print(f"✓ {ticker}: ${price:.2f} (Yahoo API)")
-                    return price
-            
-            # Try latest close price from indicators
-            if "indicators" in result and "quote" in result["indicators"]:
-                quotes = result["indicators"]["quote"]
-                if len(quotes) > 0 and "close" in quotes[0]:
-                    closes = [c for c in quotes[0]["close"] if c is not None]
-                    if closes:
-                        price = float(closes[-1])
-                        if price > 0:
-                            print(f"✓ {ticker}: ${price:.2f} (Yahoo API - close)")
-                            return price
+        price = chart.last_price()
+        if price is not None:
+            logger.debug("✓ %s: $%.2f (Yahoo API)", ticker, price)
+            return price
         
-        print(f"⚠️  {ticker}: No price in API response")
+        logger.warning(f"⚠️  {ticker}: No price in API response")
         return None
         
-    except requests.exceptions.RequestException as e:
-        print(f"❌ {ticker}: Network error - {str(e)}")
+    except MarketDataError as e:
+        logger.warning(f"⚠️  {ticker}: {str(e)}")
         return None
     except Exception as e:
-        print(f"❌ {ticker}: Error - {str(e)}")
+        logger.error(f"❌ {ticker}: Error - {str(e)}")
         return None
 
 
+@timed("pricing.get_live_fx_rate")
 def get_live_fx_rate() -> float:
     """
     Fetch live GBP/USD exchange rate from Yahoo Finance
@@ -101,50 +85,25 @@ def get_live_fx_rate() -> float:
         - Used for converting USD positions to GBP
     """
     try:
-        time.sleep(0.2)
-        
-        url = "https://query1.finance.yahoo.com/v8/finance/chart/GBPUSD=X"
-        params = {
+        chart = get_chart("GBPUSD=X", {
             "interval": "1d",
             "range": "1d"
-        }
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json',
-        }
+        }, throttle_seconds=FX_RATE_FETCH_DELAY_SECONDS)
         
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        data = response.json()
-        
-        if "chart" in data and "result" in data["chart"] and len(data["chart"]["result"]) > 0:
-            result = data["chart"]["result"][0]
-            
-            # Try meta.regularMarketPrice first
-            if "meta" in result and "regularMarketPrice" in result["meta"]:
-                fx_rate = float(result["meta"]["regularMarketPrice"])
-                if fx_rate > 0:
-                    print(f"✓ Live FX rate (GBP/USD): {fx_rate:.4f}")
-                    return fx_rate
-            
-            # Try latest close price
-            if "indicators" in result and "quote" in result["indicators"]:
-                quotes = result["indicators"]["quote"]
-                if len(quotes) > 0 and "close" in quotes[0]:
-                    closes = [c for c in quotes[0]["close"] if c is not None]
-                    if closes:
-                        fx_rate = float(closes[-1])
-                        if fx_rate > 0:
-                            print(f"✓ Live FX rate (GBP/USD): {fx_rate:.4f}")
-                            return fx_rate
+        fx_rate = chart.last_price()
+        if fx_rate is not None:
+            logger.debug("✓ Live FX rate (GBP/USD): %.4f", fx_rate)
+            return fx_rate
         
-        print(f"⚠️  Could not fetch live FX rate, using default {DEFAULT_FX_RATE}")
+        logger.warning(f"⚠️  Could not fetch live FX rate, using default {DEFAULT_FX_RATE}")
         return DEFAULT_FX_RATE
         
     except Exception as e:
-        print(f"⚠️  FX rate fetch error: {e}, using default {DEFAULT_FX_RATE}")
+        logger.warning(f"⚠️  FX rate fetch error: {e}, using default {DEFAULT_FX_RATE}")
         return DEFAULT_FX_RATE
 
 
+@timed("pricing.check_market_regime")
 def check_market_regime() -> Dict[str, any]:
     """
     Check SPY and FTSE for risk on/off using 200-day moving average
@@ -164,50 +123,19 @@ def check_market_regime() -> Dict[str, any]:
         - Used to determine if positions should be exited
     """
     try:
-        time.sleep(0.3)
+        get_provider().throttle(MARKET_REGIME_FETCH_DELAY_SECONDS)
         
         def get_ma200(ticker: str):
-            """Get current price and 200-day MA for a ticker"""
+            """Get current price and 200-day MA for a ticker (one range=1y request)"""
             try:
-                url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-                params = {
+                chart = get_chart(ticker, {
                     "interval": "1d",
                     "range": "1y"
-                }
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                    'Accept': 'application/json',
-                }
-                
-                response = requests.get(url, params=params, headers=headers, timeout=15)
-                data = response.json()
-                
-                if "chart" in data and "result" in data["chart"] and len(data["chart"]["result"]) > 0:
-                    result = data["chart"]["result"][0]
-                    
-                    # Get current price
-                    current = None
-                    if "meta" in result and "regularMarketPrice" in result["meta"]:
-                        current = float(result["meta"]["regularMarketPrice"])
-                    
-                    # Get historical closes for MA200
-                    ma200 = None
-                    if "indicators" in result and "quote" in result["indicators"]:
-                        quotes = result["indicators"]["quote"]
-                        if len(quotes) > 0 and "close" in quotes[0]:
-                            closes = [c for c in quotes[0]["close"] if c is not None]
-                            if len(closes) >= 200:
-                                # Calculate 200-day moving average
-                                ma200 = sum(closes[-200:]) / 200
-                            elif len(closes) > 0:
-                                # Use available data if less than 200 days
-                                ma200 = sum(closes) / len(closes)
-                    
-                    return current, ma200
-                
-                return None, None
+                })
+                # Uses available data if less than 200 days
+                return chart.last_price(), chart.moving_average(200)
             except Exception as e:
-                print(f"Error getting MA200 for {ticker}: {e}")
+                logger.warning(f"⚠️  Error getting MA200 for {ticker}: {e}")
                 return None, None
         
         # Get SPY data
@@ -218,7 +146,7 @@ def check_market_regime() -> Dict[str, any]:
         
         # Default to risk-on if we can't fetch data
         if spy_price is None or spy_ma200 is None:
-            print("⚠️  Could not fetch SPY data, defaulting to risk-on")
+            logger.warning("⚠️  Could not fetch SPY data, defaulting to risk-on")
             spy_risk_on = True
             spy_price = 0
             spy_ma200 = 0
@@ -226,7 +154,7 @@ def check_market_regime() -> Dict[str, any]:
             spy_risk_on = spy_price > spy_ma200
         
         if ftse_price is None or ftse_ma200 is None:
-            print("⚠️  Could not fetch FTSE data, defaulting to risk-on")
+            logger.warning("⚠️  Could not fetch FTSE data, defaulting to risk-on")
             ftse_risk_on = True
             ftse_price = 0
             ftse_ma200 = 0
@@ -242,7 +170,7 @@ def check_market_regime() -> Dict[str, any]:
             'ftse_ma200': ftse_ma200 or 0
         }
     except Exception as e:
-        print(f"❌ Market regime check failed: {e}")
+        logger.error(f"❌ Market regime check failed: {e}")
         return {
             'spy_risk_on': True,
             'ftse_risk_on': True,
@@ -253,13 +181,15 @@ def check_market_regime() -> Dict[str, any]:
         }
 
 
-def calculate_atr(ticker: str, period: int = 14) -> Optional[float]:
+@timed("pricing.calculate_atr")
+def calculate_atr(ticker: str, period: int = 14, chart: Optional[Chart] = None) -> Optional[float]:
     """
     Calculate Average True Range (ATR) for a ticker
     
     Args:
         ticker: Stock symbol (e.g., 'NVDA', 'FRES.L')
         period: Number of days for ATR calculation (default: 14)
+        chart: Already-fetched daily chart to reuse (skips the request)
     
     Returns:
         ATR value as float, or None if calculation fails
@@ -271,57 +201,73 @@ def calculate_atr(ticker: str, period: int = 14) -> Optional[float]:
         - Used for stop loss calculations
     """
     try:
-        # Fetch historical data
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
-        params = {
-            "interval": "1d",
-            "range": "1mo"  # Need enough data for ATR calculation
-        }
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'application/json',
-        }
+        if chart is None:
+            # Fetch historical data (1 month is enough for ATR calculation)
+            chart = get_chart(ticker, {
+                "interval": "1d",
+                "range": "1mo"
+            })
         
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        data = response.json()
-        
-        if "chart" in data and "result" in data["chart"] and len(data["chart"]["result"]) > 0:
-            result = data["chart"]["result"][0]
+        atr = chart.atr(period)
+        if atr is not None:
+            # Fix UK stocks: Yahoo returns pence, need to convert to pounds
+            if ticker.endswith('.L') and atr > 100:
+                atr = atr / 100
+                logger.debug("📊 Calculated ATR for %s: %.2f (converted from pence)", ticker, atr)
+            else:
+                logger.debug("📊 Calculated ATR for %s: %.2f", ticker, atr)
             
-            if "indicators" in result and "quote" in result["indicators"]:
-                quote = result["indicators"]["quote"][0]
-                
-                # Get high, low, close
-                highs = [h for h in quote.get("high", []) if h is not None]
-                lows = [l for l in quote.get("low", []) if l is not None]
-                closes = [c for c in quote.get("close", []) if c is not None]
-                
-                if len(highs) >= period and len(lows) >= period and len(closes) >= period:
-                    # Calculate True Range
-                    true_ranges = []
-                    for i in range(1, len(closes)):
-                        high_low = highs[i] - lows[i]
-                        high_close = abs(highs[i] - closes[i-1])
-                        low_close = abs(lows[i] - closes[i-1])
-                        true_range = max(high_low, high_close, low_close)
-                        true_ranges.append(true_range)
-                    
-                    # Calculate ATR (simple moving average of TR)
-                    if len(true_ranges) >= period:
-                        atr = sum(true_ranges[-period:]) / period
-                        
-                        # Fix UK stocks: Yahoo returns pence, need to convert to pounds
-                        if ticker.endswith('.L') and atr > 100:
-                            atr = atr / 100
-                            print(f"   📊 Calculated ATR for {ticker}: {atr:.2f} (converted from pence)")
-                        else:
-                            print(f"   📊 Calculated ATR for {ticker}: {atr:.2f}")
-                        
-                        return atr
+            return atr
         
-        print(f"   ⚠️  Could not calculate ATR for {ticker}")
+        logger.warning(f"⚠️  Could not calculate ATR for {ticker}")
         return None
         
     except Exception as e:
-        print(f"   ❌ ATR calculation error for {ticker}: {e}")
+        logger.error(f"❌ ATR calculation error for {ticker}: {e}")
+        return None
+
+
+@timed("pricing.get_ticker_snapshot")
+def get_ticker_snapshot(ticker: str, period: int = 14) -> Optional[Dict]:
+    """
+    Fetch last price, ATR and recent closes for a ticker in one request
+    
+    Replaces a get_current_price() + calculate_atr() pair (two requests,
+    two rate-limit delays) with a single SNAPSHOT_RANGE history fetch.
+    
+    Args:
+        ticker: Stock symbol (e.g., 'NVDA', 'FRES.L')
+        period: Number of days for ATR calculation (default: 14)
+    
+    Returns:
+        Dictionary with:
+            - price: float or None (native currency; pence for UK)
+            - atr: float or None (UK converted from pence, as calculate_atr)
+            - closes: List[float] of recent daily closes (oldest first)
+            - as_of: datetime of the latest bar, or None
+        None if the request fails
+    """
+    try:
+        chart = get_chart(ticker, {
+            "interval": "1d",
+            "range": SNAPSHOT_RANGE
+        }, throttle_seconds=PRICE_FETCH_DELAY_SECONDS)
+    except MarketDataError as e:
+        logger.warning(f"⚠️  {ticker}: {str(e)}")
+        return None
+    except Exception as e:
+        logger.error(f"❌ {ticker}: Error - {str(e)}")
         return None
+    
+    price = chart.last_price()
+    if price is not None:
+        logger.debug("✓ %s: $%.2f (Yahoo API)", ticker, price)
+    else:
+        logger.warning(f"⚠️  {ticker}: No price in API response")
+    
+    return {
+        'price': price,
+        'atr': calculate_atr(ticker, period, chart=chart),
+        'closes': chart.closes().tolist(),
+        'as_of': datetime.fromtimestamp(int(chart.timestamps[-1])) if len(chart) else None
+    }
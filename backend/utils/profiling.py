@@ -0,0 +1,215 @@
+"""
+Profiling Utilities
+
+Sampling profiler for a single request. While a RequestProfile is active,
+a background thread samples the Python stacks of the threads serving that
+request every few milliseconds (sys._current_frames), so other requests
+are not slowed by tracing hooks.
+
+Threads are attached through the span collector in utils.timing: the
+first span a request opens on a threadpool worker (every service, DB and
+pricing call is @timed) registers that worker. The same collector counts
+market data requests; DB statements and connections come from the
+request's QueryAccount (utils.query_budget), so cached reads are not
+counted and a multi-statement write counts once per statement.
+
+Output formats:
+    - collapsed(): "frame;frame;frame count" lines (flamegraph.pl, speedscope, inferno)
+    - speedscope(): speedscope.app JSON ("sampled" profile)
+
+Functions:
+    - RequestProfile: One request's samples and span counts
+    - store_profile() / get_profile() / list_profiles(): Recent profiles kept in memory
+"""
+
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+
+from config import PROFILE_SAMPLE_INTERVAL_MS, PROFILE_MAX_STORED
+from utils.query_budget import QueryAccount
+
+
+MAX_STACK_DEPTH = 128
+
+_profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename.rsplit("/", 1)[-1]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class RequestProfile:
+    """
+    Stack samples and span counts for one request
+
+    Use as a span collector (utils.timing.collect_spans), set `queries` to
+    the request's QueryAccount (utils.query_budget.track_queries) and call
+    start() / stop() around the request.
+    """
+
+    def __init__(self, label: str, interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.interval = interval_ms / 1000
+        self.samples: Counter = Counter()
+        self.span_counts: Counter = Counter()
+        self.span_seconds: Counter = Counter()
+        self.queries: Optional[QueryAccount] = None
+        self.started_at = time.time()
+        self.duration = 0.0
+        self._threads = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._t0 = 0.0
+
+    # Span collector interface --------------------------------------------
+
+    def on_span_start(self, name: str) -> None:
+        self.attach_thread()
+
+    def on_span_end(self, name: str, seconds: float, error: bool) -> None:
+        with self._lock:
+            self.span_counts[name] += 1
+            self.span_seconds[name] += seconds
+
+    # Sampling ------------------------------------------------------------
+
+    def attach_thread(self, ident: Optional[int] = None) -> None:
+        """Sample this thread (default: the calling thread) from now on."""
+        ident = ident or threading.get_ident()
+        if ident not in self._threads:
+            with self._lock:
+                self._threads.add(ident)
+
+    def start(self) -> None:
+        self._t0 = time.perf_counter()
+        self._sampler = threading.Thread(target=self._sample_loop, name=f"profiler-{self.id}", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.duration = time.perf_counter() - self._t0
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = [t for t in self._threads if t != own]
+            for ident in threads:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples[";".join(stack)] += 1
+
+    # Output --------------------------------------------------------------
+
+    @property
+    def db_queries(self) -> int:
+        return self.queries.statements if self.queries is not None else 0
+
+    @property
+    def db_connections(self) -> int:
+        return self.queries.connections if self.queries is not None else 0
+
+    @property
+    def http_calls(self) -> int:
+        return self.span_counts.get("market_data.fetch_chart", 0)
+
+    def summary(self) -> Dict:
+        top_spans = sorted(self.span_seconds.items(), key=lambda kv: kv[1], reverse=True)[:15]
+        return {
+            "id": self.id,
+            "label": self.label,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 1),
+            "interval_ms": self.interval * 1000,
+            "samples": sum(self.samples.values()),
+            "threads": len(self._threads),
+            "db_queries": self.db_queries,
+            "db_connections": self.db_connections,
+            "http_calls": self.http_calls,
+            "spans": [
+                {"name": name, "count": self.span_counts[name], "total_ms": round(seconds * 1000, 1)}
+                for name, seconds in top_spans
+            ],
+        }
+
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed-stack format, heaviest stacks first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def speedscope(self) -> Dict:
+        """speedscope.app file format (one sampled profile, weights in milliseconds)."""
+        frame_index: Dict[str, int] = {}
+        frames: List[Dict] = []
+        samples: List[List[int]] = []
+        weights: List[float] = []
+
+        for stack, count in self.samples.items():
+            indices = []
+            for label in stack.split(";"):
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    frames.append({"name": label})
+                indices.append(frame_index[label])
+            samples.append(indices)
+            weights.append(round(count * self.interval * 1000, 3))
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.label,
+            "exporter": "swing-trading-backend",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": self.label,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+def store_profile(profile: RequestProfile) -> None:
+    """Keep a finished profile (oldest dropped beyond PROFILE_MAX_STORED)."""
+    with _profiles_lock:
+        _profiles[profile.id] = profile
+        while len(_profiles) > PROFILE_MAX_STORED:
+            _profiles.popitem(last=False)
+
+
+def get_profile(profile_id: str) -> RequestProfile:
+    """
+    Raises:
+        ValueError: If no stored profile has this id
+    """
+    with _profiles_lock:
+        profile = _profiles.get(profile_id)
+    if profile is None:
+        raise ValueError(f"Profile {profile_id} not found")
+    return profile
+
+
+def list_profiles() -> List[Dict]:
+    """Summaries of stored profiles, newest first."""
+    with _profiles_lock:
+        profiles = list(_profiles.values())
+    return [p.summary() for p in reversed(profiles)]
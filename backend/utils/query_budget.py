@@ -0,0 +1,152 @@
+"""
+Query Budget Utilities
+
+Per-request accounting of database work. database.py reports every
+connection (round trip: connect, statements, commit) and every statement
+executed; while a QueryAccount is active in the current context those
+calls are counted against it.
+
+Used by:
+    - main.py middleware: X-DB-Queries / X-DB-Connections headers on every
+      response, a warning when a route exceeds its budget or repeats a statement
+    - Tests and scripts: `with query_budget(6): create_daily_snapshot()`
+      raises QueryBudgetExceeded if the block grows past 6 statements
+
+N+1 detection: the same SQL text (parameters are bound separately, so
+identical text means the same query shape) executed N_PLUS_ONE_THRESHOLD
+or more times in one request is reported as a repeated query.
+
+Functions:
+    - QueryAccount: Statement / connection counts for one request or block
+    - track_queries(): Count DB work in the enclosed block
+    - query_budget(): track_queries() that raises when the budget is exceeded
+    - record_statement() / record_connection(): Called by database.py
+    - budget_for_route(): Configured budget for a route
+"""
+
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from config import DB_QUERY_BUDGET, DB_QUERY_BUDGETS, N_PLUS_ONE_THRESHOLD
+
+
+_account: ContextVar = ContextVar("query_account", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(Exception):
+    """A block or request executed more statements than its budget allows."""
+
+
+class QueryAccount:
+    """Statements and connections made inside one tracked block."""
+
+    def __init__(self, label: str = "", budget: Optional[int] = None,
+                 parent: Optional["QueryAccount"] = None):
+        self.label = label
+        self.budget = budget
+        self.parent = parent  # Enclosing account; also counts this block's work
+        self.statements = 0
+        self.connections = 0
+        self.by_statement: Counter = Counter()
+
+    def add_statement(self, sql: str) -> None:
+        self.statements += 1
+        self.by_statement[_WHITESPACE.sub(" ", sql).strip()] += 1
+
+    def add_connection(self) -> None:
+        self.connections += 1
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.statements > self.budget
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Dict]:
+        """Statements executed at least `threshold` times, most repeated first."""
+        return [
+            {"sql": sql, "count": count}
+            for sql, count in self.by_statement.most_common()
+            if count >= threshold
+        ]
+
+    def summary(self) -> Dict:
+        return {
+            "label": self.label,
+            "statements": self.statements,
+            "connections": self.connections,
+            "budget": self.budget,
+            "repeated": self.repeated(),
+        }
+
+    def describe(self) -> str:
+        text = f"{self.label}: {self.statements} statements over {self.connections} connections"
+        if self.budget is not None:
+            text += f" (budget {self.budget})"
+        for item in self.repeated():
+            text += f"\n  {item['count']}x {item['sql'][:120]}"
+        return text
+
+
+def record_statement(sql) -> None:
+    """Count one executed statement against the active account and its parents."""
+    account = _account.get()
+    if account is None:
+        return
+    sql = sql if isinstance(sql, str) else str(sql)
+    while account is not None:
+        account.add_statement(sql)
+        account = account.parent
+
+
+def record_connection() -> None:
+    """Count one database connection against the active account and its parents."""
+    account = _account.get()
+    while account is not None:
+        account.add_connection()
+        account = account.parent
+
+
+def current_account() -> Optional[QueryAccount]:
+    return _account.get()
+
+
+@contextmanager
+def track_queries(label: str = "", budget: Optional[int] = None):
+    """
+    Count DB work done in this context (and threads/tasks copied from it)
+
+    Blocks nest: work inside an inner block is also counted by every
+    enclosing one (e.g. a request profile around the request's own account).
+
+    Yields:
+        QueryAccount (inspect after the block)
+    """
+    account = QueryAccount(label, budget, parent=_account.get())
+    token = _account.set(account)
+    try:
+        yield account
+    finally:
+        _account.reset(token)
+
+
+@contextmanager
+def query_budget(max_statements: int, label: str = "block"):
+    """
+    track_queries() that fails when more than max_statements are executed
+
+    Raises:
+        QueryBudgetExceeded: After the block, if the budget was exceeded
+    """
+    with track_queries(label, max_statements) as account:
+        yield account
+    if account.over_budget:
+        raise QueryBudgetExceeded(account.describe())
+
+
+def budget_for_route(route: str) -> int:
+    """Budget for "METHOD /path/template" (DB_QUERY_BUDGETS override, else DB_QUERY_BUDGET)."""
+    return DB_QUERY_BUDGETS.get(route, DB_QUERY_BUDGET)
@@ -0,0 +1,200 @@
+"""
+Timing Utilities
+
+Lightweight in-process span timing for hot paths (external fetches, DB
+calls, computation stages). Each span name keeps a count, a running sum
+and a bounded sample of recent durations, from which p50 / p95 / p99 are
+computed on demand. No external dependencies; thread-safe.
+
+Functions:
+    - span(): Context manager timing a block
+    - timed(): Decorator timing every call of a function
+    - record_span(): Record an already-measured duration
+    - get_span_stats(): Count, sum, max and percentiles per span name
+    - render_prometheus(): Stats in Prometheus text exposition format
+    - reset_spans(): Clear all recorded spans
+    - collect_spans(): Also report spans in the current context to a collector
+      (used by per-request profiling)
+
+Usage:
+    from utils.timing import span, timed
+
+    @timed("pricing.get_current_price")
+    def get_current_price(ticker): ...
+
+    with span("analyze.market_regime"):
+        market_regime = check_market_regime()
+"""
+
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+
+from lazy_imports import lazy_module
+
+np = lazy_module("numpy")
+
+
+SAMPLE_SIZE = 2048  # Recent durations kept per span for percentiles
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC_NAME = "app_span_duration_seconds"
+
+
+class _SpanSeries:
+    __slots__ = ("count", "total", "max", "errors", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+
+_series: Dict[str, _SpanSeries] = {}
+_lock = threading.Lock()
+
+# Optional per-context collector with on_span_start(name) / on_span_end(name, seconds, error).
+# Context variables follow a request into FastAPI's threadpool, so a collector
+# set in middleware sees the spans of that request only.
+_collector: ContextVar = ContextVar("span_collector", default=None)
+
+
+def record_span(name: str, seconds: float, error: bool = False) -> None:
+    """Record one duration (seconds) for a span name."""
+    with _lock:
+        series = _series.get(name)
+        if series is None:
+            series = _series[name] = _SpanSeries()
+        series.count += 1
+        series.total += seconds
+        series.max = max(series.max, seconds)
+        series.samples.append(seconds)
+        if error:
+            series.errors += 1
+
+    collector = _collector.get()
+    if collector is not None:
+        collector.on_span_end(name, seconds, error)
+
+
+@contextmanager
+def span(name: str):
+    """Time the enclosed block; a raised exception is counted as an error and re-raised."""
+    collector = _collector.get()
+    if collector is not None:
+        collector.on_span_start(name)
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        record_span(name, time.perf_counter() - start, error)
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """
+    Decorator form of span()
+
+    Args:
+        name: Span name (default: "<module>.<function name>")
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_span_stats() -> Dict[str, Dict]:
+    """
+    Aggregate stats per span name
+
+    Returns:
+        {name: {count, errors, sum_seconds, max_ms, p50_ms, p95_ms, p99_ms}}
+        Percentiles cover the most recent SAMPLE_SIZE calls; count and sum cover all calls.
+    """
+    with _lock:
+        snapshot = {
+            name: (s.count, s.errors, s.total, s.max, np.fromiter(s.samples, dtype=float))
+            for name, s in _series.items()
+        }
+
+    stats = {}
+    for name, (count, errors, total, max_, samples) in sorted(snapshot.items()):
+        p50, p95, p99 = np.percentile(samples, [q * 100 for q in QUANTILES]) * 1000
+        stats[name] = {
+            "count": count,
+            "errors": errors,
+            "sum_seconds": round(total, 6),
+            "max_ms": round(max_ * 1000, 3),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+        }
+    return stats
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus() -> str:
+    """
+    Span stats as a Prometheus summary (text exposition format 0.0.4)
+
+    Emits {METRIC_NAME}{span, quantile}, _sum and _count per span, plus
+    app_span_errors_total.
+    """
+    with _lock:
+        snapshot = {
+            name: (s.count, s.errors, s.total, np.fromiter(s.samples, dtype=float))
+            for name, s in _series.items()
+        }
+
+    lines = [
+        f"# HELP {METRIC_NAME} Duration of instrumented spans (quantiles over recent calls).",
+        f"# TYPE {METRIC_NAME} summary",
+    ]
+    error_lines = [
+        "# HELP app_span_errors_total Instrumented spans that raised an exception.",
+        "# TYPE app_span_errors_total counter",
+    ]
+    for name, (count, errors, total, samples) in sorted(snapshot.items()):
+        label = _label(name)
+        for q, value in zip(QUANTILES, np.percentile(samples, [q * 100 for q in QUANTILES])):
+            lines.append(f'{METRIC_NAME}{{span="{label}",quantile="{q}"}} {value:.6f}')
+        lines.append(f'{METRIC_NAME}_sum{{span="{label}"}} {total:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{span="{label}"}} {count}')
+        error_lines.append(f'app_span_errors_total{{span="{label}"}} {errors}')
+
+    return "\n".join(lines + error_lines) + "\n"
+
+
+def reset_spans() -> None:
+    """Clear all recorded spans."""
+    with _lock:
+        _series.clear()
+
+
+@contextmanager
+def collect_spans(collector):
+    """Report spans recorded in this context (and contexts copied from it) to collector."""
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)